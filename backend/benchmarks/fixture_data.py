@@ -0,0 +1,78 @@
+# backend/benchmarks/fixture_data.py
+"""
+벤치마크용 녹화 데이터(fixtures) 경로 + 시세 재생 로더
+
+- fixtures/ 폴더의 파일은 record_fixtures.py로 다시 녹화할 수 있음
+- 파일별 출처(recorded: 실제 API 녹화 / synthetic: 생성한 샘플)는 fixtures/SOURCES.json에 기록
+- 시세는 yf.download(group_by='ticker') 결과를 그대로 CSV(2단 헤더)로 저장해두고,
+  market_data.set_price_fetcher()로 yfinance 대신 재생
+"""
+import os
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+PRICES_FILE = "prices_1y.csv.gz"
+FRED_FILE = "fred_observations.json"
+FF_CALENDAR_FILE = "ff_calendar_thisweek.xml"
+NEWS_RSS_FILE = "google_news_rss.xml"
+NAVER_HTML_FILE = "naver_marketindex.html"
+APIFLASH_PNG_FILE = "apiflash_map.png"
+UPSTAGE_FILE = "upstage_chat_completion.json"
+SOURCES_FILE = "SOURCES.json"
+
+def fixture_path(name):
+    return os.path.join(FIXTURE_DIR, name)
+
+def load_fixture_sources():
+    """fixture 파일명 -> 출처 ("recorded" / "synthetic", 기록이 없으면 "unknown")"""
+    import json
+
+    try:
+        with open(fixture_path(SOURCES_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def read_fixture(name, mode="rb"):
+    with open(fixture_path(name), mode) as f:
+        return f.read()
+
+def load_price_history(path=None):
+    """녹화된 시세 CSV -> (날짜 x (티커, 필드)) MultiIndex DataFrame"""
+    import pandas as pd
+
+    df = pd.read_csv(path or fixture_path(PRICES_FILE), header=[0, 1], index_col=0, parse_dates=True)
+    df.index.name = "Date"
+    return df
+
+def _period_start(last_date, period):
+    """yfinance period 문자열('5d', '1mo', '1y', 'ytd', 'max') -> 시작 날짜 (None이면 전체)"""
+    import pandas as pd
+
+    if period in (None, "max"):
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=last_date.year, month=1, day=1)
+    units = {"d": "days", "wk": "weeks", "mo": "months", "y": "years"}
+    for suffix, unit in units.items():
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return last_date - pd.DateOffset(**{unit: int(period[:-len(suffix)])})
+    raise ValueError(f"지원하지 않는 period: {period}")
+
+def price_fixture_fetcher(path=None):
+    """
+    market_data.set_price_fetcher()에 넣을 재생용 fetcher 생성
+    - 녹화된 마지막 날짜를 '오늘'로 보고 period만큼 잘라서 반환
+    - 녹화에 없는 티커는 yfinance처럼 결과에서 빠짐
+    """
+    history = load_price_history(path)
+    available = set(history.columns.get_level_values(0))
+    last_date = history.index.max()
+
+    def fetch(symbols, period):
+        start = _period_start(last_date, period)
+        frame = history if start is None else history.loc[history.index > start]
+        found = [s for s in symbols if s in available]
+        return frame.loc[:, frame.columns.get_level_values(0).isin(found)]
+
+    return fetch
@@ -0,0 +1,96 @@
+# backend/benchmarks/import_time.py
+"""
+서버 cold start import 시간 측정 (python -X importtime)
+
+사용법 (backend 폴더에서):
+    python benchmarks/import_time.py                     # main 모듈 기준 리포트
+    python benchmarks/import_time.py --budget-ms 500     # 총 import 시간이 500ms 초과 시 exit 1
+    python benchmarks/import_time.py --fail-on-heavy     # 무거운 라이브러리가 시작 시 import되면 exit 1 (CI용)
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# 첫 요청 전까지 import되면 안 되는 라이브러리 (각 서비스에서 첫 사용 시 lazy import)
+HEAVY_MODULES = [
+    "pandas", "numpy", "yfinance", "openai", "bs4", "jinja2",
+    "markdown", "pytz", "requests", "httpx", "PIL"
+]
+
+def run_importtime(module):
+    """하위 프로세스에서 module import -> {모듈명: 누적 import 시간(us)}"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+        env={**os.environ, "BRIEFING_SCHEDULER_ENABLED": "0"}
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} 실패:\n{proc.stderr[-2000:]}")
+
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        # 형식: "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            _, cum_us, name = line[len("import time:"):].split("|")
+            cumulative[name.strip()] = int(cum_us)
+        except ValueError:
+            continue
+    return cumulative
+
+def measure(module, runs):
+    """runs회 측정 후 모듈별 중앙값(ms)"""
+    samples = [run_importtime(module) for _ in range(runs)]
+    names = set().union(*samples)
+    return {
+        name: statistics.median(s.get(name, 0) for s in samples) / 1000
+        for name in names
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="cold start import 시간 측정")
+    parser.add_argument("--module", default="main", help="측정할 진입 모듈 (기본: main)")
+    parser.add_argument("--runs", type=int, default=5, help="반복 측정 횟수 (중앙값 사용)")
+    parser.add_argument("--top", type=int, default=15, help="출력할 상위 모듈 수")
+    parser.add_argument("--budget-ms", type=float, default=None, help="총 import 시간 상한 (초과 시 exit 1)")
+    parser.add_argument("--fail-on-heavy", action="store_true", help="HEAVY_MODULES가 시작 시 로드되면 exit 1")
+    args = parser.parse_args()
+
+    times = measure(args.module, args.runs)
+    total_ms = times.get(args.module, 0.0)
+
+    project = {n: t for n, t in times.items() if n == "main" or n.split(".")[0] in ("services", "routers")}
+    heavy = {n: times[n] for n in HEAVY_MODULES if n in times}
+
+    print(f"⏱️ import {args.module}: {total_ms:.1f} ms (중앙값, {args.runs}회)")
+    print("\n[프로젝트 모듈 (누적 ms)]")
+    for name, t in sorted(project.items(), key=lambda x: -x[1]):
+        print(f"  {t:8.1f}  {name}")
+
+    print(f"\n[상위 {args.top}개 모듈 (누적 ms)]")
+    for name, t in sorted(times.items(), key=lambda x: -x[1])[:args.top]:
+        print(f"  {t:8.1f}  {name}")
+
+    print("\n[시작 시 로드된 무거운 라이브러리]")
+    if heavy:
+        for name, t in sorted(heavy.items(), key=lambda x: -x[1]):
+            print(f"  ⚠️ {t:8.1f}  {name}")
+    else:
+        print("  없음 ✅")
+
+    failed = False
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"\n❌ import 시간 {total_ms:.1f} ms > 상한 {args.budget_ms:.1f} ms")
+        failed = True
+    if args.fail_on_heavy and heavy:
+        print(f"\n❌ 시작 시 무거운 라이브러리 로드됨: {sorted(heavy)}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
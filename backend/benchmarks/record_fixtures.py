@@ -0,0 +1,467 @@
+# backend/benchmarks/record_fixtures.py
+"""
+벤치마크용 fixtures 녹화
+
+사용법 (backend 폴더에서):
+    python benchmarks/record_fixtures.py                 # 실제 API에서 전체 녹화 (네트워크 + API 키 필요)
+    python benchmarks/record_fixtures.py --only prices   # 일부만 다시 녹화 (prices/fred/ff/rss/naver/apiflash/upstage)
+    python benchmarks/record_fixtures.py --synthetic     # 네트워크 없이 같은 형식의 샘플 데이터 생성
+
+- API 키(FRED_API_KEY / APIFLASH_ACCESS_KEY / UPSTAGE_API_KEY)가 없는 항목은 건너뜀
+- 녹화한 파일은 fixtures/ 에 저장되고 stub_server.py / run_benchmarks.py가 그대로 재생
+- 파일별 출처(recorded / synthetic)는 fixtures/SOURCES.json에 기록 -> run_benchmarks.py 출력에 표시
+"""
+import argparse
+import json
+import math
+import os
+import random
+import re
+import struct
+import sys
+import zlib
+from datetime import date, datetime, timedelta
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixture_data import (  # noqa: E402
+    APIFLASH_PNG_FILE, FF_CALENDAR_FILE, FIXTURE_DIR, FRED_FILE, NAVER_HTML_FILE,
+    NEWS_RSS_FILE, PRICES_FILE, SOURCES_FILE, UPSTAGE_FILE, fixture_path, load_fixture_sources
+)
+
+RECORD_TIMEOUT = 60  # 초
+FRED_RECORD_LIMIT = 60  # 시리즈별 녹화할 관측치 수 (services.economy_indicators.FRED_KEEP_OBS와 동일)
+
+def _gzip(content):
+    """재현 가능한 gzip (헤더의 mtime 고정 -> 다시 생성해도 파일 내용이 같음)"""
+    import gzip
+    return gzip.compress(content, mtime=0)
+
+def _write(name, content, source="recorded"):
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    mode = "wb" if isinstance(content, bytes) else "w"
+    with open(fixture_path(name), mode, **({} if mode == "wb" else {"encoding": "utf-8"})) as f:
+        f.write(content)
+
+    sources = load_fixture_sources()
+    sources[name] = source
+    with open(fixture_path(SOURCES_FILE), "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(sources.items())), f, indent=1)
+        f.write("\n")
+    print(f"💾 {name} ({len(content):,} bytes, {source})")
+
+def fixture_symbols():
+    """config/watchlist.json 의 모든 티커 (중복 제거)"""
+    from services.watchlist import list_watchlists, load_watchlist
+
+    symbols = []
+    for name in list_watchlists():
+        symbols.extend(load_watchlist(name, default={}).values())
+    return list(dict.fromkeys(symbols))
+
+# ---------------------------------------------------------
+# 실제 API 녹화
+# ---------------------------------------------------------
+def record_prices(client):
+    import yfinance as yf
+
+    df = yf.download(
+        fixture_symbols(), period="1y", group_by="ticker",
+        auto_adjust=False, progress=False, threads=True
+    )
+    df.index.name = "Date"
+    _write(PRICES_FILE, _gzip(df.to_csv(float_format="%.4f").encode("utf-8")))
+
+def record_fred(client):
+    from services.economy_indicators import FRED_URL, INDICATOR_MAP
+
+    api_key = os.getenv("FRED_API_KEY")
+    if not api_key:
+        print("⏭️ FRED_API_KEY 없음 - fred 건너뜀")
+        return
+
+    recorded = {}
+    for sid, info in INDICATOR_MAP.items():
+        res = client.get(FRED_URL, params={
+            "series_id": sid, "units": info["units"], "api_key": api_key,
+            "file_type": "json", "sort_order": "desc", "limit": FRED_RECORD_LIMIT
+        })
+        res.raise_for_status()
+        payload = res.json()
+        # 오름차순으로 저장 (stub 서버에서 observation_start 필터링)
+        payload["observations"] = sorted(payload.get("observations", []), key=lambda o: o["date"])
+        recorded[sid] = payload
+    _write(FRED_FILE, json.dumps(recorded, ensure_ascii=False, indent=1))
+
+def record_ff(client):
+    from services.economy_indicators import FF_URL
+
+    res = client.get(FF_URL)
+    res.raise_for_status()
+    _write(FF_CALENDAR_FILE, res.content)
+
+def record_rss(client):
+    from services.market_news_crawl_llm import TRACKS
+
+    # 트랙마다 쿼리만 다르고 형식은 같으므로 기사가 가장 많은 트랙 1개를 대표로 저장
+    # (stub 서버는 모든 /rss/search 요청에 이 피드를 돌려주고, 중복 링크는 수집 단계에서 걸러짐)
+    best = None
+    for track in TRACKS:
+        res = client.get(track["url"])
+        res.raise_for_status()
+        if best is None or res.content.count(b"<item>") > best.count(b"<item>"):
+            best = res.content
+    _write(NEWS_RSS_FILE, best)
+
+def record_naver(client):
+    from services.briefing_market_index import NAVER_URL
+
+    res = client.get(NAVER_URL)
+    res.raise_for_status()
+    _write(NAVER_HTML_FILE, res.content)
+
+def record_apiflash(client):
+    import asyncio
+    from services.briefing_market_index import _capture_sp500_map
+    from services.http_client import close_client
+
+    if not os.getenv("APIFLASH_ACCESS_KEY"):
+        print("⏭️ APIFLASH_ACCESS_KEY 없음 - apiflash 건너뜀")
+        return
+
+    async def capture():
+        try:
+            return await _capture_sp500_map()
+        finally:
+            await close_client()
+
+    raw = asyncio.run(capture())
+    if raw:
+        _write(APIFLASH_PNG_FILE, raw)
+
+def record_upstage(client):
+    from services.market_news_crawl_llm import (
+        SYSTEM_PROMPT, UPSTAGE_BASE_URL, UPSTAGE_MODEL, TRACKS, clean_html, iter_feed_entries
+    )
+
+    api_key = os.getenv("UPSTAGE_API_KEY")
+    if not api_key:
+        print("⏭️ UPSTAGE_API_KEY 없음 - upstage 건너뜀")
+        return
+
+    # 녹화된 RSS 기사로 실제 서비스와 같은 형식의 프롬프트 구성
+    limit = sum(track["limit"] for track in TRACKS)
+    context_text = ""
+    for i, entry in enumerate(iter_feed_entries(fixture_path(NEWS_RSS_FILE))):
+        if i >= limit:
+            break
+        context_text += f"[News {i+1}] - {entry['published']}\nTitle: {entry['title']}\nContent: {clean_html(entry['description'])[:300]}\n\n"
+
+    res = client.post(
+        f"{UPSTAGE_BASE_URL}/chat/completions",
+        headers={"Authorization": f"Bearer {api_key}"},
+        json={
+            "model": UPSTAGE_MODEL,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": f"Here is the collected news data:\n{context_text}"}
+            ],
+            "temperature": 0.1
+        }
+    )
+    res.raise_for_status()
+    _write(UPSTAGE_FILE, json.dumps(res.json(), ensure_ascii=False, indent=1))
+
+RECORDERS = {
+    "prices": record_prices,
+    "fred": record_fred,
+    "ff": record_ff,
+    "rss": record_rss,
+    "naver": record_naver,
+    "apiflash": record_apiflash,
+    "upstage": record_upstage,
+}
+
+# ---------------------------------------------------------
+# 샘플 데이터 생성 (네트워크 없이 같은 형식으로)
+# ---------------------------------------------------------
+SYNTHETIC_END = date(2026, 10, 16)  # 금요일 (미국 장 마감 기준)
+SYNTHETIC_SEED = 20261016
+
+SYNTHETIC_BASE_PRICES = {
+    "^DJI": 46000, "^GSPC": 6600, "^IXIC": 22500, "^RUT": 2450, "CL=F": 62,
+    "GC=F": 4200, "BTC-USD": 108000, "^TNX": 4.05, "DX-Y.NYB": 98.5,
+    "AAPL": 250, "MSFT": 510, "NVDA": 185, "AMZN": 215, "GOOGL": 250,
+    "META": 710, "TSLA": 435, "AVGO": 345, "AMD": 235, "NFLX": 1200,
+}
+
+def synthetic_prices(symbols):
+    """티커별 랜덤워크 일봉 (BTC-USD는 주말 포함, 나머지는 평일만 - yfinance와 같은 NaN 구조)"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(SYNTHETIC_SEED)
+    index = pd.date_range(end=pd.Timestamp(SYNTHETIC_END), periods=366, freq="D", name="Date")
+    weekday = index.dayofweek < 5
+
+    frames = {}
+    for symbol in symbols:
+        base = SYNTHETIC_BASE_PRICES.get(symbol, 100)
+        vol = 0.03 if symbol == "BTC-USD" else 0.012
+        close = base * np.exp(np.cumsum(rng.normal(0.0003, vol, len(index))))
+        open_ = close * (1 + rng.normal(0, vol / 3, len(index)))
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, vol / 2, len(index))))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, vol / 2, len(index))))
+        volume = rng.integers(1_000_000, 50_000_000, len(index)).astype(float)
+        frame = pd.DataFrame({
+            "Open": open_, "High": high, "Low": low, "Close": close, "Adj Close": close, "Volume": volume
+        }, index=index)
+        if symbol != "BTC-USD":
+            frame[~weekday] = np.nan
+        if symbol in ("^TNX", "DX-Y.NYB"):
+            frame["Volume"] = frame["Volume"].where(frame["Volume"].isna(), 0.0)
+        frames[symbol] = frame
+
+    df = pd.concat(frames, axis=1, names=["Ticker", "Price"])
+    return df.to_csv(float_format="%.4f").encode("utf-8")
+
+SYNTHETIC_FRED = {
+    # sid: (시작값, 월간 변화 표준편차, 주간 여부)
+    "CPIAUCSL": (2.9, 0.1, False),
+    "PPIFIS": (2.6, 0.2, False),
+    "PCEPI": (2.7, 0.1, False),
+    "PAYEMS": (120, 60, False),
+    "ICSA": (225000, 8000, True),
+    "RSAFS": (0.4, 0.4, False),
+    "DFEDTARU": (4.25, 0.0, False),
+}
+
+def synthetic_fred():
+    """INDICATOR_MAP 시리즈별 관측치 60개 (중간에 결측치 '.' 1개 포함)"""
+    from services.economy_indicators import INDICATOR_MAP
+
+    rng = random.Random(SYNTHETIC_SEED)
+    recorded = {}
+    for sid, info in INDICATOR_MAP.items():
+        value, step, weekly = SYNTHETIC_FRED.get(sid, (1.0, 0.1, False))
+        observations = []
+        for i in range(FRED_RECORD_LIMIT):
+            back = FRED_RECORD_LIMIT - 1 - i
+            if weekly:
+                d = SYNTHETIC_END - timedelta(days=6 + 7 * back)
+            else:
+                month = (SYNTHETIC_END.year * 12 + SYNTHETIC_END.month - 2) - back
+                d = date(month // 12, month % 12 + 1, 1)
+            value += rng.gauss(0, step)
+            observations.append({
+                "realtime_start": SYNTHETIC_END.isoformat(), "realtime_end": SYNTHETIC_END.isoformat(),
+                "date": d.isoformat(), "value": "." if i == FRED_RECORD_LIMIT - 10 else f"{value:.3f}"
+            })
+        recorded[sid] = {
+            "realtime_start": SYNTHETIC_END.isoformat(), "realtime_end": SYNTHETIC_END.isoformat(),
+            "units": info["units"], "file_type": "json", "count": len(observations),
+            "observations": observations
+        }
+    return json.dumps(recorded, ensure_ascii=False, indent=1)
+
+def synthetic_ff_calendar():
+    """
+    Forex Factory 주간 캘린더 XML (USD + 타 통화 이벤트, 실제 피드와 같은 태그 구조)
+    - INDICATOR_MAP의 모든 ff_title 이벤트 포함 (FRED 시리즈마다 매칭 경로가 측정되도록)
+    - url은 실제 FF 페이지가 아닌 example.com 주소 (샘플 데이터임을 구분)
+    """
+    from services.economy_indicators import INDICATOR_MAP
+
+    monday = SYNTHETIC_END - timedelta(days=SYNTHETIC_END.weekday())
+    events = [
+        (0, "8:30am", "USD", "Empire State Manufacturing Index", "High", "1.2"),
+        (1, "8:30am", "USD", "CPI y/y", "High", "2.9%"),
+        (1, "8:30am", "USD", "Core CPI y/y", "High", "3.1%"),
+        (1, "2:00am", "GBP", "Claimant Count Change", "High", "20.3K"),
+        (2, "8:30am", "USD", "PPI m/m", "High", "0.3%"),
+        (2, "8:30am", "USD", "Core PPI m/m", "Medium", "0.2%"),
+        (2, "10:00am", "EUR", "ECB President Lagarde Speaks", "High", ""),
+        (2, "2:00pm", "USD", "Federal Funds Rate", "High", "4.25%"),
+        (2, "2:00pm", "USD", "FOMC Statement", "High", ""),
+        (3, "8:30am", "USD", "Unemployment Claims", "High", "231K"),
+        (3, "8:30am", "USD", "Retail Sales m/m", "High", "0.4%"),
+        (3, "8:30am", "USD", "Core Retail Sales m/m", "High", "0.3%"),
+        (3, "Tentative", "JPY", "BOJ Policy Rate", "High", "0.50%"),
+        (4, "8:30am", "USD", "Core PCE Price Index m/m", "High", "0.2%"),
+        (4, "8:30am", "USD", "Non-Farm Employment Change", "High", "120K"),
+        (4, "10:00am", "USD", "Prelim UoM Consumer Sentiment", "High", "55.0"),
+        (4, "8:30am", "USD", "Building Permits", "Medium", "1.35M"),
+    ]
+    missing = {info["ff_title"] for info in INDICATOR_MAP.values()} - {e[3] for e in events if e[2] == "USD"}
+    if missing:
+        raise ValueError(f"샘플 캘린더에 없는 지표: {sorted(missing)}")
+
+    lines = ['<?xml version="1.0" encoding="windows-1252"?>', "<weeklyevents>"]
+    for i, (day, time_str, country, title, impact, forecast) in enumerate(events):
+        d = monday + timedelta(days=day)
+        slug = "-".join(re.sub(r"[^0-9a-z]+", " ", title.lower()).split())
+        lines.append(
+            "<event>"
+            f"<title>{title}</title><country>{country}</country>"
+            f"<date><![CDATA[{d.strftime('%m-%d-%Y')}]]></date><time><![CDATA[{time_str}]]></time>"
+            f"<impact><![CDATA[{impact}]]></impact><forecast><![CDATA[{forecast}]]></forecast>"
+            "<previous><![CDATA[]]></previous>"
+            f"<url><![CDATA[https://example.com/synthetic/calendar/{i:02d}-{country.lower()}-{slug}]]></url>"
+            "</event>"
+        )
+    lines.append("</weeklyevents>")
+    return "\n".join(lines).encode("cp1252")
+
+SYNTHETIC_HEADLINES = [
+    "S&P 500 ends higher as tech rally offsets rate worries",
+    "Nasdaq closes at record as chipmakers climb",
+    "Wall Street rises as Treasury yields fall on soft inflation data",
+    "US stocks climb as bank earnings beat expectations",
+    "Wall Street drops on renewed trade tensions",
+    "US stocks fall as oil prices jump",
+    "Stocks making the biggest moves after hours: NFLX, TSLA, AMD",
+    "Most active stocks on the S&P 500 today",
+    "Dow settles up 300 points as investors weigh Fed outlook",
+    "Nasdaq wrap: megacaps lead gains into the close",
+    "S&P 500 biggest movers: regional banks rebound",
+    "Wall Street climbs on hopes of rate cut",
+]
+
+def synthetic_rss():
+    """Google News RSS 형식 (item 12개)"""
+    from xml.sax.saxutils import escape
+
+    end = datetime(SYNTHETIC_END.year, SYNTHETIC_END.month, SYNTHETIC_END.day, 21, 0)
+    items = []
+    for i, title in enumerate(map(escape, SYNTHETIC_HEADLINES)):
+        pub = (end - timedelta(minutes=25 * i)).strftime("%a, %d %b %Y %H:%M:%S GMT")
+        items.append(
+            "<item>"
+            f"<title>{title} - Market Wire</title>"
+            f"<link>https://news.google.com/rss/articles/bench-{i:02d}?oc=5</link>"
+            f'<guid isPermaLink="false">bench-{i:02d}</guid>'
+            f"<pubDate>{pub}</pubDate>"
+            f'<description>&lt;a href="https://example.com/{i}"&gt;{escape(title)}&lt;/a&gt;&amp;nbsp;&amp;nbsp;'
+            f'&lt;font color="#6f6f6f"&gt;Market Wire&lt;/font&gt;</description>'
+            '<source url="https://example.com">Market Wire</source>'
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>'
+        "<generator>NFE/5.0</generator><title>Google News</title>"
+        "<link>https://news.google.com/search</link><language>en-US</language>"
+        + "".join(items) +
+        "</channel></rss>"
+    ).encode("utf-8")
+
+def synthetic_naver():
+    """네이버 금융 시장지표 페이지 중 환율 리스트 부분 (셀렉터 구조만 유지)"""
+    rates = [("usd", "미국 USD", "1,421.50"), ("jpy", "일본 JPY(100엔)", "944.18"),
+             ("eur", "유럽연합 EUR", "1,657.23"), ("cny", "중국 CNY", "199.41")]
+    items = "\n".join(
+        f'<li class="{"on" if i == 0 else ""}"><a href="#" class="head {code}">'
+        f'<h3 class="h_lst"><span class="blind">{label}</span></h3>'
+        f'<div class="head_info point_up"><span class="value">{value}</span>'
+        '<span class="txt_krw"><span class="blind">원</span></span>'
+        '<span class="change"> 3.50</span></div></a></li>'
+        for i, (code, label, value) in enumerate(rates)
+    )
+    filler = "\n".join(f'<div class="section_news"><p>시장지표 {i}</p></div>' for i in range(200))
+    return (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>시장지표 : 네이버페이 증권</title></head>'
+        f'<body><div id="wrap"><div class="market1"><div class="data"><ul id="exchangeList" class="data_lst">{items}</ul>'
+        f"</div></div>{filler}</div></body></html>"
+    ).encode("utf-8")
+
+def _png_chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+def synthetic_png(width=1920, height=1080):
+    """finviz 섹터 맵 느낌의 색 블록 PNG (표준 라이브러리만 사용)"""
+    rng = random.Random(SYNTHETIC_SEED)
+    cols, rows = 12, 8
+    colors = [
+        [(int(48 + 140 * max(0.0, s)), int(48 + 140 * max(0.0, -s)), 60) for s in
+         (math.tanh(rng.gauss(0, 1)) for _ in range(cols))]
+        for _ in range(rows)
+    ]
+    raw = bytearray()
+    for y in range(height):
+        row_colors = colors[min(rows - 1, y * rows // height)]
+        raw.append(0)  # filter: None
+        border_y = y % (height // rows) < 2
+        for x in range(width):
+            if border_y or x % (width // cols) < 2:
+                raw += b"\x20\x20\x20"
+            else:
+                raw += bytes(row_colors[min(cols - 1, x * cols // width)])
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", ihdr) + _png_chunk(b"IDAT", zlib.compress(bytes(raw), 9)) + _png_chunk(b"IEND", b"")
+
+def synthetic_upstage():
+    """Upstage chat.completion 응답 (content는 서비스가 기대하는 JSON 문자열)"""
+    content = {
+        "market_summary": (
+            "뉴욕 증시는 기술주 강세와 국채 금리 하락에 힘입어 상승 마감했습니다. "
+            "S&P 500과 나스닥은 반도체주 중심의 매수세로 사상 최고치를 경신했습니다. "
+            "투자자들은 연준의 금리 인하 가능성과 은행 실적 호조에 주목했습니다."
+        ),
+        "news_list": [
+            {"korean_title": f"[번역] {title}", "original_title": f"{title} - Market Wire"}
+            for title in SYNTHETIC_HEADLINES
+        ]
+    }
+    response = {
+        "id": "chatcmpl-bench-0001",
+        "object": "chat.completion",
+        "created": int(datetime(SYNTHETIC_END.year, SYNTHETIC_END.month, SYNTHETIC_END.day, 21, 5).timestamp()),
+        "model": "solar-1-mini-chat",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": "```json\n" + json.dumps(content, ensure_ascii=False, indent=2) + "\n```"},
+            "logprobs": None,
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 1320, "completion_tokens": 640, "total_tokens": 1960},
+        "system_fingerprint": None
+    }
+    return json.dumps(response, ensure_ascii=False, indent=1)
+
+SYNTHESIZERS = {
+    "prices": lambda: _write(PRICES_FILE, _gzip(synthetic_prices(fixture_symbols())), "synthetic"),
+    "fred": lambda: _write(FRED_FILE, synthetic_fred(), "synthetic"),
+    "ff": lambda: _write(FF_CALENDAR_FILE, synthetic_ff_calendar(), "synthetic"),
+    "rss": lambda: _write(NEWS_RSS_FILE, synthetic_rss(), "synthetic"),
+    "naver": lambda: _write(NAVER_HTML_FILE, synthetic_naver(), "synthetic"),
+    "apiflash": lambda: _write(APIFLASH_PNG_FILE, synthetic_png(), "synthetic"),
+    "upstage": lambda: _write(UPSTAGE_FILE, synthetic_upstage(), "synthetic"),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 fixtures 녹화")
+    parser.add_argument("--only", nargs="+", choices=sorted(RECORDERS), help="녹화할 항목 (기본: 전체)")
+    parser.add_argument("--synthetic", action="store_true", help="네트워크 없이 샘플 데이터 생성")
+    args = parser.parse_args()
+
+    names = args.only or list(RECORDERS)
+    if args.synthetic:
+        for name in names:
+            SYNTHESIZERS[name]()
+        return
+
+    from dotenv import load_dotenv
+    import httpx
+
+    load_dotenv(os.path.join(BACKEND_DIR, ".env"))
+    with httpx.Client(timeout=RECORD_TIMEOUT, headers={"User-Agent": "Mozilla/5.0"}, follow_redirects=True) as client:
+        for name in names:
+            try:
+                RECORDERS[name](client)
+            except Exception as e:
+                print(f"❌ {name} 녹화 실패: {e}")
+
+if __name__ == "__main__":
+    main()
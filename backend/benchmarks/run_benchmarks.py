@@ -0,0 +1,302 @@
+# backend/benchmarks/run_benchmarks.py
+"""
+오프라인 벤치마크 (녹화된 fixtures + 로컬 stub 서버, 네트워크 불필요)
+
+사용법 (backend 폴더에서):
+    python benchmarks/run_benchmarks.py                          # 전체 (cold + warm)
+    python benchmarks/run_benchmarks.py --mode warm --runs 20    # 캐시가 찬 상태만
+    python benchmarks/run_benchmarks.py --only market_news economy
+    python benchmarks/run_benchmarks.py --json result.json       # 결과 저장
+    python benchmarks/run_benchmarks.py --baseline base.json     # p95가 기준보다 25% 넘게 느려지면 exit 1 (CI용)
+
+- cold: 매 반복마다 메모리/디스크 캐시를 비우고 측정 (첫 요청 기준)
+- warm: 1회 예열 후 측정 (TTL/조건부 요청 캐시가 동작하는 상태)
+- 시간(p50/p95)은 tracemalloc 없이 측정하고, 최대 메모리는 별도 1회 추가 실행으로 측정
+- fixtures 출처(recorded / synthetic)를 출력과 결과 JSON에 함께 기록 (synthetic은 실제 응답 크기/분포와 다를 수 있음)
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixture_data import load_fixture_sources, price_fixture_fetcher  # noqa: E402
+from stub_server import StubServer, parse_route_latency, stub_env  # noqa: E402
+
+DEFAULT_LATENCY_MS = 50  # stub 서버 기본 응답 지연 (실제 API 대기 흉내)
+DEFAULT_PRICE_LATENCY_MS = 300  # yfinance 1회 호출 지연
+DEFAULT_TOLERANCE = 0.25
+
+# cold 모드에서 반복마다 지우는 data 하위 폴더 (스냅샷 DB는 유지)
+CACHE_DIRS = ["fred", "forex_factory", "rss", "llm_cache", "assets", "briefing"]
+
+def percentile(samples, pct):
+    """nearest-rank 백분위수"""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def setup_environment(base_url, data_dir):
+    """services import 전에 호출 (모듈 상수가 import 시점에 환경변수를 읽음)"""
+    os.environ.update(stub_env(base_url))
+    os.environ.update({
+        "REPORTER_DATA_DIR": data_dir,
+        "BRIEFING_SCHEDULER_ENABLED": "0",
+        "EMAIL_IMAGE_MODE": "inline",
+        "PUBLIC_BASE_URL": "",
+        "TEMPLATE_AUTO_RELOAD": "0",
+    })
+
+def install_price_fixture(latency):
+    """yfinance 대신 녹화된 시세를 재생 (호출마다 latency초 지연)"""
+    from services.market_data import set_price_fetcher
+
+    fetch = price_fixture_fetcher()
+
+    def delayed_fetch(symbols, period):
+        if latency > 0:
+            time.sleep(latency)
+        return fetch(symbols, period)
+
+    set_price_fetcher(delayed_fetch)
+
+def reset_caches(data_dir):
+    """메모리 시세 캐시 + 디스크 캐시 비우기 (cold 측정용)"""
+    from services import briefing_scheduler
+    from services.market_data import clear_cache
+
+    clear_cache()
+    briefing_scheduler._latest.clear()
+    for name in CACHE_DIRS:
+        shutil.rmtree(os.path.join(data_dir, name), ignore_errors=True)
+
+def build_cases():
+    """측정 대상: 이름 -> 코루틴 함수 (services는 환경변수 설정 후 import)"""
+    from services.briefing_market_index import get_market_summary_rows, get_naver_usd_rate, get_sp500_map_asset
+    from services.economy_indicators import get_economy_indicators, get_forex_factory_data, get_fred_data
+    from services.email_builder import collect_briefing_data, render_email_report
+    from services.market_data import compute_price_changes, get_price_frames
+    from services.market_news_crawl_llm import get_market_news
+    from services.watchlist import load_watchlist
+
+    async def reporter_prices():
+        symbols = list(load_watchlist("reporter", default={}).values())
+        df = await asyncio.to_thread(get_price_frames, symbols, "5d")
+        return compute_price_changes(df, symbols)
+
+    async def watchlist_prices():
+        symbols = list(load_watchlist("interest", default={}).values())
+        df = await asyncio.to_thread(get_price_frames, symbols, "5d")
+        return compute_price_changes(df, symbols)
+
+    async def render_report():
+        data, _ = await collect_briefing_data()
+        return render_email_report(data)
+
+    return {
+        "naver_usd_rate": get_naver_usd_rate,
+        "market_summary": get_market_summary_rows,
+        "reporter_prices": reporter_prices,
+        "watchlist_prices": watchlist_prices,
+        "sp500_map": get_sp500_map_asset,
+        "fred": get_fred_data,
+        "forex_factory": get_forex_factory_data,
+        "economy": get_economy_indicators,
+        "market_news": get_market_news,
+        "collect_briefing": collect_briefing_data,
+        "render_report": render_report,
+    }
+
+def summarize(name, mode, samples, peak_bytes):
+    return {
+        "name": name,
+        "mode": mode,
+        "runs": len(samples),
+        "p50_ms": round(statistics.median(samples) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "min_ms": round(min(samples) * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+        "peak_mem_kb": round(peak_bytes / 1024, 1),
+    }
+
+async def _run_case(func, mode, runs, data_dir):
+    """한 케이스 측정 -> (소요시간 목록, tracemalloc 최대 메모리)"""
+    if mode == "warm":
+        await func()
+
+    samples = []
+    for _ in range(runs):
+        if mode == "cold":
+            reset_caches(data_dir)
+        start = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - start)
+
+    if mode == "cold":
+        reset_caches(data_dir)
+    tracemalloc.start()
+    try:
+        await func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return samples, peak
+
+async def run_service_cases(names, modes, runs, data_dir):
+    from services.http_client import close_client
+
+    cases = build_cases()
+    results = []
+    try:
+        for mode in modes:
+            for name in names:
+                if name not in cases:
+                    continue
+                samples, peak = await _run_case(cases[name], mode, runs, data_dir)
+                results.append(summarize(name, mode, samples, peak))
+                print_row(results[-1])
+    finally:
+        # TestClient는 자체 이벤트 루프에서 lifespan을 돌리므로 이 루프의 클라이언트는 닫아둠
+        await close_client()
+    return results
+
+def run_endpoint_case(modes, runs, data_dir):
+    """POST /report/daily-briefing?refresh=true 종단 간 측정 (FastAPI TestClient, lifespan 포함)"""
+    from fastapi.testclient import TestClient
+    from main import app
+
+    results = []
+    with TestClient(app) as client:
+        def call():
+            res = client.post("/report/daily-briefing", params={"refresh": "true"})
+            res.raise_for_status()
+            return res
+
+        for mode in modes:
+            if mode == "warm":
+                call()
+            samples = []
+            for _ in range(runs):
+                if mode == "cold":
+                    reset_caches(data_dir)
+                start = time.perf_counter()
+                call()
+                samples.append(time.perf_counter() - start)
+
+            if mode == "cold":
+                reset_caches(data_dir)
+            tracemalloc.start()
+            try:
+                call()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            results.append(summarize("endpoint_daily_briefing", mode, samples, peak))
+            print_row(results[-1])
+    return results
+
+def print_header():
+    print(f"{'case':<26} {'mode':<5} {'runs':>4} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10} {'peak KB':>10}")
+    print("-" * 81)
+
+def print_row(r):
+    print(f"{r['name']:<26} {r['mode']:<5} {r['runs']:>4} {r['p50_ms']:>10.2f} {r['p95_ms']:>10.2f} {r['max_ms']:>10.2f} {r['peak_mem_kb']:>10.1f}")
+
+def compare_baseline(results, baseline_path, tolerance):
+    """기준 결과 대비 p95가 tolerance 비율 넘게 느려진 케이스 목록"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["name"], r["mode"]): r for r in json.load(f)["results"]}
+
+    regressions = []
+    for r in results:
+        base = baseline.get((r["name"], r["mode"]))
+        if base and r["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append((r["name"], r["mode"], base["p95_ms"], r["p95_ms"]))
+    return regressions
+
+def describe_fixture_sources(sources):
+    """fixtures 출처 요약 한 줄 (예: '📼 fixtures: synthetic (fred, ff...) / recorded (prices)')"""
+    grouped = {}
+    for name, source in sorted(sources.items()):
+        grouped.setdefault(source, []).append(name)
+    if not grouped:
+        return "📼 fixtures: 출처 기록 없음 (SOURCES.json)"
+    summary = " / ".join(f"{source} ({', '.join(names)})" for source, names in sorted(grouped.items()))
+    warning = " ⚠️ 샘플 데이터 포함 - 실제 API 응답 기준 수치가 아님" if "synthetic" in grouped else ""
+    return f"📼 fixtures: {summary}{warning}"
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 벤치마크 (fixtures + stub 서버)")
+    parser.add_argument("--runs", type=int, default=10, help="케이스별 측정 횟수")
+    parser.add_argument("--mode", choices=["cold", "warm", "both"], default="both")
+    parser.add_argument("--only", nargs="+", help="측정할 케이스 이름 (endpoint_daily_briefing 포함)")
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_LATENCY_MS, help="stub 서버 기본 지연(ms)")
+    parser.add_argument("--route-latency", nargs="*", metavar="PATH=MS", help="stub 서버 경로별 지연")
+    parser.add_argument("--price-latency-ms", type=float, default=DEFAULT_PRICE_LATENCY_MS, help="시세 조회 1회 지연(ms)")
+    parser.add_argument("--skip-endpoint", action="store_true", help="FastAPI 종단 간 측정 생략")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON (p95 회귀 시 exit 1)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="허용 p95 증가 비율 (기본 0.25)")
+    args = parser.parse_args()
+
+    modes = ["cold", "warm"] if args.mode == "both" else [args.mode]
+    data_dir = tempfile.mkdtemp(prefix="reporter-bench-")
+    server = StubServer(latency=args.latency_ms / 1000, route_latency=parse_route_latency(args.route_latency))
+    base_url = server.start()
+    setup_environment(base_url, data_dir)
+    install_price_fixture(args.price_latency_ms / 1000)
+
+    names = args.only or list(build_cases()) + ["endpoint_daily_briefing"]
+    sources = load_fixture_sources()
+    print(f"🧪 stub 서버 {base_url} (지연 {args.latency_ms:.0f}ms) / data {data_dir}")
+    print(describe_fixture_sources(sources) + "\n")
+    print_header()
+
+    try:
+        results = asyncio.run(run_service_cases(names, modes, args.runs, data_dir))
+        if "endpoint_daily_briefing" in names and not args.skip_endpoint:
+            results += run_endpoint_case(modes, args.runs, data_dir)
+    finally:
+        server.stop()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    # ru_maxrss: Linux는 KB, macOS는 bytes
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    max_rss_kb = max_rss / 1024 if sys.platform == "darwin" else max_rss
+    print(f"\n프로세스 최대 RSS: {max_rss_kb / 1024:.1f} MB")
+    print("stub 요청 수: " + ", ".join(f"{path} {status}={count}" for (path, status), count in sorted(server.hits.items())))
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "settings": {"runs": args.runs, "latency_ms": args.latency_ms, "price_latency_ms": args.price_latency_ms},
+        "fixtures": sources,
+        "max_rss_kb": max_rss_kb,
+        "results": results,
+    }
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json_path}")
+
+    if args.baseline:
+        regressions = compare_baseline(results, args.baseline, args.tolerance)
+        for name, mode, base_p95, p95 in regressions:
+            print(f"❌ 성능 회귀: {name} ({mode}) p95 {base_p95:.2f}ms -> {p95:.2f}ms")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ 기준 대비 p95 회귀 없음 (허용 {args.tolerance:.0%})")
+
+if __name__ == "__main__":
+    main()
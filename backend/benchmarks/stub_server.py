@@ -0,0 +1,207 @@
+# backend/benchmarks/stub_server.py
+"""
+외부 API 대신 녹화된 fixtures를 돌려주는 로컬 stub 서버 (표준 라이브러리만 사용)
+
+사용법 (backend 폴더에서):
+    python benchmarks/stub_server.py --port 8765 --latency-ms 80
+    -> 서비스 쪽 환경변수를 stub_env(base_url) 값으로 맞추면 네트워크 없이 동작
+
+- 경로별 지연(latency)을 줘서 실제 API 대기 시간을 흉내냄
+- RSS / Forex Factory는 ETag + 304 응답 지원 (조건부 요청 경로 측정용)
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixture_data import (  # noqa: E402
+    APIFLASH_PNG_FILE, FF_CALENDAR_FILE, FRED_FILE, NAVER_HTML_FILE, NEWS_RSS_FILE,
+    UPSTAGE_FILE, read_fixture
+)
+
+# 경로 -> (fixture 파일, Content-Type, ETag 지원 여부)
+STATIC_ROUTES = {
+    "/ff_calendar_thisweek.xml": (FF_CALENDAR_FILE, "application/xml", True),
+    "/rss/search": (NEWS_RSS_FILE, "application/rss+xml; charset=utf-8", True),
+    "/naver/marketindex/": (NAVER_HTML_FILE, "text/html; charset=utf-8", False),
+    "/apiflash/v1/urltoimage": (APIFLASH_PNG_FILE, "image/png", False),
+}
+FRED_ROUTE = "/fred/series/observations"
+UPSTAGE_ROUTE = "/upstage/v1/solar/chat/completions"
+
+def stub_env(base_url):
+    """서비스들이 stub 서버를 보도록 하는 환경변수 (services import 전에 설정해야 함)"""
+    return {
+        "FRED_URL": base_url + FRED_ROUTE,
+        "FF_CALENDAR_URL": base_url + "/ff_calendar_thisweek.xml",
+        "NEWS_RSS_BASE_URL": base_url,
+        "NAVER_MARKETINDEX_URL": base_url + "/naver/marketindex/",
+        "APIFLASH_URL": base_url + "/apiflash/v1/urltoimage",
+        "UPSTAGE_BASE_URL": base_url + "/upstage/v1/solar",
+        "FRED_API_KEY": "bench",
+        "APIFLASH_ACCESS_KEY": "bench",
+        "UPSTAGE_API_KEY": "bench",
+    }
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive (커넥션 풀 재사용 경로도 측정되도록)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _delay(self, path):
+        latency = self.server.route_latency.get(path, self.server.latency)
+        if latency > 0:
+            time.sleep(latency)
+
+    def _send(self, status, body=b"", content_type=None, headers=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+        self.server.record_hit(self.path.split("?", 1)[0], status)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self._delay(url.path)
+
+        if url.path == FRED_ROUTE:
+            return self._send_fred(parse_qs(url.query))
+
+        route = STATIC_ROUTES.get(url.path)
+        if route is None:
+            return self._send(404, b"not found", "text/plain")
+
+        name, content_type, conditional = route
+        body = self.server.fixture(name)
+        if not conditional:
+            return self._send(200, body, content_type)
+
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, headers={"ETag": etag})
+        return self._send(200, body, content_type, {"ETag": etag, "Last-Modified": self.server.started_http_date})
+
+    def _send_fred(self, query):
+        """FRED series/observations (observation_start / sort_order / limit 파라미터 반영)"""
+        sid = query.get("series_id", [""])[0]
+        series = self.server.fred.get(sid)
+        if series is None:
+            return self._send(400, json.dumps({"error_message": f"Bad Request. Series {sid} does not exist."}).encode(), "application/json")
+
+        observations = series["observations"]
+        start = query.get("observation_start", [None])[0]
+        if start:
+            observations = [o for o in observations if o["date"] >= start]
+        if query.get("sort_order", ["asc"])[0] == "desc":
+            observations = observations[::-1]
+        limit = query.get("limit", [None])[0]
+        if limit:
+            observations = observations[:int(limit)]
+
+        payload = {**series, "count": len(observations), "observations": observations}
+        return self._send(200, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self._delay(url.path)
+
+        if url.path != UPSTAGE_ROUTE:
+            return self._send(404, b"not found", "text/plain")
+        return self._send(200, self.server.fixture(UPSTAGE_FILE), "application/json")
+
+class StubServer(ThreadingHTTPServer):
+    """
+    fixtures 재생 서버
+    - latency: 모든 경로 기본 지연(초) / route_latency: 경로별 지연(초) 덮어쓰기
+    - hits: (경로, 상태코드)별 요청 수 (캐시/조건부 요청이 실제로 동작했는지 확인용)
+    """
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, route_latency=None, verbose=False):
+        super().__init__((host, port), StubHandler)
+        self.latency = latency
+        self.route_latency = route_latency or {}
+        self.verbose = verbose
+        self.started_http_date = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime())
+        self.fred = json.loads(read_fixture(FRED_FILE, "r"))
+        self._fixtures = {}
+        self.hits = {}
+        self._hits_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fixture(self, name):
+        if name not in self._fixtures:
+            self._fixtures[name] = read_fixture(name)
+        return self._fixtures[name]
+
+    def record_hit(self, path, status):
+        with self._hits_lock:
+            self.hits[(path, status)] = self.hits.get((path, status), 0) + 1
+
+    def reset_hits(self):
+        with self._hits_lock:
+            self.hits.clear()
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작 -> base_url 반환"""
+        self._thread = threading.Thread(target=self.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+def parse_route_latency(values):
+    """['/rss/search=200', ...] -> {'/rss/search': 0.2}"""
+    result = {}
+    for value in values or []:
+        path, _, ms = value.partition("=")
+        result[path] = float(ms) / 1000
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="fixtures 재생 stub 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0, help="모든 경로 기본 지연(ms)")
+    parser.add_argument("--route-latency", nargs="*", metavar="PATH=MS", help="경로별 지연 (예: /upstage/v1/solar/chat/completions=1500)")
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, args.latency_ms / 1000, parse_route_latency(args.route_latency), verbose=True)
+    print(f"🧪 stub 서버 시작: {server.base_url}")
+    for key, value in stub_env(server.base_url).items():
+        print(f"export {key}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
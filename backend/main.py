@@ -1,100 +1,112 @@
 # backend/main.py
 
-from fastapi import FastAPI
-import yfinance as yf
+import asyncio
+from contextlib import asynccontextmanager, nullcontext
+from fastapi import FastAPI, Request
 from datetime import datetime
-import pandas as pd
 import math
 import os
+import time
 from dotenv import load_dotenv
-from routers import report
 
-
-# 1. 환경변수 로드
+# 1. 환경변수 로드 (routers / services 가 import 시점에 환경변수를 읽으므로 가장 먼저)
 load_dotenv()
 
-app = FastAPI()
+from routers import metrics, report
+from services.briefing_scheduler import start_scheduler, stop_scheduler
+from services.http_client import close_client, open_client
+from services.live_quotes import stop_quote_stream
+from services.market_data import get_price_frames, session_price_changes
+from services.metrics import HTTP_LATENCY, profiled
+from services.responses import CompressionMiddleware, FastJSONResponse
+from services.watchlist import load_watchlist
+
+# 앱 시작/종료 시 공유 HTTP 클라이언트 + 브리핑 사전 생성 스케줄러 + 실시간 시세 폴러 관리
+@asynccontextmanager
+async def lifespan(app):
+    await open_client()
+    start_scheduler()
+    yield
+    await stop_scheduler()
+    await stop_quote_stream()
+    await close_client()
+
+# 전체 라우터 JSON 응답은 orjson으로 직렬화 (NaN / inf -> null 자동 처리)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+
+# /StockMarket_Auto_Reporter 기본 티커 (config/watchlist.json 의 "reporter"가 우선)
+DEFAULT_REPORTER_TICKERS = {
+    'S&P500': '^GSPC', 
+    'Nasdaq': '^IXIC',
+    'Bitcoin': 'BTC-USD' 
+}
 
 # 라우터 등록 
 app.include_router(report.router)
+app.include_router(metrics.router)
+
+# 큰 응답 본문(HTML, Base64, JSON) brotli / gzip 압축
+app.add_middleware(CompressionMiddleware)
 
-# ---------------------------------------------------------
-# [핵심] JSON 변환 에러 방지용 '청소기 함수'
-# 데이터 안에 숨어있는 NaN(Not a Number)을 찾아서 None(null)으로 바꿈
-# ---------------------------------------------------------
-def clean_data(data):
-    if isinstance(data, dict):
-        return {k: clean_data(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [clean_data(v) for v in data]
-    elif isinstance(data, float):
-        if math.isnan(data) or math.isinf(data):
-            return None  # NaN이나 무한대는 None으로 변경
-    return data
-# ---------------------------------------------------------
+# 엔드포인트별 응답 시간 기록 (+ PROFILING_ENABLED=1 이고 'X-Profile: 1' 헤더가 있으면 요청 단위 cProfile)
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    profile = request.headers.get("x-profile") == "1"
+    try:
+        with (profiled(f"{request.method}_{request.url.path}") if profile else nullcontext()) as profile_path:
+            response = await call_next(request)
+        if profile_path:
+            response.headers["X-Profile-File"] = os.path.basename(profile_path)
+        status = response.status_code
+        return response
+    finally:
+        # 경로 파라미터가 들어간 실제 URL 대신 라우트 패턴으로 기록 (라벨 수 폭증 방지)
+        route = request.scope.get("route")
+        HTTP_LATENCY.observe(
+            time.perf_counter() - start,
+            method=request.method, route=getattr(route, "path", "unmatched"), status=status
+        )
 
 @app.get("/")
-def health_check():
+async def health_check():
     return {"status": "ok", "message": "Server running with Router pattern!"}
 
 @app.post("/StockMarket_Auto_Reporter")
-def get_StockMarket_Auto_Reporter():
-    start_time = datetime.now()
-    print(f"[{start_time}] 🚀 데이터 요청 도착! 처리 시작...")
-
-    target_tickers = {
-        'S&P500': '^GSPC', 
-        'Nasdaq': '^IXIC',
-        'Bitcoin': 'BTC-USD' 
-    }
+async def get_StockMarket_Auto_Reporter():
+    start = time.perf_counter()
+
+    target_tickers = load_watchlist("reporter", default=DEFAULT_REPORTER_TICKERS)
     
     symbols = list(target_tickers.values())
     result = {}
 
     try:
-        # yf.download 실행
-        df = yf.download(symbols, period="2d", group_by='ticker', threads=True, progress=False, auto_adjust=False)
+        # 시세 조회 (캐시에 없거나 만료된 티커만 yf.download / 동기 라이브러리라 스레드에서 실행)
+        # - 브리핑 지수 테이블과 같은 "5d"로 조회해야 (symbol, period) 캐시를 공유함 (등락 계산은 마지막 2행만 사용)
+        df = await asyncio.to_thread(get_price_frames, symbols, "5d")
+
+        # 전체 티커 등락 한 번에 계산 (벡터 연산, 휴장일 / 장중 부분 봉 제외 -> 직전 거래일 종가 대비)
+        changes = session_price_changes(df, symbols)
 
         for name, symbol in target_tickers.items():
             try:
-                # 1. 데이터 추출
-                if len(symbols) > 1:
-                    data = df[symbol]
-                else:
-                    data = df
-                
-                # 2. 유효성 검사 및 계산
-                if not data.empty:
-                    # 컬럼명 찾기 ('Close' 또는 'Adj Close')
-                    if 'Close' in data.columns:
-                        price_col = 'Close'
-                    elif 'Adj Close' in data.columns:
-                        price_col = 'Adj Close'
-                    else:
-                        price_col = data.columns[-1]
-
-                    last_close = float(data[price_col].iloc[-1])
-                    prev_close = float(data[price_col].iloc[-2]) if len(data) >= 2 else last_close
-                    
-                    # 변동률 계산
-                    if prev_close != 0:
-                        change_rate = ((last_close - prev_close) / prev_close) * 100
-                    else:
-                        change_rate = 0.0
-                    
-                    result[name] = {
-                        "price": round(last_close, 2),
-                        "change": f"{round(change_rate, 2)}%"
-                    }
-                else:
+                row = changes.loc[symbol]
+                if math.isnan(row["last_close"]):
                     result[name] = {"error": "No Data"}
+                    continue
+
+                result[name] = {
+                    "price": round(float(row["last_close"]), 2),
+                    "change": f"{round(float(row['change_pct']), 2)}%"
+                }
             except Exception as parse_error:
                 print(f"Error parsing {name}: {parse_error}")
                 result[name] = {"error": "Parse Error"}
 
         end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
-        print(f"[{end_time}] ✅ 처리 완료! (소요시간: {duration}초)")
+        duration = round(time.perf_counter() - start, 3)  # 엔드포인트 전체 시간은 /metrics 에도 기록됨
 
         # 3. 응답 데이터 구성
         response_data = {
@@ -104,8 +116,8 @@ def get_StockMarket_Auto_Reporter():
             "message": "데이터 수집 성공"
         }
 
-        # [중요] 마지막에 청소기 돌려서 내보내기 (NaN -> None)
-        return clean_data(response_data)
+        # NaN / inf는 FastJSONResponse(orjson)가 직렬화하면서 null로 변환
+        return response_data
 
     except Exception as e:
         print(f"Server Error: {e}")
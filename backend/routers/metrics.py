@@ -0,0 +1,9 @@
+from fastapi import APIRouter, Response
+from services.metrics import render_prometheus
+
+router = APIRouter(tags=["Metrics"])
+
+# Prometheus 수집 엔드포인트 (외부 API 호출 / 단계별 소요시간, 캐시 적중, 소스별 오류)
+@router.get("/metrics")
+async def get_metrics():
+    return Response(content=render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
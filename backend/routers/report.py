@@ -1,8 +1,20 @@
+import asyncio
+import os
 from fastapi import APIRouter, Response
-from services.briefing_market_index import get_market_summary_markdown, get_sp500_map_image 
+from fastapi.responses import FileResponse, StreamingResponse
+from services.briefing_market_index import asset_url, get_market_summary_markdown, get_sp500_map_asset, get_sp500_map_image
+from services.image_assets import asset_media_type, asset_path
 from services.economy_indicators import get_economy_indicators
 from services.market_news_crawl_llm import get_market_news
-from services.email_builder import generate_email_report
+from services.email_builder import load_snapshot_data, stream_email_report
+from services.live_quotes import stream_quote_events
+from services.briefing_batch import batch_output_path, get_batch_progress, start_briefing_batch
+from services.briefing_scheduler import build_briefing, get_latest_briefing
+from services.report_batch import get_report_batch
+from services.report_renderer import iter_chunks
+from services.responses import FastJSONResponse
+from services.snapshot_store import list_snapshot_dates
+from services.watchlist import get_watchlist_quotes
 
 router = APIRouter(
     prefix="/report",  # 이 라우터의 모든 주소 앞에 /report가 붙음
@@ -11,8 +23,8 @@ router = APIRouter(
 
 # 1-1. 각종 지표 데일리 시황 마크다운 생성 엔드포인트
 @router.post("/market-indicators")
-def generate_market_indicators():
-    markdown_table = get_market_summary_markdown()
+async def generate_market_indicators():
+    markdown_table = await get_market_summary_markdown()
     
     # n8n이 바로 쓸 수 있는 JSON 구조로 리턴
     return {
@@ -20,35 +32,62 @@ def generate_market_indicators():
         "market_summary_markdown": markdown_table
     }
 
-router = APIRouter(
-    prefix="/report",
-    tags=["Report"]
-)
+# 1-1-1. 지수 실시간 스트림 (SSE)
+# - 접속 시 전체 시세(snapshot) 1회, 이후 값이 바뀐 티커만 delta 이벤트로 전송
+# - 폴링은 서버에서 1번만 하고 모든 접속자가 같은 업데이트를 받음
+@router.get("/market-indicators/stream")
+async def stream_market_indicators():
+    return StreamingResponse(
+        stream_quote_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
-# 1-2. S&P 500 Map 이미지(Base64) 생성 엔드포인트
+# 1-2. S&P 500 Map 이미지 asset 엔드포인트 (URL / 이메일 CID 로 참조, inline=true 일 때만 Base64 포함)
 @router.post("/sp500-map")
-def fetch_sp500_map():
-    img_base64 = get_sp500_map_image()
+async def fetch_sp500_map(inline: bool = False):
+    asset = await get_sp500_map_asset()
     
-    if img_base64:
-        return {
+    if asset:
+        result = {
             "status": "success",
-            "image_type": "base64",
-            "image_data": img_base64
+            "image_type": "url",
+            "image_url": asset_url(asset["asset_id"]),
+            "image_cid": asset["asset_id"],
+            "media_type": asset["media_type"],
+            "bytes": asset["bytes"]
         }
+        if inline:
+            result["image_data"] = await get_sp500_map_image()
+        return result
     else:
         return {
             "status": "error", 
             "message": "이미지 캡처 실패"
         }
+
+# 1-2-1. 저장된 이미지 asset 제공 (내용 해시 기반 파일명이라 영구 캐시 가능)
+@router.get("/assets/{asset_id}")
+async def get_image_asset(asset_id: str):
+    try:
+        path = asset_path(asset_id)
+    except ValueError:
+        return Response(status_code=404)
+    if not os.path.exists(path):
+        return Response(status_code=404)
+    return FileResponse(
+        path,
+        media_type=asset_media_type(asset_id),
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
     
 # 1-3. FRED & Forex Factory 경제 지표 크롤링 엔드포인트
 @router.post("/economy-indicators")
-def fetch_economy_indicators():
+async def fetch_economy_indicators():
     """
     1-3. FRED & Forex Factory 경제 지표 크롤링
     """
-    data = get_economy_indicators()
+    data = await get_economy_indicators()
     return {
         "status": "success",
         "data": data 
@@ -57,11 +96,11 @@ def fetch_economy_indicators():
 
 # 1-4. 전날 시장에 영향을 끼친 주요 뉴스들 요약 정리 (Upstage AI)
 @router.post("/market-news")
-def fetch_market_news():
+async def fetch_market_news():
     """
     1-4. 지난 24시간 주요 미국 증시 뉴스 5선 (Upstage AI 요약)
     """
-    news_data = get_market_news()
+    news_data = await get_market_news()
     return {
         "status": "success",
         "data": news_data
@@ -69,12 +108,115 @@ def fetch_market_news():
 
 
 # 최종. 모든 데이터를 취합하여 완성된 HTML 이메일 본문 반환 엔드포인트
+# - 기본: 스케줄러가 미리 만들어둔 브리핑 즉시 반환 (stale이면 백그라운드 재생성)
+# - refresh=true: 지금 바로 다시 생성 / date=YYYY-MM-DD: 저장된 스냅샷으로 재렌더링
 @router.post("/daily-briefing")
-def get_daily_briefing_html():
+async def get_daily_briefing_html(date: str | None = None, refresh: bool = False):
     try:
-        html_content = generate_email_report()
-        return Response(content=html_content, media_type="text/html")
+        if date:
+            data = load_snapshot_data(date)
+            if not data:
+                return Response(content=f"<h1>Snapshot Not Found</h1><p>{date} 스냅샷이 없습니다.</p>", media_type="text/html", status_code=404)
+            # 템플릿 조각 단위로 바로 전송 (전체 HTML 문자열을 메모리에 만들지 않음)
+            return StreamingResponse(stream_email_report(data), media_type="text/html")
+
+        # 미리 만든(또는 방금 만든) 브리핑도 전체 문자열 한 번에 보내지 않고 조각 단위로 전송
+        entry = await build_briefing() if refresh else await get_latest_briefing()
+        return StreamingResponse(iter_chunks(entry["html"]), media_type="text/html", headers=_freshness_headers(entry))
     except Exception as e:
         # 서버 에러 로그를 명확히 보기 위해 print 추가
         print(f"❌ Server Error: {e}")
-        return Response(content=f"<h1>Server Error</h1><p>{str(e)}</p>", status_code=500)
\ No newline at end of file
+        return Response(content=f"<h1>Server Error</h1><p>{str(e)}</p>", status_code=500)
+
+# 최종-0. 미리 만들어둔 브리핑의 섹션 데이터(JSON) + 생성 시각
+@router.post("/daily-briefing/data")
+async def get_daily_briefing_data(refresh: bool = False):
+    try:
+        entry = await build_briefing() if refresh else await get_latest_briefing()
+    except Exception as e:
+        print(f"❌ Server Error: {e}")
+        return FastJSONResponse({"status": "error", "message": str(e)}, status_code=500)
+    return {
+        "status": "success",
+        "trade_date": entry["trade_date"],
+        "generated_at": entry["generated_at"],
+        "stale": entry.get("stale", False),
+        "data": entry["data"]
+    }
+
+# 최종-0-1. 여러 섹션을 한 번의 수집으로 묶어서 반환 (n8n 섹션별 호출 + daily-briefing 중복 수집 대체)
+# - sections=index_table,sp500_map,economy,news,html (생략 시 데이터 섹션 전체)
+# - index_format=rows|markdown / image=url|cid|inline / economy=all|recent
+# - refresh=false면 미리 만든 브리핑(fresh) 데이터를 재사용
+@router.post("/batch")
+async def fetch_report_batch(
+    sections: str | None = None,
+    index_format: str | None = None,
+    image: str | None = None,
+    economy: str | None = None,
+    refresh: bool = False
+):
+    try:
+        result = await get_report_batch(sections, refresh, index_format=index_format, image=image, economy=economy)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    return {"status": "success", **result}
+
+def _freshness_headers(entry):
+    return {
+        "X-Briefing-Trade-Date": entry["trade_date"],
+        "X-Briefing-Generated-At": entry["generated_at"],
+        "X-Briefing-Stale": "true" if entry.get("stale") else "false",
+        "X-Briefing-Delayed": ",".join((entry.get("data") or {}).get("delayed") or {})
+    }
+
+# 최종-2. 구독자별 맞춤 브리핑 일괄 생성 (config/subscribers.json, 백그라운드 실행)
+@router.post("/briefing-batch")
+async def run_briefing_batch():
+    started = start_briefing_batch()
+    return {
+        "status": "success",
+        "started": started,  # false면 이미 실행 중
+        "progress": get_batch_progress()
+    }
+
+# 최종-2-1. 일괄 생성 진행 상황 (state: idle / running / done / error, done / total)
+@router.get("/briefing-batch/status")
+async def fetch_briefing_batch_status():
+    return {"status": "success", "progress": get_batch_progress()}
+
+# 최종-2-2. 생성된 구독자별 HTML
+@router.get("/briefing-batch/{trade_date}/{subscriber_id}")
+async def get_briefing_batch_html(trade_date: str, subscriber_id: str):
+    try:
+        path = batch_output_path(trade_date, subscriber_id)
+    except ValueError:
+        return Response(status_code=404)
+    if not os.path.exists(path):
+        return Response(status_code=404)
+    return FileResponse(path, media_type="text/html")
+
+# 최종-1. 저장된 거래일 스냅샷 목록
+@router.get("/snapshots")
+async def fetch_snapshot_dates(limit: int = 30):
+    return {
+        "status": "success",
+        "data": list_snapshot_dates(limit)
+    }
+
+
+# 2. 관심 종목(watchlist) 시세 조회 엔드포인트
+@router.post("/watchlist/{name}")
+async def fetch_watchlist_quotes(name: str):
+    """
+    config/watchlist.json 에 정의된 watchlist 종목 등락 조회
+    """
+    # yfinance는 동기 라이브러리라 스레드에서 실행
+    quotes = await asyncio.to_thread(get_watchlist_quotes, name)
+    if not quotes:
+        return {"status": "error", "message": f"watchlist '{name}' 없음"}
+    return {
+        "status": "success",
+        "name": name,
+        "data": quotes
+    }
@@ -0,0 +1,280 @@
+# backend/services/briefing_batch.py
+
+import asyncio
+import math
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from services.briefing_scheduler import get_latest_briefing
+from services.email_builder import DEFAULT_LANGUAGE, REPORT_LABELS, REPORT_TEMPLATE, build_report_context
+from services.local_store import data_path, load_json, save_json
+from services.market_data import get_price_frames, session_price_changes
+from services.metrics import BATCH_RENDERED, record_error, stage_timer
+from services.report_renderer import render_blocks, render_template
+from services.watchlist import load_watchlist
+
+# 구독자별 맞춤 브리핑 일괄 렌더링
+# - 시장 데이터는 1번만 수집 (미리 만든 브리핑 재사용), 구독자 관심 종목 시세도 합쳐서 1번만 조회
+# - 모든 구독자에게 같은 섹션(요약 / 지수 / 경제 지표 / 맵 / 뉴스)은 언어별로 1번만 렌더링해서 조각으로 재사용
+# - 구독자별 HTML은 프로세스 풀에서 병렬 생성 (레이아웃 + 조각 조립 + 관심 종목 표만 새로 렌더링)
+
+SUBSCRIBERS_PATH = os.getenv("SUBSCRIBERS_PATH") or os.path.join(os.path.dirname(__file__), "../config/subscribers.json")
+PERSONAL_TEMPLATE = "report_personalized.html"
+
+BATCH_RENDER_WORKERS = int(os.getenv("BATCH_RENDER_WORKERS") or os.cpu_count() or 1)
+# 구독자가 이 수보다 적으면 프로세스 풀 없이 현재 프로세스에서 렌더링 (풀 시작 비용이 더 큼)
+BATCH_RENDER_PARALLEL_MIN = int(os.getenv("BATCH_RENDER_PARALLEL_MIN", "200"))
+BATCH_RENDER_CHUNK_MAX = 200
+# 구독자별 HTML에 Base64 이미지를 넣으면 수천 배로 커지므로 url / cid만 사용
+BATCH_IMAGE_MODE = os.getenv("BATCH_IMAGE_MODE") or ("url" if os.getenv("PUBLIC_BASE_URL") else "cid")
+
+SECTIONS = ["summary", "index_table", "watchlist", "economy", "sp500_map", "news"]
+SHARED_BLOCKS = ["section_summary", "section_index", "section_economy", "section_map", "section_news"]
+SUBSCRIBER_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+_progress = {"state": "idle"}
+_batch_task = None
+_worker_shared = None  # 워커 프로세스마다 1번 받는 공통 데이터 (언어별 조각 / 관심 종목 시세)
+
+# ---------------------------------------------------------
+# 구독자 설정
+# ---------------------------------------------------------
+def load_subscribers(path=None):
+    """
+    config/subscribers.json -> 정규화된 구독자 목록
+    - language: REPORT_LABELS 키 (기본 ko, 고정 문구 + 요약 / 뉴스 제목 / 지수·지표명까지 해당 언어) / sections: SECTIONS 중 일부 (기본 전체, 관심 종목이 없으면 watchlist 제외)
+    - watchlist: watchlist 이름(config/watchlist.json) / 티커 list / {표시명: 티커} dict
+    - id가 없거나 형식이 잘못된 항목은 건너뜀
+    """
+    config = load_json(path or SUBSCRIBERS_PATH, default={}) or {}
+    subscribers = []
+    for entry in config.get("subscribers", []):
+        subscriber_id = str(entry.get("id", ""))
+        if not SUBSCRIBER_ID_PATTERN.match(subscriber_id):
+            print(f"⚠️ 구독자 id 형식 오류, 건너뜀: {entry.get('id')!r}")
+            continue
+
+        language = entry.get("language") or DEFAULT_LANGUAGE
+        if language not in REPORT_LABELS:
+            print(f"⚠️ 지원하지 않는 언어 ({subscriber_id}: {language}) -> {DEFAULT_LANGUAGE}")
+            language = DEFAULT_LANGUAGE
+
+        watchlist = entry.get("watchlist")
+        if isinstance(watchlist, str):
+            watchlist = load_watchlist(watchlist)
+        elif isinstance(watchlist, list):
+            watchlist = {symbol: symbol for symbol in watchlist}
+        else:
+            watchlist = dict(watchlist or {})
+
+        default_sections = SECTIONS if watchlist else [s for s in SECTIONS if s != "watchlist"]
+        sections = [s for s in entry.get("sections") or default_sections if s in SECTIONS]
+
+        subscribers.append({
+            "id": subscriber_id,
+            "email": entry.get("email"),
+            "name": entry.get("name"),
+            "language": language,
+            "sections": sections,
+            "watchlist": watchlist,
+        })
+    return subscribers
+
+# ---------------------------------------------------------
+# 공통 데이터 (1번만 계산)
+# ---------------------------------------------------------
+def fetch_watchlist_quotes(subscribers, trade_date=None):
+    """전체 구독자 관심 종목을 합쳐서 1번 조회 -> {티커: {"price", "change_pct"}}"""
+    import pandas as pd
+
+    symbols = list(dict.fromkeys(
+        symbol for s in subscribers if "watchlist" in s["sections"] for symbol in s["watchlist"].values()
+    ))
+    if not symbols:
+        return {}
+
+    df = get_price_frames(symbols, "5d")
+    with stage_timer("batch_watchlist_changes"):
+        changes = session_price_changes(df, symbols, trade_date)
+
+    quotes = {}
+    for symbol, row in changes.iterrows():
+        if pd.isna(row["last_close"]):
+            continue
+        quotes[symbol] = {"price": round(float(row["last_close"]), 2), "change_pct": round(float(row["change_pct"]), 2)}
+    return quotes
+
+def build_shared(data, languages, quotes):
+    """언어별 공통 섹션 조각 + 레이아웃 변수 (build_report_context가 언어별 내용까지 교체, 워커 프로세스로 1번만 전달)"""
+    per_language = {}
+    with stage_timer("batch_shared_fragments"):
+        for language in languages:
+            context = build_report_context(data, language, BATCH_IMAGE_MODE)
+            per_language[language] = {
+                "t": context["t"],
+                "today_date": context["today_date"],
+                "fragments": render_blocks(REPORT_TEMPLATE, SHARED_BLOCKS, **context),
+            }
+    return {"languages": per_language, "quotes": quotes}
+
+# ---------------------------------------------------------
+# 워커 (프로세스 풀 / 현재 프로세스 공용)
+# ---------------------------------------------------------
+def _init_worker(shared):
+    global _worker_shared
+    _worker_shared = shared
+
+def _watchlist_rows(watchlist, quotes):
+    rows = []
+    for name, symbol in watchlist.items():
+        quote = quotes.get(symbol) or {}
+        rows.append({"name": name, "symbol": symbol, "price": quote.get("price"), "change_pct": quote.get("change_pct")})
+    return rows
+
+def _render_chunk(subscribers, out_dir):
+    """구독자 묶음 렌더링 + 파일 저장 -> 결과 목록 (구독자 1명 실패가 묶음 전체를 멈추지 않음)"""
+    results = []
+    for subscriber in subscribers:
+        try:
+            layout = _worker_shared["languages"][subscriber["language"]]
+            html = render_template(
+                PERSONAL_TEMPLATE,
+                **layout,
+                sections=subscriber["sections"],
+                subscriber_name=subscriber.get("name"),
+                watchlist_rows=_watchlist_rows(subscriber["watchlist"], _worker_shared["quotes"]),
+            )
+            path = os.path.join(out_dir, f"{subscriber['id']}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(html)
+            results.append({
+                "id": subscriber["id"], "email": subscriber.get("email"), "language": subscriber["language"],
+                "file": os.path.basename(path), "bytes": len(html.encode("utf-8"))
+            })
+        except Exception as e:
+            results.append({"id": subscriber["id"], "email": subscriber.get("email"), "error": str(e)})
+    return results
+
+def _chunked(items, workers):
+    size = min(max(1, math.ceil(len(items) / (workers * 4))), BATCH_RENDER_CHUNK_MAX)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+# ---------------------------------------------------------
+# 진행 상황
+# ---------------------------------------------------------
+def get_batch_progress():
+    """현재(또는 마지막) 일괄 렌더링 진행 상황"""
+    progress = {k: v for k, v in _progress.items() if not k.startswith("_")}
+    if progress.get("state") == "running":
+        progress["elapsed"] = round(time.time() - progress["started_at"], 3)
+    return progress
+
+def _report_progress(done, total, failed):
+    _progress.update(done=done, failed=failed)
+    percent = done * 100 // total if total else 100
+    if percent // 10 > _progress.get("_logged_step", -1) or done == total:  # 10% 단위로 로그
+        print(f"📨 맞춤 브리핑 렌더링 {done}/{total} ({percent}%), 실패 {failed}")
+        _progress["_logged_step"] = percent // 10
+
+# ---------------------------------------------------------
+# 진입점
+# ---------------------------------------------------------
+async def render_briefing_batch(subscribers=None, data=None, workers=None, on_progress=None):
+    """
+    구독자별 맞춤 브리핑 일괄 생성 -> data/briefing/batch/<trade_date>/<id>.html + manifest.json
+    - data가 없으면 미리 만든 브리핑 데이터 재사용 (없거나 stale이면 get_latest_briefing 규칙대로 생성)
+    - on_progress(done, total): 묶음이 끝날 때마다 호출
+    """
+    started = time.time()
+    subscribers = load_subscribers() if subscribers is None else subscribers
+    workers = max(1, workers or BATCH_RENDER_WORKERS)
+
+    if data is None:
+        data = (await get_latest_briefing())["data"]
+    trade_date = (data.get("meta") or {}).get("trade_date") or "latest"
+    out_dir = os.path.dirname(data_path("briefing", "batch", trade_date, "_"))
+
+    _progress.clear()
+    _progress.update(
+        state="running", trade_date=trade_date, total=len(subscribers), done=0, failed=0,
+        started_at=started, output_dir=out_dir
+    )
+
+    try:
+        quotes = await asyncio.to_thread(fetch_watchlist_quotes, subscribers, trade_date)
+        languages = sorted({s["language"] for s in subscribers})
+        shared = await asyncio.to_thread(build_shared, data, languages, quotes)
+
+        chunks = _chunked(subscribers, workers)
+        parallel = workers > 1 and len(subscribers) >= BATCH_RENDER_PARALLEL_MIN
+        print(f"📨 맞춤 브리핑 {len(subscribers)}명 렌더링 시작 ({len(chunks)}개 묶음, {'프로세스 ' + str(workers) + '개' if parallel else '단일 프로세스'})")
+
+        results = []
+        loop = asyncio.get_running_loop()
+        with stage_timer("batch_render"):
+            if parallel:
+                import multiprocessing
+
+                # 서버 프로세스는 스레드(yfinance, to_thread)를 쓰므로 fork 대신 spawn
+                with ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker, initargs=(shared,)
+                ) as pool:
+                    futures = [loop.run_in_executor(pool, _render_chunk, chunk, out_dir) for chunk in chunks]
+                    for future in asyncio.as_completed(futures):
+                        results.extend(await future)
+                        _after_chunk(results, len(subscribers), on_progress)
+            else:
+                _init_worker(shared)
+                for chunk in chunks:
+                    results.extend(await asyncio.to_thread(_render_chunk, chunk, out_dir))
+                    _after_chunk(results, len(subscribers), on_progress)
+
+        failed = [r for r in results if "error" in r]
+        summary = {
+            "trade_date": trade_date,
+            "total": len(subscribers),
+            "rendered": len(results) - len(failed),
+            "failed": len(failed),
+            "workers": workers if parallel else 1,
+            "elapsed": round(time.time() - started, 3),
+            "output_dir": out_dir,
+        }
+        save_json(os.path.join(out_dir, "manifest.json"), dict(summary, results=results))
+        BATCH_RENDERED.inc(summary["rendered"], result="ok")
+        BATCH_RENDERED.inc(summary["failed"], result="error")
+        _progress.update(summary, state="done", finished_at=time.time())
+        print(f"✅ 맞춤 브리핑 {summary['rendered']}명 완료 (실패 {summary['failed']}, {summary['elapsed']}s)")
+        return dict(summary, results=results)
+    except Exception as e:
+        record_error("briefing_batch")
+        _progress.update(state="error", error=str(e), finished_at=time.time())
+        raise
+
+def _after_chunk(results, total, on_progress):
+    failed = sum(1 for r in results if "error" in r)
+    _report_progress(len(results), total, failed)
+    if on_progress:
+        on_progress(len(results), total)
+
+def start_briefing_batch():
+    """백그라운드 일괄 렌더링 시작 (이미 실행 중이면 무시) -> 시작 여부"""
+    global _batch_task
+    if _batch_task and not _batch_task.done():
+        return False
+    _batch_task = asyncio.create_task(_safe_batch())
+    return True
+
+async def _safe_batch():
+    try:
+        await render_briefing_batch()
+    except Exception as e:
+        print(f"❌ Briefing Batch Error: {e}")
+
+def batch_output_path(trade_date, subscriber_id):
+    """생성된 구독자 HTML 경로 (형식이 잘못된 값이면 ValueError)"""
+    if not re.match(r"^\d{4}-\d{2}-\d{2}$", trade_date) or not SUBSCRIBER_ID_PATTERN.match(subscriber_id):
+        raise ValueError("잘못된 trade_date / subscriber_id")
+    return data_path("briefing", "batch", trade_date, f"{subscriber_id}.html")
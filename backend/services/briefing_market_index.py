@@ -1,12 +1,21 @@
-import yfinance as yf
-import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+import asyncio
 import os
 import base64
+import time
 
-# 1. 감시할 티커 목록 (KRW=X 제거함)
-TICKERS = {
+from services.http_client import get_client
+from services.image_assets import asset_media_type, read_asset, reencode_for_email, store_asset
+from services.local_store import data_path, load_json, save_json
+from services.market_data import get_price_frames, session_price_changes
+from services.metrics import record_cache, record_error, stage_timer, upstream_timer
+from services.price_analytics import get_price_analytics
+from services.single_flight import single_flight
+from services.watchlist import load_watchlist
+
+# 무거운 라이브러리(pandas/bs4 등)는 첫 사용 시점에 import (cold start 단축)
+
+# 1. 감시할 티커 목록 (config/watchlist.json 의 "briefing_index", 없으면 기본값 사용)
+DEFAULT_TICKERS = {
     "다우 존스": "^DJI",
     "S&P 500": "^GSPC",
     "나스닥": "^IXIC",
@@ -17,85 +26,127 @@ TICKERS = {
     "미 국채 10년": "^TNX",
     "달러 인덱스 / 환율": "DX-Y.NYB"
 }
+TICKERS = load_watchlist("briefing_index", default=DEFAULT_TICKERS)
+# 영문 브리핑용 표시명 (티커 기준, 없으면 설정 파일의 표시명 그대로)
+TICKER_NAMES_EN = {
+    "^DJI": "Dow Jones",
+    "^GSPC": "S&P 500",
+    "^IXIC": "Nasdaq",
+    "^RUT": "Russell 2000",
+    "CL=F": "WTI Crude",
+    "GC=F": "Gold",
+    "BTC-USD": "Bitcoin",
+    "^TNX": "US 10Y Treasury",
+    "DX-Y.NYB": "Dollar Index / USDKRW"
+}
+
+NAVER_URL = os.getenv("NAVER_MARKETINDEX_URL", "https://finance.naver.com/marketindex/")
+NAVER_TIMEOUT = 10  # 초
+
+def _parse_naver_usd_rate(html):
+    """네이버 금융 환율 페이지 HTML -> 원달러 환율 (없으면 None)"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    # 네이버 금융 환율 섹션의 '미국 USD' 값 추출
+    usd_item = soup.select_one("#exchangeList > li.on > a.head.usd > div > span.value")
+    if usd_item:
+        # 쉼표(,) 제거 후 float 변환
+        return float(usd_item.text.replace(",", ""))
+    return None
+
+def _naver_rate_path():
+    return data_path("market", "naver_usd_rate.json")
 
 # 네이버 금융에서 원달러 환율 크롤링
-def get_naver_usd_rate():
+async def get_naver_usd_rate():
     """
     네이버 금융에서 실시간 원달러 환율(매매기준율) 크롤링
+    - 응답 전체에 NAVER_TIMEOUT 상한 / 실패·지연 시 마지막으로 성공한 환율 사용
     """
     try:
-        url = "https://finance.naver.com/marketindex/"
-        # 봇 탐지 방지용 헤더
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        response = requests.get(url, headers=headers)
+        with upstream_timer("naver"):
+            response = await asyncio.wait_for(get_client().get(NAVER_URL, timeout=NAVER_TIMEOUT), NAVER_TIMEOUT)
         
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, "html.parser")
-            # 네이버 금융 환율 섹션의 '미국 USD' 값 추출
-            usd_item = soup.select_one("#exchangeList > li.on > a.head.usd > div > span.value")
-            if usd_item:
-                # 쉼표(,) 제거 후 float 변환
-                return float(usd_item.text.replace(",", ""))
+            # HTML 파싱은 CPU 작업이라 이벤트 루프를 막지 않도록 스레드에서 실행
+            with stage_timer("naver_parse"):
+                rate = await asyncio.to_thread(_parse_naver_usd_rate, response.text)
+            if rate is not None:
+                save_json(_naver_rate_path(), {"rate": rate, "fetched_at": time.time()})
+                return rate
+        record_error("naver")
     except Exception as e:
-        print(f"Naver Crawl Error: {e}")
-    
+        record_error("naver")
+        print(f"Naver Crawl Error: {e!r}")
+
+    last = load_json(_naver_rate_path(), default=None)
+    if last:
+        record_cache("naver_usd_rate", "stale")
+        return last["rate"]
     return 0.0 # 실패 시 0.0 반환
 
-# 1-1. 마켓 요약 마크다운 생성
-def get_market_summary_markdown():
-    symbols = list(TICKERS.values())
-    
-    # yfinance 데이터 다운로드
-    df = yf.download(symbols, period="5d", group_by='ticker', threads=True, progress=False, auto_adjust=False)
+def _index_row(name, symbol, price, change, change_pct=None, analytics=None):
+    """지수 테이블 행 1개 (change_pct가 None이면 오류/데이터 없음 행, analytics: 기간 수익률 등 추세 지표)"""
+    return {"name": name, "symbol": symbol, "price": price, "change": change, "change_pct": change_pct, "analytics": analytics}
 
-    rows = []
+def _safe_price_analytics(symbols):
+    """추세 지표 계산 (실패해도 지수 테이블은 그대로 생성)"""
+    try:
+        return get_price_analytics(symbols)
+    except Exception as e:
+        record_error("price_analytics")
+        print(f"⚠️ Price Analytics Error: {e}")
+        return {}
+
+async def _no_analytics():
+    return {}
+
+# 1-1. 마켓 요약 테이블 행 생성 (HTML 템플릿이 바로 렌더링하는 구조화 데이터)
+@single_flight("market_summary_rows")
+async def get_market_summary_rows(with_analytics=False):
+    """
+    지수 테이블 행 목록
+    - with_analytics=True면 기간 수익률 / 변동성 / 이동평균 / 52주 고저("analytics")도 채움 (추세 표를 그리는 브리핑용)
+    """
+    import pandas as pd
+
+    tickers = load_watchlist("briefing_index", default=DEFAULT_TICKERS)
+    symbols = list(tickers.values())
     
-    # [1단계] 네이버에서 환율 가져오기 (Source 변경)
-    krw_rate = get_naver_usd_rate()
+    # [1단계] yfinance 데이터 (캐시에 없거나 만료된 티커만 다운로드) + 네이버 환율 + 추세 지표 동시 수집
+    # - yfinance / SQLite는 동기 라이브러리라 스레드에서 실행
+    # - 추세 지표는 로컬 이력 + 빠진 봉만 조회 (같은 5d 조회는 시세 캐시에서 1번만 다운로드)
+    df, krw_rate, analytics = await asyncio.gather(
+        asyncio.to_thread(get_price_frames, symbols, "5d"),
+        get_naver_usd_rate(),
+        asyncio.to_thread(_safe_price_analytics, symbols) if with_analytics else _no_analytics()
+    )
     # 만약 크롤링 실패하면 0.0원이 뜸
 
-    # [2단계] 표 생성 루프
-    for name, symbol in TICKERS.items():
+    rows = []
+
+    # [2단계] 전체 티커 등락 한 번에 계산 (벡터 연산)
+    with stage_timer("price_changes"):
+        changes = session_price_changes(df, symbols)
+    available = set(df.columns.get_level_values(0)) if not df.empty else set()
+
+    # [3단계] 표 생성 루프 (계산은 끝났고 포맷팅만)
+    for name, symbol in tickers.items():
         if symbol == "KRW=X":
             continue
         try:
-            if len(symbols) > 1:
-                try:
-                    data = df[symbol]
-                except KeyError:
-                    rows.append(f"| {name} | N/A | ⚠️ 티커 오류 |")
-                    continue
-            else:
-                data = df
-
-            # 컬럼명 찾기
-            cols = [c.lower() for c in data.columns]
-            target_col = None
-            if 'close' in cols:
-                target_col = data.columns[cols.index('close')]
-            elif 'adj close' in cols:
-                target_col = data.columns[cols.index('adj close')]
-            
-            if target_col is None:
-                rows.append(f"| {name} | N/A | ⚠️ 컬럼 없음 |")
+            if symbol not in available:
+                rows.append(_index_row(name, symbol, "N/A", "⚠️ 티커 오류"))
                 continue
 
-            # 유효 데이터 필터링
-            valid_series = data[target_col].dropna()
-
-            if valid_series.empty:
-                rows.append(f"| {name} | N/A | ⚠️ 데이터 없음 |")
+            row = changes.loc[symbol]
+            if pd.isna(row["last_close"]):
+                rows.append(_index_row(name, symbol, "N/A", "⚠️ 데이터 없음"))
                 continue
 
-            last_close = float(valid_series.iloc[-1])
-            
-            if len(valid_series) >= 2:
-                prev_close = float(valid_series.iloc[-2])
-            else:
-                prev_close = last_close
-
-            change_amt = last_close - prev_close
-            change_pct = (change_amt / prev_close) * 100 if prev_close != 0 else 0.0
+            last_close = float(row["last_close"])
+            change_pct = float(row["change_pct"])
 
             emoji = "🔴" if change_pct >= 0 else "🔵"
             sign = "+" if change_pct >= 0 else ""
@@ -111,21 +162,42 @@ def get_market_summary_markdown():
             else:
                 price_str = f"{last_close:,.2f}"
 
-            rows.append(f"| {name} | {price_str} | {emoji} {sign}{change_pct:.2f}% |")
+            rows.append(_index_row(
+                name, symbol, price_str, f"{emoji} {sign}{change_pct:.2f}%", round(change_pct, 4),
+                analytics.get(symbol)
+            ))
 
         except Exception as e:
             print(f"Error processing {name}: {e}")
-            rows.append(f"| {name} | Error | ⚠️ {str(e)} |")
+            rows.append(_index_row(name, symbol, "Error", f"⚠️ {str(e)}"))
+
+    return rows
 
+def rows_to_markdown(rows):
+    """지수 테이블 행 -> 마크다운 표 (n8n 용)"""
     header = "| 지표 | 현재가 | 변동률 |\n| :--- | :---: | :---: |"
-    return header + "\n" + "\n".join(rows)
+    lines = [f"| {r['name']} | {r['price']} | {r['change']} |" for r in rows]
+    return header + "\n" + "\n".join(lines)
 
-# 1-2. S&P 500 Map 이미지(Base64) 생성
-def get_sp500_map_image():
+async def get_briefing_index_rows():
+    """브리핑(HTML / 배치 조회)용 지수 테이블 - 추세 지표 포함"""
+    return await get_market_summary_rows(with_analytics=True)
+
+# 1-1. 마켓 요약 마크다운 생성
+async def get_market_summary_markdown():
+    return rows_to_markdown(await get_market_summary_rows())
+
+# 1-2. S&P 500 Map 이미지 (캐시 + 이메일용 재인코딩 + 내용 해시 기반 저장)
+SP500_MAP_TTL_SEC = int(os.getenv("SP500_MAP_TTL_SEC", "1800"))  # 이 시간 안에는 ApiFlash 재호출 안 함
+
+APIFLASH_URL = os.getenv("APIFLASH_URL", "https://api.apiflash.com/v1/urltoimage")
+APIFLASH_TIMEOUT = 60  # 초 (페이지 로딩 + 캡처 시간 포함)
+
+async def _capture_sp500_map():
+    """ApiFlash로 finviz S&P 500 맵 캡처 (원본 PNG bytes, 실패 시 None)"""
     access_key = os.getenv("APIFLASH_ACCESS_KEY")
     if not access_key: return None
     
-    url = "https://api.apiflash.com/v1/urltoimage"
     params = {
         "access_key": access_key,
         "url": "https://finviz.com/map.ashx?t=sec",
@@ -139,9 +211,68 @@ def get_sp500_map_image():
     }
 
     try:
-        response = requests.get(url, params=params)
+        with upstream_timer("apiflash"):
+            response = await get_client().get(APIFLASH_URL, params=params, timeout=APIFLASH_TIMEOUT)
         response.raise_for_status()
-        return base64.b64encode(response.content).decode("utf-8")
+        return response.content
     except Exception as e:
+        record_error("apiflash")
         print(f"ApiFlash Error: {e}")
-        return None
\ No newline at end of file
+        return None
+
+@single_flight("sp500_map")
+async def get_sp500_map_asset():
+    """
+    S&P 500 맵 asset 정보 반환 (실패 시 None)
+    - TTL 안에 만든 asset이 있으면 ApiFlash 호출 없이 재사용
+    - 동시에 여러 요청이 와도 캡처는 1번만 (single-flight)
+    - 반환: {"asset_id", "media_type", "size", "bytes", "created_at"}
+    """
+    meta_path = data_path("assets", "sp500_map_latest.json")
+
+    meta = load_json(meta_path, default=None)
+    if meta and time.time() - meta.get("created_at", 0) < SP500_MAP_TTL_SEC and read_asset(meta["asset_id"]) is not None:
+        record_cache("sp500_map", "hit")
+        return meta
+
+    record_cache("sp500_map", "miss")
+    raw = await _capture_sp500_map()
+    if raw is None:
+        # 캡처 실패 시 만료된 asset이라도 있으면 사용
+        if meta and read_asset(meta["asset_id"]) is not None:
+            record_cache("sp500_map", "stale")
+            return meta
+        return None
+
+    try:
+        with stage_timer("image_reencode"):
+            content, ext, size = await asyncio.to_thread(reencode_for_email, raw)
+    except Exception as e:
+        record_error("image_reencode")
+        print(f"Image Re-encode Error: {e}")
+        content, ext, size = raw, "png", None
+
+    asset_id = store_asset(content, ext)
+    meta = {
+        "asset_id": asset_id,
+        "media_type": asset_media_type(asset_id),
+        "size": list(size) if size else None,
+        "bytes": len(content),
+        "created_at": time.time()
+    }
+    save_json(meta_path, meta)
+    print(f"🖼️ S&P 500 맵 asset 저장: {asset_id} ({len(raw):,} -> {len(content):,} bytes)")
+    return meta
+
+async def get_sp500_map_image():
+    """S&P 500 맵 이미지 Base64 (이메일용으로 축소된 asset 기준 / 실패 시 None)"""
+    asset = await get_sp500_map_asset()
+    if not asset:
+        return None
+    content = read_asset(asset["asset_id"])
+    return base64.b64encode(content).decode("utf-8") if content else None
+
+def asset_url(asset_id, base_url=None):
+    """asset 조회 URL (PUBLIC_BASE_URL 설정 시 절대 경로)"""
+    base_url = base_url if base_url is not None else os.getenv("PUBLIC_BASE_URL", "")
+    return f"{base_url.rstrip('/')}/report/assets/{asset_id}"
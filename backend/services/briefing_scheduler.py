@@ -0,0 +1,183 @@
+# backend/services/briefing_scheduler.py
+
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from services.email_builder import collect_briefing_data, render_email_report
+from services.local_store import data_path, load_json, save_json, save_text
+from services.market_calendar import current_trade_date, is_session
+from services.metrics import BRIEFING_LAST_BUILD, profiled, record_cache, record_error, stage_timer
+from services.single_flight import single_flight
+
+NY_TZ = ZoneInfo('America/New_York')
+
+# 미국 장 마감(16:00 ET) 직후 미리 생성 (데이터 반영 여유 30분)
+BRIEFING_BUILD_TIME_ET = os.getenv("BRIEFING_BUILD_TIME_ET", "16:30")
+# 생성 후 이 시간이 지나면 stale로 보고 백그라운드 재생성
+BRIEFING_MAX_AGE_SEC = int(os.getenv("BRIEFING_MAX_AGE_SEC", str(6 * 3600)))
+# 지연(delayed) 섹션이 있는 브리핑은 더 빨리 stale 처리 -> 늦게 도착한 섹션을 반영해서 재생성
+BRIEFING_DELAYED_MAX_AGE_SEC = int(os.getenv("BRIEFING_DELAYED_MAX_AGE_SEC", "300"))
+BRIEFING_SCHEDULER_ENABLED = os.getenv("BRIEFING_SCHEDULER_ENABLED", "1") == "1"
+
+_latest = {}                      # {"html", "data", "trade_date", "generated_at", "built_at"}
+_scheduler_task = None
+_refresh_task = None
+
+def _html_path():
+    return data_path("briefing", "latest.html")
+
+def _meta_path():
+    return data_path("briefing", "latest.json")
+
+def _load_from_disk():
+    """서버 재시작 시 마지막으로 만든 브리핑 복원"""
+    meta = load_json(_meta_path(), default=None)
+    if not meta:
+        return
+    try:
+        with open(_html_path(), "r", encoding="utf-8") as f:
+            html = f.read()
+    except OSError:
+        return
+    if not _latest:
+        _latest.update(meta, html=html)
+
+@single_flight("briefing_build")
+async def _build_and_store():
+    """수집 + 렌더링 후 메모리/디스크에 보관 (동시에 여러 곳에서 호출돼도 1번만 실행)"""
+    print("🗓️ 데일리 브리핑 사전 생성 시작...")
+    with stage_timer("briefing_build"):
+        data, timings = await collect_briefing_data()
+        # 템플릿 렌더링은 CPU 작업이라 이벤트 루프를 막지 않도록 스레드에서 실행
+        html = await asyncio.to_thread(render_email_report, data)
+
+    entry = {
+        "data": data,
+        "trade_date": data["meta"]["trade_date"],
+        "generated_at": data["meta"]["generated_at"],
+        "built_at": time.time(),
+        "timings": timings
+    }
+    # 임시 파일 작성 후 교체 (쓰는 도중 종료돼도 이전 브리핑이 그대로 남음)
+    save_text(_html_path(), html)
+    save_json(_meta_path(), entry)
+
+    _latest.clear()
+    _latest.update(entry, html=html)
+    BRIEFING_LAST_BUILD.set(entry["built_at"])
+    print(f"✅ 데일리 브리핑 사전 생성 완료 ({entry['trade_date']})")
+
+async def build_briefing():
+    """
+    브리핑 생성 후 반환
+    - 이미 다른 곳(스케줄러, 다른 요청)에서 생성 중이면 새로 만들지 않고 그 결과를 기다림
+    - 호출자마다 별도 dict 사본을 받음
+    """
+    await _build_and_store()
+    return get_cached_briefing()
+
+def get_cached_briefing():
+    """메모리에 보관된 브리핑 (없으면 None)"""
+    if not _latest:
+        _load_from_disk()
+    return dict(_latest) if _latest else None
+
+def is_stale(entry):
+    """
+    대상 거래일이 바뀌었거나 생성 후 BRIEFING_MAX_AGE_SEC(지연 섹션이 있으면 BRIEFING_DELAYED_MAX_AGE_SEC)가 지났으면 stale
+    - 주말 / 휴장일에는 (지연 섹션이 없으면) 시간이 지나도 stale로 보지 않음
+    """
+    if not entry:
+        return True
+    if entry.get("trade_date") != current_trade_date():
+        return True
+    delayed = (entry.get("data") or {}).get("delayed")
+    if not delayed and not is_session(datetime.now(NY_TZ)):
+        # 주말 / 휴장일: 새 거래 데이터가 없으므로 마지막 거래일 브리핑을 그대로 재사용
+        return False
+    max_age = BRIEFING_DELAYED_MAX_AGE_SEC if delayed else BRIEFING_MAX_AGE_SEC
+    return time.time() - entry.get("built_at", 0) > max_age
+
+def refresh_in_background():
+    """백그라운드 재생성 (이미 생성 중이면 무시)"""
+    global _refresh_task
+    if _build_and_store.is_running() or (_refresh_task and not _refresh_task.done()):
+        return False
+    _refresh_task = asyncio.create_task(_safe_build())
+    return True
+
+async def get_latest_briefing():
+    """
+    즉시 응답용 브리핑 조회
+    - 보관본이 없으면 바로 생성 (최초 1회)
+    - stale이면 보관본을 바로 반환하고 백그라운드에서 재생성
+    - 반환 항목에 "stale" 플래그 포함
+    """
+    entry = get_cached_briefing()
+    if entry is None:
+        record_cache("briefing", "miss")
+        entry = await build_briefing()
+
+    stale = is_stale(entry)
+    if stale:
+        record_cache("briefing", "stale")
+        refresh_in_background()
+    else:
+        record_cache("briefing", "hit")
+    entry["stale"] = stale
+    return entry
+
+async def _safe_build():
+    try:
+        # PROFILING_ENABLED=1이면 예약 생성 1회 전체를 프로파일링
+        with profiled("briefing_build"):
+            await build_briefing()
+    except Exception as e:
+        record_error("briefing_build")
+        print(f"❌ Briefing Build Error: {e}")
+
+def next_run_at(now=None):
+    """다음 사전 생성 시각 (거래일 BRIEFING_BUILD_TIME_ET, 뉴욕 시간 / 주말·휴장일 제외)"""
+    now_et = (now or datetime.now(timezone.utc)).astimezone(NY_TZ)
+    hour, minute = map(int, BRIEFING_BUILD_TIME_ET.split(":"))
+
+    candidate = now_et.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate <= now_et:
+        candidate += timedelta(days=1)
+    while not is_session(candidate):  # 토/일 + NYSE 휴장일 제외
+        candidate += timedelta(days=1)
+    return candidate  # ZoneInfo는 날짜 이동 후에도 서머타임 오프셋을 자동 반영
+
+async def _scheduler_loop():
+    # 시작 시 보관본이 없거나 stale이면 바로 한 번 생성
+    if is_stale(get_cached_briefing()):
+        await _safe_build()
+
+    while True:
+        run_at = next_run_at()
+        wait_sec = (run_at - datetime.now(timezone.utc)).total_seconds()
+        print(f"🗓️ 다음 브리핑 사전 생성: {run_at.strftime('%Y-%m-%d %H:%M %Z')}")
+        await asyncio.sleep(max(wait_sec, 0))
+        await _safe_build()
+
+def start_scheduler():
+    """앱 lifespan 시작 시 호출 - 스케줄러 태스크 시작 (BRIEFING_SCHEDULER_ENABLED=0 이면 비활성)"""
+    global _scheduler_task
+    if not BRIEFING_SCHEDULER_ENABLED or (_scheduler_task and not _scheduler_task.done()):
+        return
+    _scheduler_task = asyncio.create_task(_scheduler_loop())
+
+async def stop_scheduler():
+    """앱 lifespan 종료 시 호출"""
+    global _scheduler_task
+    for task in (_scheduler_task, _refresh_task):
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    _scheduler_task = None
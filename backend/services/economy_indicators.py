@@ -1,172 +1,378 @@
-import requests
+import asyncio
 import os
+import re
+import time
 import xml.etree.ElementTree as ET
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 
+from services.http_client import get_client
+from services.local_store import data_path, load_json, save_json
+from services.metrics import record_cache, record_error, stage_timer, upstream_timer
+from services.single_flight import single_flight
+
 load_dotenv()
 
+KST = timezone(timedelta(hours=9))
+
 # 1. 지표 매핑 설정
+# - ff_aliases: 같은 지표의 다른 이름만 (Core 등 다른 지표를 넣으면 헤드라인 발표값을 다른 지표 예상치와 비교하게 됨)
 INDICATOR_MAP = {
-    "CPIAUCSL": {"name": "소비자물가지수 (CPI)", "units": "pc1", "suffix": "%", "decimal": 1, "ff_title": "CPI y/y"},
-    "PPIFIS":   {"name": "생산자물가지수 (PPI)", "units": "pc1", "suffix": "%", "decimal": 1, "ff_title": "PPI m/m"},
-    "PCEPI":    {"name": "개인소비지출 (PCE)", "units": "pc1", "suffix": "%", "decimal": 1, "ff_title": "Core PCE Price Index m/m"},
-    "PAYEMS":   {"name": "비농업 고용지수 (NFP)", "units": "chg", "suffix": "K", "decimal": 0, "ff_title": "Non-Farm Employment Change"},
-    "ICSA":     {"name": "신규 실업수당 청구", "units": "lin", "suffix": "K", "divide": 1000, "decimal": 0, "ff_title": "Unemployment Claims"},
-    "RSAFS":    {"name": "소매 판매", "units": "pch", "suffix": "%", "decimal": 1, "ff_title": "Retail Sales m/m"},
-    "DFEDTARU": {"name": "기준금리 (FOMC)", "units": "lin", "suffix": "%", "decimal": 2, "ff_title": "Federal Funds Rate"}
+    "CPIAUCSL": {"name": "소비자물가지수 (CPI)", "name_en": "Consumer Price Index (CPI)", "units": "pc1", "suffix": "%", "decimal": 1, "ff_title": "CPI y/y"},
+    "PPIFIS":   {"name": "생산자물가지수 (PPI)", "name_en": "Producer Price Index (PPI)", "units": "pc1", "suffix": "%", "decimal": 1, "ff_title": "PPI m/m"},
+    "PCEPI":    {"name": "개인소비지출 (PCE)", "name_en": "Personal Consumption Expenditures (PCE)", "units": "pc1", "suffix": "%", "decimal": 1, "ff_title": "Core PCE Price Index m/m"},
+    "PAYEMS":   {"name": "비농업 고용지수 (NFP)", "name_en": "Nonfarm Payrolls (NFP)", "units": "chg", "suffix": "K", "decimal": 0, "ff_title": "Non-Farm Employment Change", "ff_aliases": ["Nonfarm Payrolls"]},
+    "ICSA":     {"name": "신규 실업수당 청구", "name_en": "Initial Jobless Claims", "units": "lin", "suffix": "K", "divide": 1000, "decimal": 0, "ff_title": "Unemployment Claims", "ff_aliases": ["Initial Jobless Claims"]},
+    "RSAFS":    {"name": "소매 판매", "name_en": "Retail Sales", "units": "pch", "suffix": "%", "decimal": 1, "ff_title": "Retail Sales m/m"},
+    "DFEDTARU": {"name": "기준금리 (FOMC)", "name_en": "Fed Funds Rate (FOMC)", "units": "lin", "suffix": "%", "decimal": 2, "ff_title": "Federal Funds Rate", "ff_aliases": ["FOMC Statement"]}
 }
 
-def get_fred_data():
-    """FRED API에서 최신 데이터 가져오기"""
+# 2. FRED 클라이언트 설정
+FRED_URL = os.getenv("FRED_URL", "https://api.stlouisfed.org/fred/series/observations")
+FRED_TIMEOUT = 10             # 초 (커넥션 풀은 services.http_client 공유)
+FRED_MAX_CONCURRENCY = 8      # 동시 요청 수
+FRED_SEED_LIMIT = 12          # 로컬 저장소가 비어있을 때 최초로 가져올 관측치 수
+FRED_KEEP_OBS = 60            # 시리즈별 로컬에 보관할 최대 관측치 수
+FRED_REFRESH_SEC = int(os.getenv("FRED_REFRESH_SEC", "1800"))  # 이 시간 안에 확인한 시리즈는 재요청 생략
+
+def _fred_store_path(sid, units):
+    return data_path("fred", f"{sid}_{units}.json")
+
+async def _fetch_fred_series(sid, info, api_key):
+    """
+    시리즈 1개 증분 수집
+    - 로컬 저장소의 마지막 관측일 다음날부터(observation_start)만 요청
+    - 저장소가 비어있으면 최근 FRED_SEED_LIMIT개로 초기화
+    """
+    units = info.get("units")
+    path = _fred_store_path(sid, units)
+    store = load_json(path, default={}) or {}
+    observations = store.get("observations", [])
+
+    now_ts = time.time()
+    if observations and now_ts - store.get("last_checked", 0) < FRED_REFRESH_SEC:
+        record_cache("fred", "hit")
+        return observations
+    record_cache("fred", "miss")
+
+    params = {
+        "series_id": sid,
+        "units": units,
+        "api_key": api_key,
+        "file_type": "json"
+    }
+    if observations:
+        last_date = datetime.strptime(observations[-1]["date"], "%Y-%m-%d")
+        params["observation_start"] = (last_date + timedelta(days=1)).strftime("%Y-%m-%d")
+        params["sort_order"] = "asc"
+    else:
+        params["sort_order"] = "desc"
+        params["limit"] = FRED_SEED_LIMIT
+
+    with upstream_timer("fred"):
+        res = await get_client().get(FRED_URL, params=params, timeout=FRED_TIMEOUT)
+    res.raise_for_status()
+
+    # 값이 "." 인 관측치는 결측치이므로 제외
+    new_obs = [
+        {"date": o["date"], "value": o["value"]}
+        for o in res.json().get("observations", [])
+        if o.get("value") not in (None, ".")
+    ]
+
+    merged = {o["date"]: o for o in observations}
+    merged.update({o["date"]: o for o in new_obs})
+    observations = [merged[d] for d in sorted(merged)][-FRED_KEEP_OBS:]
+
+    save_json(path, {"series_id": sid, "units": units, "last_checked": now_ts, "observations": observations})
+    return observations
+
+async def get_fred_data():
+    """FRED API에서 최신 데이터 가져오기 (공유 커넥션 풀 + 동시 요청 + 증분 수집)"""
     api_key = os.getenv("FRED_API_KEY")
     results = {}
-    
-    for sid, info in INDICATOR_MAP.items():
+    semaphore = asyncio.Semaphore(FRED_MAX_CONCURRENCY)
+
+    async def fetch(sid, info):
+        async with semaphore:
+            return await _fetch_fred_series(sid, info, api_key)
+
+    fetched = await asyncio.gather(
+        *(fetch(sid, info) for sid, info in INDICATOR_MAP.items()), return_exceptions=True
+    )
+
+    for (sid, info), observations in zip(INDICATOR_MAP.items(), fetched):
         try:
-            url = f"https://api.stlouisfed.org/fred/series/observations"
-            params = {
-                "series_id": sid,
-                "units": info.get("units"),
-                "sort_order": "desc",
-                "limit": 1,
-                "api_key": api_key,
-                "file_type": "json"
-            }
-            res = requests.get(url, params=params).json()
+            if isinstance(observations, Exception):
+                raise observations
+            if not observations:
+                continue
+
+            obs = observations[-1]
+            val = float(obs["value"])
             
-            if "observations" in res and res["observations"]:
-                obs = res["observations"][0]
-                val = float(obs["value"])
-                
-                if "divide" in info:
-                    val /= info["divide"]
-                
-                decimal_places = info.get("decimal", 2)
-                formatted_num = f"{val:,.{decimal_places}f}"
-                
-                date_str = obs["date"]
-                if sid == 'ICSA':
-                    ref_date = date_str[2:] # 25-12-13
-                else:
-                    ref_date = date_str[2:7] # 25-11
-                
-                results[info["ff_title"]] = {
-                    "name": info["name"],
-                    "value": val,
-                    "display_value": f"{formatted_num}{info['suffix']}",
-                    "ref_date": ref_date,
-                    "ff_title": info["ff_title"]
-                }
+            if "divide" in info:
+                val /= info["divide"]
+            
+            decimal_places = info.get("decimal", 2)
+            formatted_num = f"{val:,.{decimal_places}f}"
+            
+            date_str = obs["date"]
+            if sid == 'ICSA':
+                ref_date = date_str[2:] # 25-12-13
+            else:
+                ref_date = date_str[2:7] # 25-11
+            
+            results[info["ff_title"]] = {
+                "name": info["name"],
+                "value": val,
+                "display_value": f"{formatted_num}{info['suffix']}",
+                "ref_date": ref_date,
+                "ff_title": info["ff_title"],
+                "ff_aliases": info.get("ff_aliases", [])
+            }
         except Exception as e:
+            record_error("fred")
             print(f"FRED Error ({sid}): {e}")
-            
+        
     return results
 
-def get_forex_factory_data():
-    """Forex Factory XML 파싱 (공백 제거 기능 강화)"""
+# 3. Forex Factory 캘린더 설정
+FF_URL = os.getenv("FF_CALENDAR_URL", "https://nfs.faireconomy.media/ff_calendar_thisweek.xml")
+FF_TIMEOUT = 15
+FF_REFRESH_SEC = int(os.getenv("FF_REFRESH_SEC", "600"))  # 이 시간 안에 확인했으면 네트워크 요청 자체를 생략
+FF_FIELDS = ("title", "country", "date", "time", "impact", "forecast")
+FF_HISTORY_DAYS = int(os.getenv("FF_HISTORY_DAYS", "56"))  # 지난 주 캘린더도 매칭할 수 있도록 보관하는 기간 (8주)
+
+def _ff_store_path(name):
+    return data_path("forex_factory", name)
+
+def _parse_ff_event(fields):
+    """<event> 태그 1개(필드 dict) -> 캘린더 항목 dict (날짜 파싱 실패 시 None)"""
+    title = fields.get("title")
+    forecast = fields.get("forecast") # 예상치가 없는 경우도 있음
+    date_str = fields.get("date")
+    time_str = fields.get("time")
+    impact = fields.get("impact")
+
+    # title과 date만 있어도 리스트에는 추가해야 함 (forecast가 없어도 매칭은 시도)
+    if not (title and date_str and time_str):
+        return None
+
+    # 날짜/시간 파싱 (MM-DD-YYYY, 1:30pm)
     try:
-        url = f"https://nfs.faireconomy.media/ff_calendar_thisweek.xml?t={int(datetime.now().timestamp())}"
+        mm, dd, yyyy = map(int, date_str.split('-'))
         
-        # User-Agent 추가 (가끔 차단될 수 있음)
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        res = requests.get(url, headers=headers)
+        time_str = time_str.lower()
+        is_pm = "pm" in time_str
+        is_am = "am" in time_str
+        time_part = time_str.replace("am", "").replace("pm", "").strip()
         
-        # XML 파싱
-        try:
-            root = ET.fromstring(res.content)
-        except ET.ParseError:
-            print("XML Parse Error: Forex Factory 응답이 올바르지 않습니다.")
-            return []
+        if ":" in time_part:
+            hour, minute = map(int, time_part.split(':'))
+        else:
+            hour, minute = int(time_part), 0
+            
+        if is_pm and hour < 12: hour += 12
+        if is_am and hour == 12: hour = 0
         
+        # UTC 시간 생성 (뉴욕시간 가정 -> +9시간 KST 변환 보정)
+        # 정확히는 XML 시간대에 따라 다르지만, 기존 JS 로직(+9h)을 따름
+        dt_obj = datetime(yyyy, mm, dd, hour, minute)
+        kst_time = dt_obj + timedelta(hours=9)
+    except Exception as e:
+        print(f"Date Parse Error ({title}): {e}")
+        return None
+
+    # Forecast 숫자 변환
+    forecast_val = 0.0
+    if forecast:
+        clean_forecast = forecast.replace('%', '').replace('K', '').strip()
+        try:
+            forecast_val = float(clean_forecast)
+        except ValueError:
+            forecast_val = 0.0
+
+    return {
+        "title": title,
+        "forecast_str": forecast if forecast else "-",
+        "forecast_val": forecast_val,
+        "impact": impact if impact else "-",
+        "kst_full_str": kst_time.strftime("%Y-%m-%d %H:%M"),
+        "kst_date_str": kst_time.strftime("%Y-%m-%d")
+    }
+
+def _iter_usd_events(parse_events):
+    """
+    XML 파싱 이벤트(iterparse / XMLPullParser.read_events)를 한 이벤트씩 처리
+    - country가 USD가 아니면 항목 객체를 만들기 전에 버림
+    - 처리한 <event> 요소는 바로 clear()해서 메모리에 쌓이지 않게 함
+    """
+    for _, elem in parse_events:
+        if elem.tag != "event":
+            continue
+        if (elem.findtext("country") or "").strip() == "USD":
+            # 안전하게 텍스트 가져오기 (None 방지 및 앞뒤 공백 제거)
+            fields = {}
+            for tag in FF_FIELDS:
+                text = elem.findtext(tag)
+                fields[tag] = text.strip() if text and text.strip() else None
+            item = _parse_ff_event(fields)
+            if item:
+                yield item
+        elem.clear()
+
+def _merge_calendar_history(items):
+    """이번 주 캘린더를 누적 히스토리에 병합 (title + 발표시각 기준 중복 제거, 오래된 항목 정리)"""
+    history_path = _ff_store_path("calendar_history.json")
+    history = load_json(history_path, default=[]) or []
+
+    cutoff = (datetime.now() - timedelta(days=FF_HISTORY_DAYS)).strftime("%Y-%m-%d")
+    merged = {(x["title"], x["kst_full_str"]): x for x in history if x["kst_date_str"] >= cutoff}
+    merged.update({(x["title"], x["kst_full_str"]): x for x in items})
+
+    history = sorted(merged.values(), key=lambda x: x["kst_full_str"])
+    save_json(history_path, history)
+    return history
+
+async def get_forex_factory_history():
+    """누적된 캘린더 히스토리 (이번 주 캘린더 갱신 후 반환)"""
+    items = await get_forex_factory_data()
+    history = load_json(_ff_store_path("calendar_history.json"), default=None)
+    if history is None:
+        history = _merge_calendar_history(items)
+    return history
+
+async def _stream_ff_calendar(headers):
+    """
+    캘린더 스트리밍 다운로드 + 파싱 -> (상태코드, USD 이벤트 목록(304면 None), 응답 헤더)
+    - 응답 청크가 도착하는 대로 XMLPullParser에 넣어서 다운로드와 파싱을 겹쳐서 진행
+    """
+    async with get_client().stream("GET", FF_URL, headers=headers, timeout=FF_TIMEOUT) as res:
+        if res.status_code == 304:
+            return 304, None, res.headers
+
+        res.raise_for_status()
+        parser = ET.XMLPullParser(events=("end",))
         items = []
-        for event in root.findall("event"):
-            # 안전하게 텍스트 가져오기 함수 (None 방지 및 공백 제거)
-            def get_text(tag):
-                elem = event.find(tag)
-                if elem is not None and elem.text:
-                    return elem.text.strip() # [핵심] 앞뒤 공백 제거
-                return None
-
-            country = get_text("country")
-            if country != "USD": continue
-            
-            title = get_text("title")
-            forecast = get_text("forecast") # 예상치가 없는 경우도 있음
-            date_str = get_text("date")
-            time_str = get_text("time")
-            impact = get_text("impact")
-            
-            # title과 date만 있어도 리스트에는 추가해야 함 (forecast가 없어도 매칭은 시도)
-            if title and date_str and time_str:
-                
-                # 날짜/시간 파싱 (MM-DD-YYYY, 1:30pm)
-                try:
-                    mm, dd, yyyy = map(int, date_str.split('-'))
-                    
-                    time_str = time_str.lower()
-                    is_pm = "pm" in time_str
-                    is_am = "am" in time_str
-                    time_part = time_str.replace("am", "").replace("pm", "").strip()
-                    
-                    if ":" in time_part:
-                        hour, minute = map(int, time_part.split(':'))
-                    else:
-                        hour, minute = int(time_part), 0
-                        
-                    if is_pm and hour < 12: hour += 12
-                    if is_am and hour == 12: hour = 0
-                    
-                    # UTC 시간 생성 (뉴욕시간 가정 -> +9시간 KST 변환 보정)
-                    # 정확히는 XML 시간대에 따라 다르지만, 기존 JS 로직(+9h)을 따름
-                    dt_obj = datetime(yyyy, mm, dd, hour, minute)
-                    kst_time = dt_obj + timedelta(hours=9)
-                    
-                    kst_full_str = kst_time.strftime("%Y-%m-%d %H:%M")
-                    kst_date_str = kst_time.strftime("%Y-%m-%d")
-                    
-                    # Forecast 숫자 변환
-                    forecast_val = 0.0
-                    if forecast:
-                        clean_forecast = forecast.replace('%', '').replace('K', '').strip()
-                        try:
-                            forecast_val = float(clean_forecast)
-                        except:
-                            forecast_val = 0.0
-
-                    items.append({
-                        "title": title,
-                        "forecast_str": forecast if forecast else "-",
-                        "forecast_val": forecast_val,
-                        "impact": impact if impact else "-",
-                        "kst_full_str": kst_full_str,
-                        "kst_date_str": kst_date_str
-                    })
-                    
-                    # [디버깅] 매칭될 제목 확인용 (로그에 찍힘)
-                    # print(f"[XML Found] {title} / {date_str}")
-
-                except Exception as e:
-                    print(f"Date Parse Error ({title}): {e}")
-                    continue
+        async for chunk in res.aiter_bytes():
+            parser.feed(chunk)
+            items.extend(_iter_usd_events(parser.read_events()))
+        parser.close()
+        items.extend(_iter_usd_events(parser.read_events()))
+        return res.status_code, items, res.headers
+
+async def get_forex_factory_data():
+    """
+    Forex Factory 주간 캘린더 (USD 이벤트만)
+    - 디스크에 파싱 결과 보관 + ETag/Last-Modified 조건부 요청
+    - 피드가 바뀌었을 때(200)만 다시 파싱, 304면 저장된 결과 그대로 사용
+    - 다운로드 전체에 FF_TIMEOUT 상한 (응답이 느리게 흘러나와도 저장된 결과로 대체)
+    """
+    meta_path = _ff_store_path("meta.json")
+    events_path = _ff_store_path("calendar_thisweek.json")
+    meta = load_json(meta_path, default={}) or {}
+    cached_events = load_json(events_path, default=None)
+
+    if cached_events is not None and time.time() - meta.get("last_checked", 0) < FF_REFRESH_SEC:
+        record_cache("forex_factory", "hit")
+        return cached_events
+
+    headers = {}
+    if cached_events is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        # 스트리밍 응답이라 다운로드 + 파싱 시간이 함께 잡힘
+        with upstream_timer("forex_factory"):
+            status, items, res_headers = await asyncio.wait_for(_stream_ff_calendar(headers), FF_TIMEOUT)
+
+        if status == 304:
+            record_cache("forex_factory", "not_modified")
+            meta["last_checked"] = time.time()
+            save_json(meta_path, meta)
+            return cached_events
 
+        record_cache("forex_factory", "miss")
+        save_json(events_path, items)
+        with stage_timer("ff_history_merge"):
+            _merge_calendar_history(items)
+        save_json(meta_path, {
+            "etag": res_headers.get("ETag"),
+            "last_modified": res_headers.get("Last-Modified"),
+            "last_checked": time.time()
+        })
+        print(f"📅 Forex Factory 캘린더 갱신 (USD {len(items)}건)")
         return items
-        
+
+    except ET.ParseError:
+        record_error("forex_factory")
+        print("XML Parse Error: Forex Factory 응답이 올바르지 않습니다.")
+        return cached_events or []
+    except asyncio.TimeoutError:
+        record_error("forex_factory")
+        print(f"FF Timeout: {FF_TIMEOUT}초 초과 - 저장된 캘린더 사용")
+        return cached_events or []
     except Exception as e:
+        record_error("forex_factory")
         print(f"FF Error: {e}")
-        return []
+        return cached_events or []
+
+def normalize_title(title):
+    """매칭용 제목 정규화 (소문자 + 특수문자/공백 정리) / 예: ' Core  CPI y/y ' -> 'core cpi y/y'"""
+    return " ".join(re.sub(r"[^0-9a-z/%]+", " ", title.lower()).split())
+
+def build_event_index(events):
+    """
+    정규화된 제목 -> 이벤트 리스트 (발표시각 최신순) 인덱스
+    - 한 번 만들어두면 지표별 조회는 dict 조회 1번
+    """
+    index = defaultdict(list)
+    for event in events:
+        index[normalize_title(event["title"])].append(event)
+    for bucket in index.values():
+        bucket.sort(key=lambda x: x["kst_full_str"], reverse=True)
+    return dict(index)
+
+def find_latest_event(index, titles, now_str=None):
+    """
+    제목/별칭 목록으로 가장 최근 '발표된' 이벤트 조회
+    - 발표된 이벤트가 없으면 가장 가까운 예정 이벤트
+    - 발표시각이 같으면 앞쪽 제목(대표 제목) 우선
+    """
+    now_str = now_str or datetime.now(KST).strftime("%Y-%m-%d %H:%M")
+    released, upcoming = None, None
+
+    for title in titles:
+        for event in index.get(normalize_title(title), []):
+            if event["kst_full_str"] <= now_str:
+                if released is None or event["kst_full_str"] > released["kst_full_str"]:
+                    released = event
+                break  # 최신순 정렬이므로 첫 발표 이벤트가 이 제목의 최신 발표분
+            if upcoming is None or event["kst_full_str"] < upcoming["kst_full_str"]:
+                upcoming = event
+
+    return released or upcoming
 
-def get_economy_indicators():
+@single_flight("economy_indicators")
+async def get_economy_indicators():
     """최종 데이터 병합 및 리턴"""
-    fred_data = get_fred_data() # Dict
-    ff_data = get_forex_factory_data() # List
+    # FRED / Forex Factory 동시 수집
+    fred_data, ff_history = await asyncio.gather(get_fred_data(), get_forex_factory_history())
+    with stage_timer("ff_index"):
+        ff_index = build_event_index(ff_history) # 정규화 제목 -> 이벤트 (최신순)
+    now_str = datetime.now(KST).strftime("%Y-%m-%d %H:%M")
     
     final_list = []
     
     for ff_title, f_item in fred_data.items():
-        # [핵심] 부분 일치 매칭 (Partial Match)
-        # 예: "Unemployment Claims" in "Unemployment Claims" -> True
-        matched_ff = next((x for x in ff_data if f_item['ff_title'].lower() in x['title'].lower()), None)
+        # [핵심] 제목 + 별칭 인덱스 조회 -> 가장 최근 발표분 매칭
+        # 예: "CPI y/y" -> 이번 주/지난 주 CPI y/y 중 가장 최근 발표 이벤트
+        matched_ff = find_latest_event(ff_index, [ff_title] + f_item.get("ff_aliases", []), now_str)
         
         res_item = {
             "지표명": f_item["name"],
@@ -1,80 +1,403 @@
 # backend/services/email_builder.py
 
+import asyncio
 import os
-import markdown
-from datetime import datetime, timedelta
-import pytz # 시간대 처리를 위해 추가
-from jinja2 import Environment, FileSystemLoader
+import time
+import base64
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo # 시간대 처리 (표준 라이브러리)
 
-from services.briefing_market_index import get_market_summary_markdown, get_sp500_map_image
-from services.economy_indicators import get_economy_indicators
+from services.briefing_market_index import TICKER_NAMES_EN, asset_url, get_briefing_index_rows, get_sp500_map_asset
+from services.image_assets import read_asset
+from services.economy_indicators import INDICATOR_MAP, get_economy_indicators
+from services.market_calendar import current_trade_date, previous_session
 from services.market_news_crawl_llm import get_market_news
+from services.metrics import SECTION_DELAYED, SECTION_LATENCY, record_error, stage_timer
+from services.report_renderer import render_template, stream_template
+from services.snapshot_store import (
+    load_latest_snapshot, load_snapshot_meta, load_snapshots, save_snapshot, save_snapshots
+)
 
-def generate_email_report():
-    print("💌 리포트 생성 시작...")
+REPORT_TEMPLATE = 'report_template.html'
 
-    # [1-1] 지수 테이블
-    print("Creating Index Table...")
-    md_table = get_market_summary_markdown()
-    html_table = markdown.markdown(md_table, extensions=['tables'])
+KST_TZ = ZoneInfo('Asia/Seoul')
 
-    # [1-2] S&P 500 맵
-    print("Fetching Map Image...")
-    sp500_img = get_sp500_map_image()
+# 데일리 브리핑 데이터 소스 (모두 외부 I/O 대기 위주라 코루틴으로 동시 실행)
+BRIEFING_SOURCES = {
+    "index_table": get_briefing_index_rows,
+    "sp500_map": get_sp500_map_asset,
+    "economy": get_economy_indicators,
+    "news": get_market_news,
+}
 
-    # [1-3] 경제 지표 (전일 발표분만 필터링)
-    print("Fetching Economy Data...")
-    raw_economy_data = get_economy_indicators()
-    
-    # --- [수정] 날짜 필터링 로직 추가 ---
-    # 한국 시간 기준 '어제' 날짜 구하기
-    kst_tz = pytz.timezone('Asia/Seoul')
-    now_kst = datetime.now(kst_tz)
-    yesterday_kst = now_kst - timedelta(days=1)
-    target_date_str = yesterday_kst.strftime("%Y-%m-%d")
+# 섹션별 수집 시간 예산(초) + 리포트 전체 마감(초)
+# - 예산을 넘긴 섹션은 기다리지 않고 '지연' 표시 + 마지막 스냅샷 값으로 대체
+# - 넘긴 수집 작업은 백그라운드에서 계속 돌려서, 끝나면 스냅샷/캐시를 갱신 (다음 리포트에 반영)
+BRIEFING_DEADLINE_SEC = float(os.getenv("BRIEFING_DEADLINE_SEC", "90"))
+SOURCE_BUDGETS_SEC = {
+    "index_table": float(os.getenv("BRIEFING_BUDGET_INDEX_SEC", "25")),
+    "sp500_map": float(os.getenv("BRIEFING_BUDGET_MAP_SEC", "75")),
+    "economy": float(os.getenv("BRIEFING_BUDGET_ECONOMY_SEC", "25")),
+    "news": float(os.getenv("BRIEFING_BUDGET_NEWS_SEC", "60")),
+}
+
+_late_tasks = set()  # 예산을 넘긴 뒤에도 계속 도는 수집 태스크 (GC 방지용 참조)
+
+# 리포트 고정 문구 (언어별) - 수집된 데이터(요약 / 뉴스 제목 / 지수·지표명)는 localize_content에서 언어별로 교체
+REPORT_LABELS = {
+    "ko": {
+        "title": "🇺🇸 미국 증시 데일리 브리핑",
+        "date_format": "%Y년 %m월 %d일 (%a)",
+        "greeting": "%s님을 위한 브리핑",
+        "summary": "⚡ 오늘의 핵심 요약",
+        "index": "📊 주요 지수 현황",
+        "trend": "📈 기간별 추세",
+        "watchlist": "⭐ 관심 종목",
+        "economy": "📅 어제 발표된 주요 경제 지표",
+        "map": "🌎 S&P 500 히트맵 (Click to Zoom)",
+        "map_link": "클릭하여 원본 지도 보기",
+        "news": "📰 간밤의 월스트리트 주요 뉴스",
+        "col_name": "지표", "col_symbol": "종목", "col_price": "현재가", "col_change": "변동률",
+        "col_1w": "1주", "col_1m": "1개월", "col_ytd": "YTD", "col_52w_high": "52주 고점 대비", "col_ma50": "50일선 대비",
+        "forecast": "예상", "impact": "중요도",
+        "summary_missing": "요약 정보 없음", "news_missing": "뉴스 데이터를 가져오지 못했습니다.",
+        "delayed_fallback": "⏳ 데이터 지연 - %s 기준 값을 표시합니다.",
+        "delayed_skipped": "⏳ 데이터 지연 - 이번 리포트에서는 생략되었습니다.",
+        "disclaimer": "본 리포트는 AI에 의해 자동 생성되었으며, 투자의 참고 자료로만 활용하시기 바랍니다.",
+    },
+    "en": {
+        "title": "🇺🇸 US Market Daily Briefing",
+        "date_format": "%a, %b %d, %Y",
+        "greeting": "Prepared for %s",
+        "summary": "⚡ Today's Key Takeaways",
+        "index": "📊 Major Indices",
+        "trend": "📈 Performance by Period",
+        "watchlist": "⭐ Your Watchlist",
+        "economy": "📅 Economic Releases",
+        "map": "🌎 S&P 500 Heatmap (Click to Zoom)",
+        "map_link": "Open the original map",
+        "news": "📰 Overnight Wall Street Headlines",
+        "col_name": "Index", "col_symbol": "Symbol", "col_price": "Price", "col_change": "Change",
+        "col_1w": "1W", "col_1m": "1M", "col_ytd": "YTD", "col_52w_high": "vs 52W High", "col_ma50": "vs 50D MA",
+        "forecast": "Forecast", "impact": "Impact",
+        "summary_missing": "No summary available.", "news_missing": "Could not load the news.",
+        "delayed_fallback": "⏳ Data delayed - showing values as of %s.",
+        "delayed_skipped": "⏳ Data delayed - omitted from this report.",
+        "disclaimer": "This report is generated automatically by AI and is for reference only, not investment advice.",
+    },
+}
+DEFAULT_LANGUAGE = "ko"
+
+# 수집 데이터의 기본 언어(ko) 외 표시명: 경제 지표명(한국어 지표명 -> 언어별 이름)
+INDICATOR_NAMES = {"en": {info["name"]: info["name_en"] for info in INDICATOR_MAP.values()}}
+TICKER_NAMES = {"en": TICKER_NAMES_EN}
+
+# 이메일 내 이미지 참조 방식: url(PUBLIC_BASE_URL 필요) / cid(메일 발송 측에서 asset 첨부) / inline(Base64)
+EMAIL_IMAGE_MODE = os.getenv("EMAIL_IMAGE_MODE") or ("url" if os.getenv("PUBLIC_BASE_URL") else "inline")
+
+async def _timed_call(func):
+    """소스 코루틴 실행 + 소요시간 측정 (예외는 결과 대신 기록)"""
+    start = time.perf_counter()
+    try:
+        result, error = await func(), None
+    except Exception as e:
+        result, error = None, e
+    return result, error, time.perf_counter() - start
+
+def _continue_in_background(name, task, on_late):
+    """예산을 넘긴 수집 태스크는 취소하지 않고 끝까지 실행 -> 결과가 나오면 on_late(name, result)"""
+    _late_tasks.add(task)
+
+    def done(t):
+        _late_tasks.discard(t)
+        if t.cancelled():
+            return
+        result, error, elapsed = t.result()
+        SECTION_LATENCY.observe(elapsed, section=name)
+        if error is not None:
+            record_error(f"briefing_{name}")
+            print(f"❌ {name} 지연 수집 실패 ({elapsed:.2f}초): {error}")
+        elif result is not None and on_late:
+            try:
+                on_late(name, result)
+            except Exception as e:
+                print(f"⚠️ {name} 지연 결과 처리 실패: {e}")
+
+    task.add_done_callback(done)
+
+async def fetch_briefing_sources(sources=None, budgets=None, deadline=None, on_late=None):
+    """
+    데이터 소스 동시 수집 (Fan-out) + 섹션별 시간 예산
+    - 전체 소요시간 ≤ min(가장 느린 소스, 전체 마감)
+    - 예산(과 전체 마감)을 넘긴 소스는 결과 없이 넘어가고, 작업은 백그라운드에서 계속
+      (끝나면 on_late(name, result) 호출)
+    - 반환: (결과 dict, 단계별 소요시간 dict, 섹션 상태 dict{name: "ok" / "error" / "timeout"})
+      소요시간과 실패는 /metrics 지표에도 기록
+    """
+    sources = sources or BRIEFING_SOURCES
+    budgets = {**SOURCE_BUDGETS_SEC, **(budgets or {})}
+    deadline = BRIEFING_DEADLINE_SEC if deadline is None else deadline
+    results, timings, status = {}, {}, {}
+
+    start = time.perf_counter()
+    tasks = {name: asyncio.create_task(_timed_call(func)) for name, func in sources.items()}
+
+    async def wait(name, task):
+        done, _ = await asyncio.wait({task}, timeout=min(budgets.get(name, deadline), deadline))
+        return task.result() if done else None
+
+    outcomes = await asyncio.gather(*(wait(name, task) for name, task in tasks.items()))
+    for (name, task), outcome in zip(tasks.items(), outcomes):
+        if outcome is None:
+            elapsed = time.perf_counter() - start
+            timings[name] = round(elapsed, 3)
+            status[name] = "timeout"
+            results[name] = None
+            SECTION_DELAYED.inc(section=name, reason="timeout")
+            print(f"⏳ {name} 시간 예산 초과 ({elapsed:.2f}초) - 지연 처리 후 백그라운드에서 계속 수집")
+            _continue_in_background(name, task, on_late)
+            continue
+
+        result, error, elapsed = outcome
+        timings[name] = round(elapsed, 3)
+        SECTION_LATENCY.observe(elapsed, section=name)
+        status[name] = "ok"
+        if error is not None:
+            status[name] = "error"
+            record_error(f"briefing_{name}")
+            SECTION_DELAYED.inc(section=name, reason="error")
+            print(f"❌ {name} 수집 실패 ({elapsed:.2f}초): {error}")
+        results[name] = result
+
+    return results, timings, status
+
+def build_image_src(asset, mode=None):
+    """이미지 asset -> <img src> 값 (asset이 없으면 None)"""
+    if not asset:
+        return None
+    mode = mode or EMAIL_IMAGE_MODE
+    asset_id = asset["asset_id"]
+    if mode == "url":
+        return asset_url(asset_id)
+    if mode == "cid":
+        return f"cid:{asset_id}"
+
+    content = read_asset(asset_id)
+    if content is None:
+        return None
+    return f"data:{asset['media_type']};base64,{base64.b64encode(content).decode('utf-8')}"
+
+async def collect_briefing_data(sections=None):
+    """
+    전체(또는 sections에 지정한) 섹션 수집 + 거래일 스냅샷 저장
+    - 시간 예산을 넘기거나 실패한 섹션은 마지막 스냅샷 값으로 대체하고 "delayed"에 기록
+      (늦게 도착한 결과는 백그라운드에서 이번 거래일 스냅샷으로 저장)
+    - 반환: ({섹션명: 결과, "meta": {...}, "delayed": {...}}, 단계별 소요시간 dict)
+    """
+    trade_date = current_trade_date()
+
+    def save_late_result(name, result):
+        save_snapshot(trade_date, name, result)
+        print(f"📦 지연 섹션 도착: {name} -> {trade_date} 스냅샷 저장")
+
+    sources = {name: BRIEFING_SOURCES[name] for name in sections} if sections else None
+    sources, timings, status = await fetch_briefing_sources(sources, on_late=save_late_result)
+
+    now_kst = datetime.now(KST_TZ)
+    data = dict(sources)
+    data["meta"] = {"trade_date": trade_date, "generated_at": now_kst.isoformat()}
+
+    delayed = {}
+    for name, state in status.items():
+        if state == "ok":
+            continue
+        try:
+            fallback_date, payload = load_latest_snapshot(name)
+        except Exception as e:
+            print(f"⚠️ Snapshot Load Error ({name}): {e}")
+            fallback_date, payload = None, None
+        data[name] = payload
+        delayed[name] = {"reason": state, "fallback_date": fallback_date}
+
+    # 실패/지연 섹션(None 또는 이전 스냅샷 값)은 저장하지 않음 -> 같은 거래일에 이전에 성공한 스냅샷 유지
+    try:
+        save_snapshots(
+            trade_date,
+            {name: value for name, value in sources.items() if name not in delayed},
+            meta=data["meta"]
+        )
+    except Exception as e:
+        print(f"⚠️ Snapshot Save Error: {e}")
+
+    data["delayed"] = delayed
+    return data, timings
+
+def load_snapshot_data(trade_date):
+    """
+    저장된 거래일 스냅샷 -> 렌더링용 데이터 ({섹션명: 결과, "meta": {...}}, 스냅샷이 없으면 None)
+    - meta가 없는 스냅샷은 trade_date만 채움 (생성 시각은 렌더링 시점 기준)
+    """
+    sections = load_snapshots(trade_date)
+    if not sections:
+        return None
+    return {**sections, "meta": load_snapshot_meta(trade_date) or {"trade_date": trade_date}}
+
+def build_delayed_notices(delayed, labels=None):
+    """지연 섹션 정보 -> {섹션명: 안내 문구} (템플릿의 섹션별 '지연' 표시)"""
+    labels = labels or REPORT_LABELS[DEFAULT_LANGUAGE]
+    notices = {}
+    for name, info in (delayed or {}).items():
+        if info.get("fallback_date"):
+            notices[name] = labels["delayed_fallback"] % info["fallback_date"]
+        else:
+            notices[name] = labels["delayed_skipped"]
+    return notices
+
+def localize_content(language, index_rows, economy_list, news_result):
+    """
+    수집 데이터(한국어 기준) -> language 표시용 (index_rows, economy_list, market_summary, news_list)
+    - 지수명: TICKER_NAMES (없으면 원래 표시명) / 경제 지표명: INDICATOR_NAMES
+    - 요약: LLM의 market_summary_{language} (이전 스냅샷처럼 없으면 한국어 요약) / 뉴스 제목: 영문 원문 제목
+    - 기본 언어(ko)면 그대로 반환
+    """
+    market_summary = news_result.get("market_summary") if isinstance(news_result, dict) else None
+    news_list = news_result.get("news_list", []) if isinstance(news_result, dict) else []
+    if language == DEFAULT_LANGUAGE:
+        return index_rows, economy_list, market_summary, news_list
+
+    ticker_names = TICKER_NAMES.get(language, {})
+    index_rows = [
+        {**row, "name": ticker_names.get(row.get("symbol"), row["name"]),
+         "price": row["price"].replace("원", " KRW") if isinstance(row.get("price"), str) else row.get("price")}
+        for row in index_rows
+    ]
+    indicator_names = INDICATOR_NAMES.get(language, {})
+    economy_list = [{**item, "지표명": indicator_names.get(item.get("지표명"), item.get("지표명"))} for item in economy_list]
+    market_summary = news_result.get(f"market_summary_{language}") or market_summary
+    news_list = [{**news, "title": news.get("original_title") or news.get("title")} for news in news_list]
+    return index_rows, economy_list, market_summary, news_list
+
+def economy_target_dates(now_kst, trade_date=None):
+    """
+    경제 지표 필터링 대상 발표일(KST) 목록
+    - trade_date가 있으면 직전 거래일 다음날 ~ trade_date (주말 / 휴장일에 나온 발표도 다음 리포트에 포함)
+    - 없으면 리포트 기준 전일(KST) 하루
+    """
+    if not trade_date:
+        # 한국 시간 기준 '어제' 날짜 구하기 (리포트 생성 시점 기준)
+        return [(now_kst - timedelta(days=1)).strftime("%Y-%m-%d")]
+
+    end = date.fromisoformat(trade_date)
+    day = previous_session(end) + timedelta(days=1)
+    dates = []
+    while day <= end:
+        dates.append(day.strftime("%Y-%m-%d"))
+        day += timedelta(days=1)
+    return dates
+
+def filter_recent_economy(raw_economy_data, now_kst, trade_date=None):
+    """경제 지표 중 이번 리포트 대상 기간(economy_target_dates)에 발표된 것만"""
+    target_dates = set(economy_target_dates(now_kst, trade_date))
     
-    print(f"Filtering Economy Data for: {target_date_str}")
+    print(f"Filtering Economy Data for: {sorted(target_dates)}")
 
     economy_data = []
     if raw_economy_data:
         for item in raw_economy_data:
-            # item['필터링(전일 발표)'] 값이 어제 날짜와 같은지 확인
-            if item.get("필터링(전일 발표)") == target_date_str:
+            # item['필터링(전일 발표)'] 값(발표일 KST)이 대상 기간에 포함되는지 확인
+            if item.get("필터링(전일 발표)") in target_dates:
                 economy_data.append(item)
-    # ----------------------------------
+    return economy_data
+
+def report_time(data):
+    """섹션 데이터의 생성 시각(KST) (meta가 없으면 현재 시각)"""
+    meta = data.get("meta") or {}
+    return datetime.fromisoformat(meta["generated_at"]) if meta.get("generated_at") else datetime.now(KST_TZ)
+
+def build_report_context(data, language=DEFAULT_LANGUAGE, image_mode=None):
+    """
+    수집된 섹션 데이터(또는 스냅샷) -> 템플릿 변수 dict (네트워크 호출 없음)
+    - language: REPORT_LABELS 키 (고정 문구 / 날짜 형식 + localize_content로 요약 / 뉴스 / 지수·지표명)
+    - image_mode: None이면 EMAIL_IMAGE_MODE
+    """
+    now_kst = report_time(data)
+    labels = REPORT_LABELS.get(language) or REPORT_LABELS[DEFAULT_LANGUAGE]
+
+    # [1-1] 지수 테이블 (구조화된 행을 템플릿이 바로 렌더링)
+    index_rows = data.get("index_table") or []
+    market_table_html = None
+    if isinstance(index_rows, str):
+        # 이전 버전 스냅샷(마크다운 문자열) 호환
+        import markdown
+        market_table_html = markdown.markdown(index_rows, extensions=['tables'])
+        index_rows = []
+
+    # [1-2] S&P 500 맵 (URL / CID / Base64 중 EMAIL_IMAGE_MODE 방식으로 참조)
+    sp500_image_src = build_image_src(data.get("sp500_map"), image_mode)
+
+    # [1-3] 경제 지표 (직전 거래일 이후 ~ 대상 거래일 발표분만 필터링)
+    economy_data = filter_recent_economy(data.get("economy"), now_kst, (data.get("meta") or {}).get("trade_date"))
+
+    # [1-4] 뉴스 + 언어별 표시 (요약 / 뉴스 제목 / 지수·지표명)
+    news_result = data.get("news")
+    index_rows, economy_data, market_summary, news_list = localize_content(language, index_rows, economy_data, news_result)
+    if not market_summary:
+        market_summary = labels["summary_missing"] if isinstance(news_result, dict) else labels["news_missing"]
+
+    return {
+        "t": labels,
+        "today_date": now_kst.strftime(labels["date_format"]), # KST 기준 날짜 표시
+        "delayed": build_delayed_notices(data.get("delayed"), labels),
+        "market_summary": market_summary,
+        "index_rows": index_rows,
+        "market_table_html": market_table_html,
+        "sp500_image_src": sp500_image_src,
+        "news_list": news_list,
+        "economy_list": economy_data # 필터링된 데이터 전달
+    }
+
+def render_email_report(data):
+    """수집된 섹션 데이터(또는 스냅샷) -> HTML 문자열"""
+    from jinja2 import TemplateError
 
-    # [1-4] 뉴스
-    print("Crawling News...")
-    news_result = get_market_news()
-    
-    if isinstance(news_result, dict):
-        market_summary = news_result.get("market_summary", "요약 정보 없음")
-        news_list = news_result.get("news_list", [])
-    else:
-        market_summary = "뉴스 데이터를 가져오지 못했습니다."
-        news_list = []
-
-    # 2. Jinja2 템플릿 로드
-    template_dir = os.path.join(os.path.dirname(__file__), '../templates')
-    
     try:
-        env = Environment(loader=FileSystemLoader(template_dir))
-        template = env.get_template('report_template.html')
-    except Exception as e:
-        print(f"❌ Template Loading Error: {e}")
+        with stage_timer("render"):
+            return render_template(REPORT_TEMPLATE, **build_report_context(data))
+    except TemplateError as e:
+        record_error("render")
+        print(f"❌ Template Error: {e}")
         return f"<h1>Template Error</h1><p>{str(e)}</p>"
 
-    # 3. 렌더링
-    today_str = now_kst.strftime("%Y년 %m월 %d일 (%a)") # KST 기준 날짜 표시
-    
-    rendered_html = template.render(
-        today_date=today_str,
-        market_summary=market_summary,
-        market_table_html=html_table,
-        sp500_image=sp500_img,
-        news_list=news_list,
-        economy_list=economy_data # 필터링된 데이터 전달
-    )
-    
+def stream_email_report(data):
+    """수집된 섹션 데이터(또는 스냅샷) -> HTML 조각 제너레이터 (StreamingResponse 용)"""
+    return stream_template(REPORT_TEMPLATE, **build_report_context(data))
+
+async def generate_email_report(trade_date=None):
+    """
+    데일리 브리핑 HTML 생성
+    - trade_date 지정 시: 저장된 스냅샷으로만 다시 렌더링 (네트워크 호출 없음)
+    """
+    if trade_date:
+        print(f"💌 스냅샷으로 리포트 재생성 ({trade_date})...")
+        data = load_snapshot_data(trade_date)
+        if not data:
+            return f"<h1>Snapshot Not Found</h1><p>{trade_date} 스냅샷이 없습니다.</p>"
+        return await asyncio.to_thread(render_email_report, data)
+
+    print("💌 리포트 생성 시작...")
+    total_start = time.perf_counter()
+
+    # [1] 지수 / 맵 / 경제지표 / 뉴스 동시 수집 (+ 스냅샷 저장)
+    print("Fetching Index / Map / Economy / News in parallel...")
+    data, timings = await collect_briefing_data()
+
+    # [2] 렌더링 (CPU 작업이라 이벤트 루프를 막지 않도록 스레드에서 실행)
+    render_start = time.perf_counter()
+    rendered_html = await asyncio.to_thread(render_email_report, data)
+
+    timings["render"] = round(time.perf_counter() - render_start, 3)
+    timings["total"] = round(time.perf_counter() - total_start, 3)
+
+    print(f"⏱️ 단계별 소요시간(초): {timings}")
     print("✅ 리포트 생성 완료!")
-    return rendered_html
\ No newline at end of file
+    return rendered_html
@@ -0,0 +1,47 @@
+# backend/services/http_client.py
+
+import os
+
+# 모든 외부 API(Naver, FRED, Forex Factory, ApiFlash, RSS, Upstage)가 같이 쓰는 keep-alive 커넥션 풀
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "15"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+
+DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0'}  # 봇 탐지 방지용 헤더
+
+_client = None
+
+def _create_client():
+    import httpx
+
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE),
+        headers=DEFAULT_HEADERS,
+        follow_redirects=True
+    )
+
+async def open_client():
+    """앱 lifespan 시작 시 호출 - 공유 클라이언트 생성"""
+    global _client
+    if _client is None:
+        _client = _create_client()
+    return _client
+
+async def close_client():
+    """앱 lifespan 종료 시 호출 - 커넥션 풀 정리"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+def get_client():
+    """
+    공유 AsyncClient 반환
+    - lifespan 밖(스크립트, 벤치마크 등)에서 호출되면 그 자리에서 생성
+    """
+    global _client
+    if _client is None:
+        _client = _create_client()
+    return _client
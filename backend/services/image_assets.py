@@ -0,0 +1,62 @@
+# backend/services/image_assets.py
+
+import hashlib
+import io
+import os
+import re
+
+from services.local_store import data_path, save_bytes
+
+# 이메일용 재인코딩 설정 (가로 폭 축소 + JPEG 압축)
+EMAIL_IMAGE_MAX_WIDTH = int(os.getenv("EMAIL_IMAGE_MAX_WIDTH", "1200"))
+EMAIL_IMAGE_QUALITY = int(os.getenv("EMAIL_IMAGE_QUALITY", "80"))
+
+ASSET_ID_PATTERN = re.compile(r"^[0-9a-f]{64}\.(jpg|png)$")
+MEDIA_TYPES = {"jpg": "image/jpeg", "png": "image/png"}
+
+def reencode_for_email(raw_bytes):
+    """
+    원본 이미지 -> 이메일용 (폭 EMAIL_IMAGE_MAX_WIDTH 이하 JPEG)
+    - Pillow가 없으면 원본 PNG 그대로 사용
+    - 반환: (bytes, 확장자, (width, height))
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        print("⚠️ Pillow 미설치: 이미지 재인코딩 생략 (원본 PNG 사용)")
+        return raw_bytes, "png", None
+
+    with Image.open(io.BytesIO(raw_bytes)) as img:
+        img = img.convert("RGB")
+        if img.width > EMAIL_IMAGE_MAX_WIDTH:
+            height = round(img.height * EMAIL_IMAGE_MAX_WIDTH / img.width)
+            img = img.resize((EMAIL_IMAGE_MAX_WIDTH, height), Image.LANCZOS)
+
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=EMAIL_IMAGE_QUALITY, optimize=True, progressive=True)
+        return out.getvalue(), "jpg", img.size
+
+def store_asset(content, ext):
+    """내용 해시(sha256) 기반 파일명으로 저장 -> asset id 반환 (같은 이미지는 한 번만 저장)"""
+    asset_id = f"{hashlib.sha256(content).hexdigest()}.{ext}"
+    path = asset_path(asset_id)
+    if not os.path.exists(path):
+        save_bytes(path, content)  # 같은 이미지를 동시에 저장해도 고유 임시 파일 -> 교체라 서로 덮어쓰지 않음
+    return asset_id
+
+def asset_path(asset_id):
+    """asset id -> 저장 경로 (형식이 맞지 않으면 ValueError)"""
+    if not ASSET_ID_PATTERN.match(asset_id):
+        raise ValueError(f"Invalid asset id: {asset_id}")
+    return data_path("assets", asset_id)
+
+def asset_media_type(asset_id):
+    return MEDIA_TYPES[asset_id.rsplit(".", 1)[-1]]
+
+def read_asset(asset_id):
+    """저장된 asset bytes (없으면 None)"""
+    try:
+        with open(asset_path(asset_id), "rb") as f:
+            return f.read()
+    except (OSError, ValueError):
+        return None
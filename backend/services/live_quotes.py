@@ -0,0 +1,234 @@
+# backend/services/live_quotes.py
+
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+
+import orjson
+
+from services.briefing_market_index import DEFAULT_TICKERS
+from services.market_data import compute_price_changes, refresh_price_frames
+from services.metrics import LIVE_SUBSCRIBERS, record_error, stage_timer
+from services.watchlist import load_watchlist
+
+# 실시간 지수 스트림 (SSE)
+# - 폴러 1개가 시세를 조회하고, 이전 tick과 달라진 티커만 delta로 만들어 모든 접속자에게 같은 바이트를 전송
+# - 접속자가 없으면 폴링도 멈춤 (대시보드 수만큼 yfinance 호출이 늘지 않음)
+
+LIVE_QUOTES_POLL_SEC = float(os.getenv("LIVE_QUOTES_POLL_SEC", "15"))
+LIVE_QUOTES_HEARTBEAT_SEC = float(os.getenv("LIVE_QUOTES_HEARTBEAT_SEC", "15"))
+LIVE_QUOTES_QUEUE_SIZE = int(os.getenv("LIVE_QUOTES_QUEUE_SIZE", "32"))
+# 시세 소스: yfinance (기본) / replay (LIVE_QUOTES_REPLAY_FILE의 녹화된 시세를 tick마다 하루씩 재생)
+LIVE_QUOTES_SOURCE = os.getenv("LIVE_QUOTES_SOURCE", "yfinance")
+LIVE_QUOTES_REPLAY_FILE = os.getenv("LIVE_QUOTES_REPLAY_FILE")
+
+# ---------------------------------------------------------
+# 시세 소스 (source(symbols) -> {티커: 시세 dict}, 스레드에서 호출됨)
+# ---------------------------------------------------------
+def _quotes_from_changes(changes):
+    """compute_price_changes 결과 -> {티커: {"price", "prev_close", "change", "change_pct", "as_of"}} (데이터 없는 티커 제외)"""
+    import pandas as pd
+
+    quotes = {}
+    for symbol, row in changes.iterrows():
+        if pd.isna(row["last_close"]):
+            continue
+        quotes[symbol] = {
+            "price": round(float(row["last_close"]), 4),
+            "prev_close": round(float(row["prev_close"]), 4),
+            "change": round(float(row["change"]), 4),
+            "change_pct": round(float(row["change_pct"]), 4),
+            "as_of": row["last_date"].strftime("%Y-%m-%d") if pd.notna(row["last_date"]) else None,
+        }
+    return quotes
+
+def yfinance_source(symbols):
+    """기본 소스: 캐시를 건너뛰고 다시 조회 (갱신된 캐시는 다른 엔드포인트도 사용)"""
+    df = refresh_price_frames(symbols, "5d")
+    return _quotes_from_changes(compute_price_changes(df, symbols))
+
+class ReplaySource:
+    """
+    녹화된 시세(yf.download(group_by='ticker') 형태의 DataFrame)를 tick마다 하루씩 진행하며 재생
+    - 끝까지 가면 처음부터 다시 (테스트 / 오프라인 데모용)
+    """
+
+    def __init__(self, history, window=5):
+        self.history = history
+        self.window = window
+        self._cursor = 1
+
+    @classmethod
+    def from_file(cls, path=None):
+        """yf.download(group_by='ticker')를 저장한 CSV(2단 헤더) 파일에서 생성 (path가 없으면 LIVE_QUOTES_REPLAY_FILE)"""
+        import pandas as pd
+
+        path = path or LIVE_QUOTES_REPLAY_FILE
+        if not path:
+            raise ValueError("LIVE_QUOTES_SOURCE=replay 에는 LIVE_QUOTES_REPLAY_FILE(녹화된 시세 CSV 경로) 설정이 필요합니다")
+        history = pd.read_csv(path, header=[0, 1], index_col=0, parse_dates=True)
+        return cls(history)
+
+    def __call__(self, symbols):
+        if self._cursor >= len(self.history):
+            self._cursor = 1
+        frame = self.history.iloc[max(0, self._cursor - self.window):self._cursor + 1]
+        self._cursor += 1
+        frame = frame.loc[:, frame.columns.get_level_values(0).isin(symbols)]
+        return _quotes_from_changes(compute_price_changes(frame, symbols))
+
+def _default_source():
+    if LIVE_QUOTES_SOURCE == "replay":
+        return ReplaySource.from_file()
+    return yfinance_source
+
+# ---------------------------------------------------------
+# delta 계산 / SSE 인코딩
+# ---------------------------------------------------------
+def compute_delta(previous, current, symbols):
+    """
+    이전 tick 대비 변경분
+    - changed: 값이 달라졌거나 새로 생긴 티커 / removed: 감시 목록에서 빠진 티커
+    - 이번 tick에 조회 실패한 티커는 마지막 값을 유지 (removed로 보지 않음)
+    """
+    changed = {symbol: quote for symbol, quote in current.items() if previous.get(symbol) != quote}
+    removed = [symbol for symbol in previous if symbol not in symbols]
+    return changed, removed
+
+def encode_event(event, data, event_id=None):
+    """SSE 메시지 1개 -> bytes (접속자 수와 관계없이 tick당 1번만 직렬화)"""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\n".encode("utf-8") + b"data: " + orjson.dumps(data) + b"\n\n"
+
+HEARTBEAT = b": ping\n\n"
+
+# ---------------------------------------------------------
+# 브로드캐스터 (폴러 1개 -> 접속자별 큐)
+# ---------------------------------------------------------
+class QuoteBroadcaster:
+    def __init__(self, source=None):
+        self.source = source
+        self._subscribers = set()
+        self._quotes = {}          # 마지막 tick 기준 전체 시세
+        self._labels = {}          # 티커 -> 표시명
+        self._seq = 0
+        self._updated_at = None
+        self._task = None
+
+    def set_source(self, source):
+        """시세 소스 교체 (None이면 LIVE_QUOTES_SOURCE 기본값) - 이전 소스 값이 섞이지 않도록 상태 초기화"""
+        self.source = source
+        self._quotes = {}
+        self._seq = 0
+
+    def snapshot_event(self):
+        return encode_event("snapshot", {
+            "seq": self._seq,
+            "updated_at": self._updated_at,
+            "labels": self._labels,
+            "quotes": self._quotes,
+        }, self._seq)
+
+    def subscribe(self):
+        """접속자 큐 등록 (현재 전체 시세를 먼저 넣어줌) + 폴러가 없으면 시작"""
+        queue = asyncio.Queue(maxsize=LIVE_QUOTES_QUEUE_SIZE)
+        if self._quotes:
+            queue.put_nowait(self.snapshot_event())
+        self._subscribers.add(queue)
+        LIVE_SUBSCRIBERS.set(len(self._subscribers))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll_loop())
+        return queue
+
+    def unsubscribe(self, queue):
+        """접속 종료 -> 마지막 접속자였으면 폴링 중지"""
+        self._subscribers.discard(queue)
+        LIVE_SUBSCRIBERS.set(len(self._subscribers))
+        if not self._subscribers and self._task and not self._task.done():
+            self._task.cancel()
+
+    def _broadcast(self, message):
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # 느린 접속자: 밀린 delta를 버리고 전체 시세로 다시 맞춤
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self.snapshot_event())
+
+    async def tick(self):
+        """시세 1회 조회 -> 변경분이 있으면 delta 전송 (변경 없으면 전송 안 함)"""
+        tickers = load_watchlist("briefing_index", default=DEFAULT_TICKERS)
+        symbols = [s for s in tickers.values() if s != "KRW=X"]
+        try:
+            # 소스 설정 오류(replay 파일 미설정 등)도 폴러를 멈추지 않고 tick마다 오류로 기록
+            if self.source is None:
+                self.source = _default_source()
+            current = await asyncio.to_thread(self.source, symbols)
+        except Exception as e:
+            record_error("live_quotes")
+            print(f"⚠️ Live Quote Error: {e}")
+            return False
+
+        with stage_timer("live_quote_delta"):
+            changed, removed = compute_delta(self._quotes, current, set(symbols))
+            self._labels = {symbol: name for name, symbol in tickers.items() if symbol in symbols}
+            if not changed and not removed:
+                return False
+
+            for symbol in removed:
+                del self._quotes[symbol]
+            self._quotes.update(changed)
+            self._seq += 1
+            self._updated_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            message = encode_event("delta", {
+                "seq": self._seq,
+                "updated_at": self._updated_at,
+                "quotes": changed,
+                "removed": removed,
+            }, self._seq)
+        self._broadcast(message)
+        return True
+
+    async def _poll_loop(self):
+        while True:
+            started = time.monotonic()
+            await self.tick()
+            await asyncio.sleep(max(LIVE_QUOTES_POLL_SEC - (time.monotonic() - started), 0))
+
+    async def stream(self):
+        """접속자 1명용 SSE 바이트 제너레이터 (HEARTBEAT 주기로 연결 유지용 주석 전송)"""
+        queue = self.subscribe()
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), LIVE_QUOTES_HEARTBEAT_SEC)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+        finally:
+            self.unsubscribe(queue)
+
+    async def stop(self):
+        """앱 lifespan 종료 시 호출"""
+        task, self._task = self._task, None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+broadcaster = QuoteBroadcaster()
+
+def set_quote_source(source):
+    """시세 소스 교체 (테스트 / 재생용, None이면 기본값)"""
+    broadcaster.set_source(source)
+
+def stream_quote_events():
+    return broadcaster.stream()
+
+async def stop_quote_stream():
+    await broadcaster.stop()
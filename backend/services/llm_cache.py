@@ -0,0 +1,83 @@
+# backend/services/llm_cache.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from services.local_store import data_path, load_json, save_json
+
+# LLM 응답 캐시 설정 (같은 모델 + 프롬프트 + 기사 묶음이면 재호출 없이 재사용)
+LLM_CACHE_TTL_SEC = int(os.getenv("LLM_CACHE_TTL_SEC", str(12 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "200"))
+TRANSLATION_MAX_ENTRIES = int(os.getenv("LLM_TRANSLATION_MAX_ENTRIES", "5000"))
+
+_translation_lock = threading.Lock()
+
+def make_cache_key(*parts):
+    """모델/프롬프트/입력 등을 합쳐 sha256 키 생성"""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _entry_path(key):
+    return data_path("llm_cache", "responses", f"{key}.json")
+
+def get_cached_response(key):
+    """TTL 안의 캐시 응답 반환 (없거나 만료면 None)"""
+    entry = load_json(_entry_path(key), default=None)
+    if not entry:
+        return None
+    if time.time() - entry.get("created_at", 0) > LLM_CACHE_TTL_SEC:
+        return None
+    try:
+        os.utime(_entry_path(key))  # 최근 사용 시각 갱신 -> 개수 초과 시 가장 오래 안 쓴 항목부터 삭제 (LRU)
+    except OSError:
+        pass
+    return entry.get("value")
+
+def put_cached_response(key, value):
+    """응답 저장 + 최대 개수 초과 시 가장 오래 안 쓴 항목부터 삭제 (TTL은 생성 시각 기준)"""
+    save_json(_entry_path(key), {"created_at": time.time(), "value": value})
+    _evict_responses()
+
+def _evict_responses():
+    directory = os.path.dirname(_entry_path("x"))
+    try:
+        entries = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".json")]
+    except OSError:
+        return
+
+    now_ts = time.time()
+    entries.sort(key=os.path.getmtime)
+    overflow = len(entries) - LLM_CACHE_MAX_ENTRIES
+    for i, path in enumerate(entries):
+        if i < overflow or now_ts - os.path.getmtime(path) > LLM_CACHE_TTL_SEC:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+# ---------------------------------------------------------
+# 헤드라인 번역 메모리 (원문 제목 -> 한국어 제목, 실행 간 유지)
+# ---------------------------------------------------------
+def _translation_path():
+    return data_path("llm_cache", "headline_translations.json")
+
+def get_translations(titles):
+    """저장된 번역 조회 -> {원문: 번역} (없는 제목은 빠짐)"""
+    memory = load_json(_translation_path(), default={}) or {}
+    return {t: memory[t] for t in titles if t in memory}
+
+def remember_translations(pairs):
+    """번역 저장 (최근 TRANSLATION_MAX_ENTRIES개만 유지)"""
+    if not pairs:
+        return
+    with _translation_lock:
+        memory = load_json(_translation_path(), default={}) or {}
+        for original, translated in pairs.items():
+            memory.pop(original, None)
+            memory[original] = translated
+        if len(memory) > TRANSLATION_MAX_ENTRIES:
+            memory = dict(list(memory.items())[-TRANSLATION_MAX_ENTRIES:])
+        save_json(_translation_path(), memory)
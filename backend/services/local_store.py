@@ -0,0 +1,50 @@
+# backend/services/local_store.py
+
+import json
+import os
+import tempfile
+
+# 로컬 데이터 저장 위치 (캐시, 관측치 등) - 환경변수로 변경 가능
+DATA_DIR = os.getenv("REPORTER_DATA_DIR", os.path.join(os.path.dirname(__file__), "../data"))
+
+def data_path(*parts):
+    """DATA_DIR 하위 경로 생성 (상위 폴더 자동 생성)"""
+    path = os.path.join(DATA_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+def load_json(path, default=None):
+    """JSON 파일 읽기 (없거나 깨졌으면 default)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+    except Exception as e:
+        print(f"Local Store Read Error ({path}): {e}")
+        return default
+
+def _atomic_write(path, write, binary=False):
+    """임시 파일(mkstemp, 호출마다 고유 이름)에 write(f) 후 교체 -> 동시 실행 / 쓰는 도중 종료돼도 파일 깨짐 방지"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with (os.fdopen(fd, "wb") if binary else os.fdopen(fd, "w", encoding="utf-8")) as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Local Store Write Error ({path}): {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def save_json(path, data):
+    """JSON 파일 쓰기 (임시 파일 작성 후 교체)"""
+    _atomic_write(path, lambda f: json.dump(data, f, ensure_ascii=False))
+
+def save_text(path, text):
+    """텍스트(HTML 등) 파일 쓰기 (임시 파일 작성 후 교체)"""
+    _atomic_write(path, lambda f: f.write(text))
+
+def save_bytes(path, content):
+    """바이너리(이미지 등) 파일 쓰기 (임시 파일 작성 후 교체)"""
+    _atomic_write(path, lambda f: f.write(content), binary=True)
@@ -0,0 +1,196 @@
+# backend/services/market_calendar.py
+
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+# 미국 증시(NYSE) 거래일 캘린더
+# - 휴장일 규칙으로 CALENDAR_START_YEAR ~ CALENDAR_END_YEAR 전체를 처음 사용할 때 한 번만 계산
+# - 이후 '거래일 여부' / '직전 거래일' 조회는 날짜 번호(ordinal)로 배열을 바로 읽는 O(1)
+
+NY_TZ = ZoneInfo('America/New_York')
+
+CALENDAR_START_YEAR = 2000
+CALENDAR_END_YEAR = 2100
+MARKET_CLOSE = time(16, 0)
+EARLY_CLOSE = time(13, 0)   # 독립기념일 전날 / 추수감사절 다음날 / 크리스마스 이브
+
+# 규칙으로 계산할 수 없는 임시 휴장일 (국장일, 천재지변 등) + 환경변수로 추가 (콤마 구분 YYYY-MM-DD)
+SPECIAL_CLOSURES = {
+    date(2001, 9, 11): "9/11 Attacks", date(2001, 9, 12): "9/11 Attacks",
+    date(2001, 9, 13): "9/11 Attacks", date(2001, 9, 14): "9/11 Attacks",
+    date(2004, 6, 11): "National Day of Mourning (Reagan)",
+    date(2007, 1, 2): "National Day of Mourning (Ford)",
+    date(2012, 10, 29): "Hurricane Sandy", date(2012, 10, 30): "Hurricane Sandy",
+    date(2018, 12, 5): "National Day of Mourning (G.H.W. Bush)",
+    date(2025, 1, 9): "National Day of Mourning (Carter)",
+}
+for _value in filter(None, (v.strip() for v in os.getenv("MARKET_EXTRA_HOLIDAYS", "").split(","))):
+    SPECIAL_CLOSURES[date.fromisoformat(_value)] = "Special Closure"
+
+def _nth_weekday(year, month, weekday, n):
+    """month의 n번째 weekday (n=-1이면 마지막)"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = (date(year, month + 1, 1) if month < 12 else date(year + 1, 1, 1)) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+def _easter(year):
+    """부활절 (Anonymous Gregorian algorithm)"""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+def _observed(day):
+    """토요일 휴일 -> 금요일, 일요일 휴일 -> 월요일"""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+def nyse_holidays(year):
+    """연도의 NYSE 정규 휴장일 -> {date: 이름}"""
+    holidays = {}
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:  # 1/1이 토요일이면 전년도 12/31(금)은 휴장하지 않음
+        holidays[_observed(new_year)] = "New Year's Day"
+    holidays[_nth_weekday(year, 1, 0, 3)] = "Martin Luther King Jr. Day"
+    holidays[_nth_weekday(year, 2, 0, 3)] = "Washington's Birthday"
+    holidays[_easter(year) - timedelta(days=2)] = "Good Friday"
+    holidays[_nth_weekday(year, 5, 0, -1)] = "Memorial Day"
+    if year >= 2022:
+        holidays[_observed(date(year, 6, 19))] = "Juneteenth"
+    holidays[_observed(date(year, 7, 4))] = "Independence Day"
+    holidays[_nth_weekday(year, 9, 0, 1)] = "Labor Day"
+    holidays[_nth_weekday(year, 11, 3, 4)] = "Thanksgiving Day"
+    holidays[_observed(date(year, 12, 25))] = "Christmas Day"
+    return holidays
+
+def _early_closes(year):
+    """13시 조기 폐장일"""
+    days = {_nth_weekday(year, 11, 3, 4) + timedelta(days=1)}      # 추수감사절 다음날
+    july_3 = date(year, 7, 3)
+    if july_3.weekday() < 4:                                        # 7/4가 화~금인 해의 7/3 (월~목)
+        days.add(july_3)
+    christmas_eve = date(year, 12, 24)
+    if christmas_eve.weekday() < 4:                                 # 12/24가 월~목
+        days.add(christmas_eve)
+    return days
+
+class _SessionIndex:
+    """날짜 ordinal -> 거래일 여부 / 직전 거래일 배열 (1회 계산)"""
+
+    def __init__(self, start_year, end_year):
+        self.start = date(start_year, 1, 1)
+        self.end = date(end_year, 12, 31)
+        self.base = self.start.toordinal()
+        size = self.end.toordinal() - self.base + 1
+
+        self.holidays = {}
+        early = set()
+        for year in range(start_year, end_year + 1):
+            self.holidays.update(nyse_holidays(year))
+            early |= _early_closes(year)
+        self.holidays.update(SPECIAL_CLOSURES)
+
+        self.is_session = bytearray(size)
+        self.prev_session = [-1] * size     # 해당 날짜 '이전'의 마지막 거래일 ordinal (없으면 -1)
+        self.early_close = bytearray(size)
+        last = -1
+        for offset in range(size):
+            self.prev_session[offset] = last
+            day = date.fromordinal(self.base + offset)
+            if day.weekday() < 5 and day not in self.holidays:
+                self.is_session[offset] = 1
+                self.early_close[offset] = day in early
+                last = self.base + offset
+
+    def offset(self, day):
+        offset = day.toordinal() - self.base
+        if not 0 <= offset < len(self.is_session):
+            raise ValueError(f"캘린더 범위 밖 날짜: {day} ({self.start} ~ {self.end})")
+        return offset
+
+_index = None
+
+def _get_index():
+    global _index
+    if _index is None:
+        _index = _SessionIndex(CALENDAR_START_YEAR, CALENDAR_END_YEAR)
+    return _index
+
+def _to_date(value):
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+def is_session(day):
+    """거래일(정규장 개장일) 여부 (date / datetime / 'YYYY-MM-DD')"""
+    index = _get_index()
+    return bool(index.is_session[index.offset(_to_date(day))])
+
+def previous_session(day):
+    """day '이전'의 마지막 거래일 (day 자신은 제외)"""
+    index = _get_index()
+    ordinal = index.prev_session[index.offset(_to_date(day))]
+    return date.fromordinal(ordinal) if ordinal >= 0 else None
+
+def session_on_or_before(day):
+    """day가 거래일이면 day, 아니면 직전 거래일"""
+    day = _to_date(day)
+    return day if is_session(day) else previous_session(day)
+
+def next_session(day):
+    """day '이후'의 첫 거래일"""
+    day = _to_date(day) + timedelta(days=1)
+    while not is_session(day):
+        day += timedelta(days=1)
+    return day
+
+def holiday_name(day):
+    """휴장일 이름 (주말 / 거래일이면 None)"""
+    return _get_index().holidays.get(_to_date(day))
+
+def close_time(day):
+    """거래일의 정규장 마감 시각 (뉴욕 시간, 조기 폐장일은 13:00 / 휴장일이면 None)"""
+    index = _get_index()
+    offset = index.offset(_to_date(day))
+    if not index.is_session[offset]:
+        return None
+    return EARLY_CLOSE if index.early_close[offset] else MARKET_CLOSE
+
+def current_trade_date(now=None):
+    """
+    리포트 대상 미국 거래일 (뉴욕 시간 기준) -> 'YYYY-MM-DD'
+    - 오늘이 거래일이고 장 마감(조기 폐장일은 13시) 이후면 오늘, 아니면 직전 거래일
+    - 주말 / 휴장일에는 직전 거래일 그대로 -> 같은 브리핑 / 스냅샷 재사용
+    """
+    now_et = (now or datetime.now(timezone.utc)).astimezone(NY_TZ)
+    today = now_et.date()
+    closes_at = close_time(today)
+    if closes_at is not None and now_et.time() >= closes_at:
+        return today.strftime("%Y-%m-%d")
+    return previous_session(today).strftime("%Y-%m-%d")
+
+def session_mask(index, end=None):
+    """DatetimeIndex 중 거래일(이면서 end 이하)인 날짜 -> bool 배열 (휴장일에 생긴 시세 행 제외용)"""
+    cal = _get_index()
+    end_ordinal = _to_date(end).toordinal() if end is not None else None
+    mask = []
+    for ts in index:
+        ordinal = ts.toordinal()
+        offset = ordinal - cal.base
+        ok = 0 <= offset < len(cal.is_session) and bool(cal.is_session[offset])
+        mask.append(ok and (end_ordinal is None or ordinal <= end_ordinal))
+    return mask
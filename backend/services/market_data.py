@@ -0,0 +1,313 @@
+# backend/services/market_data.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from services.market_calendar import current_trade_date, session_mask
+from services.metrics import record_cache, record_error, upstream_timer
+
+# 무거운 라이브러리(pandas/yfinance 등)는 첫 사용 시점에 import (cold start 단축)
+
+# 시세 캐시 설정 (n8n 재시도 / 여러 엔드포인트 연속 호출 시 같은 데이터 재다운로드 방지)
+CACHE_TTL_SEC = int(os.getenv("MARKET_CACHE_TTL_SEC", "300"))
+CACHE_MAX_ENTRIES = int(os.getenv("MARKET_CACHE_MAX_ENTRIES", "512"))
+
+# 대량 다운로드 설정 (watchlist가 수천 개 티커로 커져도 한 번에 거대한 요청을 보내지 않도록)
+DOWNLOAD_CHUNK_SIZE = int(os.getenv("MARKET_DOWNLOAD_CHUNK_SIZE", "50"))
+DOWNLOAD_MAX_CALLS = int(os.getenv("MARKET_DOWNLOAD_MAX_CALLS", "4"))   # 동시에 진행하는 청크 다운로드 수 (프로세스 전체)
+DOWNLOAD_RETRIES = int(os.getenv("MARKET_DOWNLOAD_RETRIES", "1"))
+DOWNLOAD_TIMEOUT_SEC = int(os.getenv("MARKET_DOWNLOAD_TIMEOUT_SEC", "15"))
+
+# 청크 다운로드는 동시에 진행 (프로세스 전체 동시 호출 수만 제한)
+_download_slots = threading.BoundedSemaphore(DOWNLOAD_MAX_CALLS)
+# yf.download는 모듈 전역 상태(shared._DFS)를 매 호출마다 초기화 -> 호출끼리 겹치면 결과가 섞이므로 직렬화
+_yfinance_lock = threading.Lock()
+# (symbol, period) 키를 고정 개수 lock에 나눠 담음 (striped lock): 같은 티커를 동시에 요청하면 1번만 다운로드
+# - 키마다 lock을 만들지 않으므로 요청한 티커 수와 관계없이 메모리 일정
+KEY_LOCK_STRIPES = 64
+_key_locks = [threading.Lock() for _ in range(KEY_LOCK_STRIPES)]
+
+# 주말 / 휴장일에도 거래되는 티커 (NYSE 거래일 기준으로 자르지 않고 최신 시세 사용)
+ALWAYS_OPEN_SYMBOLS = {"BTC-USD", "ETH-USD"}
+
+# 시세 원본 조회 함수 (None이면 yfinance / 벤치마크·재생용으로 set_price_fetcher()로 교체)
+_price_fetcher = None
+
+# (symbol, period) -> (저장 시각, 해당 티커 DataFrame) / 가장 최근에 쓴 항목이 맨 뒤 (LRU)
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _split_by_ticker(df, symbols):
+    """yf.download(group_by='ticker') 결과를 티커별 DataFrame으로 분리"""
+    import pandas as pd
+
+    frames = {}
+    if df is None or df.empty:
+        return frames
+
+    if isinstance(df.columns, pd.MultiIndex):
+        available = set(df.columns.get_level_values(0))
+        for symbol in symbols:
+            if symbol in available:
+                frame = df[symbol].dropna(how="all")
+                if not frame.empty:
+                    frames[symbol] = frame
+    elif len(symbols) == 1:
+        # 단일 티커 + 단일 레벨 컬럼인 경우
+        frames[symbols[0]] = df.dropna(how="all")
+    return frames
+
+def set_price_fetcher(fetcher):
+    """
+    시세 원본 조회 함수 교체 (None이면 기본 yfinance로 복귀)
+    - fetcher(symbols, period) -> yf.download(group_by='ticker')와 같은 형태의 DataFrame
+    - 캐시는 비움 (이전 소스의 데이터가 섞이지 않도록)
+    """
+    global _price_fetcher
+    _price_fetcher = fetcher
+    clear_cache()
+
+def _yfinance_fetch(symbols, period):
+    """
+    기본 시세 조회: 청크 1개를 yf.download 1회로 조회 (threads=False -> 티커를 순서대로 요청해서 요청 폭주 방지)
+    - 전역 상태 충돌을 막기 위해 yf.download 호출만 _yfinance_lock으로 직렬화
+    """
+    import yfinance as yf
+
+    with _yfinance_lock:
+        return yf.download(
+            symbols, period=period, group_by='ticker', threads=False, progress=False,
+            auto_adjust=False, timeout=DOWNLOAD_TIMEOUT_SEC
+        )
+
+def _yf_download(symbols, period):
+    """시세 조회 1회 호출 (동시 호출 수는 DOWNLOAD_MAX_CALLS로 제한)"""
+    fetcher = _price_fetcher or _yfinance_fetch
+    with _download_slots, upstream_timer("yfinance"):
+        df = fetcher(symbols, period)
+    return _split_by_ticker(df, symbols)
+
+def _download_chunk(idx, total, chunk, period):
+    try:
+        return _yf_download(chunk, period)
+    except Exception as e:
+        record_error("yfinance")
+        print(f"⚠️ 청크 다운로드 실패 ({idx}/{total}, {len(chunk)}개): {e}")
+        return {}
+
+def _download(symbols, period):
+    """
+    대량 티커 분할 다운로드
+    1) DOWNLOAD_CHUNK_SIZE개씩 나눈 청크를 최대 DOWNLOAD_MAX_CALLS개까지 동시에 조회 (청크 1개 = 시세 조회 1회)
+    2) 실패한 청크 / 결과에서 빠진 티커는 티커별로 개별 재시도 (최대 DOWNLOAD_RETRIES회)
+    3) 부분 결과를 합쳐서 반환 (끝까지 실패한 티커만 빠짐)
+    """
+    frames = {}
+    chunks = [symbols[i:i + DOWNLOAD_CHUNK_SIZE] for i in range(0, len(symbols), DOWNLOAD_CHUNK_SIZE)]
+
+    if len(chunks) == 1:
+        frames.update(_download_chunk(1, 1, chunks[0], period))
+    else:
+        with ThreadPoolExecutor(max_workers=min(DOWNLOAD_MAX_CALLS, len(chunks))) as pool:
+            results = pool.map(
+                lambda item: _download_chunk(item[0], len(chunks), item[1], period), enumerate(chunks, start=1)
+            )
+            for result in results:
+                frames.update(result)
+
+    failed = [s for s in symbols if s not in frames]
+    for attempt in range(1, DOWNLOAD_RETRIES + 1):
+        if not failed:
+            break
+        print(f"🔁 개별 재시도 {attempt}/{DOWNLOAD_RETRIES}: {len(failed)}개")
+        for symbol in failed:
+            try:
+                frames.update(_yf_download([symbol], period))
+            except Exception as e:
+                record_error("yfinance")
+                print(f"⚠️ {symbol} 다운로드 실패: {e}")
+        failed = [s for s in failed if s not in frames]
+
+    if failed:
+        print(f"❌ 최종 다운로드 실패 티커: {failed}")
+    return frames
+
+def _cache_get(key, now_ts):
+    """유효한(TTL 이내) 캐시 항목 반환 + LRU 순서 갱신 (lock 안에서 호출)"""
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    stored_at, frame = entry
+    if now_ts - stored_at > CACHE_TTL_SEC:
+        del _cache[key]
+        return None
+    _cache.move_to_end(key)
+    return frame
+
+def _cache_put(key, frame, now_ts):
+    """캐시 저장 + 최대 개수 초과 시 가장 오래 안 쓴 항목부터 제거 (lock 안에서 호출)"""
+    _cache[key] = (now_ts, frame)
+    _cache.move_to_end(key)
+    while len(_cache) > CACHE_MAX_ENTRIES:
+        _cache.popitem(last=False)
+
+def _cached_frames(symbols, period):
+    """캐시에 있는(TTL 이내) 티커 -> {symbol: DataFrame}"""
+    frames = {}
+    with _cache_lock:
+        now_ts = time.time()
+        for symbol in symbols:
+            frame = _cache_get((symbol, period), now_ts)
+            if frame is not None:
+                frames[symbol] = frame
+    return frames
+
+def _download_and_cache(symbols, period):
+    downloaded = _download(symbols, period)
+    with _cache_lock:
+        now_ts = time.time()
+        for symbol, frame in downloaded.items():
+            _cache_put((symbol, period), frame, now_ts)
+    return downloaded
+
+def _hold_key_locks(stack, symbols, period):
+    """
+    (symbol, period)가 속한 striped lock 획득 (중복 제거 + 번호 순서로 잡아서 교착 방지)
+    - 겹치는 티커가 없는 요청끼리는 (같은 칸에 걸리지 않는 한) 서로 기다리지 않음
+    """
+    stripes = sorted({hash((symbol, period)) % KEY_LOCK_STRIPES for symbol in symbols})
+    for stripe in stripes:
+        stack.enter_context(_key_locks[stripe])
+
+def get_price_frames(symbols, period="5d"):
+    """
+    티커 목록의 시세 DataFrame 반환 (yf.download(group_by='ticker')와 같은 MultiIndex 형태)
+    - 캐시에 없거나 TTL이 지난 티커만 다운로드
+    - 다른 요청이 같은 티커를 다운로드 중이면 끝날 때까지 기다렸다가 그 결과(캐시)를 사용
+    - 다운로드 실패한 티커는 결과에서 빠짐 (호출부에서 KeyError 처리)
+    """
+    symbols = list(dict.fromkeys(symbols))
+    frames = _cached_frames(symbols, period)
+
+    missing = [s for s in symbols if s not in frames]
+    record_cache("price", "hit", len(frames))
+    if missing:
+        with ExitStack() as stack:
+            _hold_key_locks(stack, missing, period)
+            # lock을 기다리는 동안 다른 요청이 받아둔 티커는 다시 받지 않음
+            coalesced = _cached_frames(missing, period)
+            frames.update(coalesced)
+            missing = [s for s in missing if s not in coalesced]
+            record_cache("price", "coalesced", len(coalesced))
+            record_cache("price", "miss", len(missing))
+            if missing:
+                print(f"📥 시세 다운로드 ({period}): {missing} (캐시 적중 {len(frames)}/{len(symbols)})")
+                frames.update(_download_and_cache(missing, period))
+
+    return _concat_frames(frames, symbols)
+
+def refresh_price_frames(symbols, period="5d"):
+    """
+    캐시를 건너뛰고 바로 다시 다운로드 + 캐시 갱신 (실시간 시세 폴러용)
+    - 다른 엔드포인트도 갱신된 캐시를 그대로 사용 (갱신 중에 들어온 같은 티커 요청은 끝날 때까지 대기)
+    """
+    symbols = list(dict.fromkeys(symbols))
+    record_cache("price", "refresh", len(symbols))
+    with ExitStack() as stack:
+        _hold_key_locks(stack, symbols, period)
+        downloaded = _download_and_cache(symbols, period)
+    return _concat_frames(downloaded, symbols)
+
+def _concat_frames(frames, symbols):
+    """티커별 DataFrame -> 요청 순서대로 합친 MultiIndex DataFrame"""
+    import pandas as pd
+
+    ordered = {s: frames[s] for s in symbols if s in frames}
+    if not ordered:
+        return pd.DataFrame()
+    return pd.concat(ordered, axis=1)
+
+def clear_cache():
+    """캐시 전체 비우기"""
+    with _cache_lock:
+        _cache.clear()
+
+def _select_field(df, field):
+    """MultiIndex(ticker, field) 프레임에서 특정 필드만 뽑아 (날짜 x 티커) 형태로 반환"""
+    mask = df.columns.get_level_values(1).str.lower() == field
+    sub = df.loc[:, mask]
+    sub.columns = sub.columns.get_level_values(0)
+    return sub.loc[:, ~sub.columns.duplicated()]
+
+def get_close_frame(df):
+    """종가 (날짜 x 티커) 프레임 - 'Close'가 없으면 'Adj Close'로 보완"""
+    import pandas as pd
+
+    if df is None or df.empty or not isinstance(df.columns, pd.MultiIndex):
+        return pd.DataFrame()
+    close = _select_field(df, "close")
+    adj_close = _select_field(df, "adj close")
+    if close.empty:
+        return adj_close.astype(float)
+    if not adj_close.empty:
+        close = close.combine_first(adj_close)
+    return close.astype(float)
+
+def compute_price_changes(df, symbols=None):
+    """
+    전체 티커의 등락 한 번에 계산 (벡터 연산)
+    - 티커별로 '마지막 유효 종가'와 '그 직전 유효 종가'를 비교
+      (BTC처럼 주말에도 거래되는 티커와 주식 지수의 거래일 차이로 생기는 NaN 구간 처리)
+    - 반환: index=티커, columns=[last_close, prev_close, change, change_pct, last_date]
+      (데이터가 없는 티커는 NaN 행 / 유효 종가가 1개뿐이면 prev_close = last_close)
+    """
+    import pandas as pd
+
+    close = get_close_frame(df)
+    columns = ["last_close", "prev_close", "change", "change_pct", "last_date"]
+    if close.empty:
+        return pd.DataFrame(index=pd.Index(symbols or [], name="symbol"), columns=columns, dtype=float)
+
+    valid = close.notna()
+    valid_count = valid.sum()
+    order = valid.cumsum()                      # 티커별 유효 종가 순번 (1부터)
+
+    is_last = valid & order.eq(valid_count)
+    is_prev = valid & order.eq(valid_count - 1)
+
+    last_close = close.where(is_last).max()
+    prev_close = close.where(is_prev).max().fillna(last_close)
+    last_date = is_last.idxmax().where(valid_count > 0)
+
+    change = last_close - prev_close
+    change_pct = (change / prev_close.where(prev_close != 0) * 100).fillna(0.0).where(last_close.notna())
+
+    result = pd.DataFrame({
+        "last_close": last_close,
+        "prev_close": prev_close,
+        "change": change,
+        "change_pct": change_pct,
+        "last_date": last_date,
+    })
+    result.index.name = "symbol"
+    if symbols is not None:
+        result = result.reindex(list(symbols))
+    return result
+
+def session_price_changes(df, symbols, trade_date=None):
+    """
+    대상 거래일 기준 등락 (직전 거래일 종가 대비)
+    - 휴장일에 생긴 시세 행 / 대상 거래일 이후 행(장중 부분 봉 등)은 제외하고 계산
+    - ALWAYS_OPEN_SYMBOLS는 전체 행 기준 (마지막 시세 vs 그 직전 시세)
+    """
+    if df.empty:
+        return compute_price_changes(df, symbols)
+    changes = compute_price_changes(df.loc[session_mask(df.index, trade_date or current_trade_date())], symbols)
+    always_open = [s for s in symbols if s in ALWAYS_OPEN_SYMBOLS]
+    if always_open:
+        changes.loc[always_open] = compute_price_changes(df, always_open)
+    return changes
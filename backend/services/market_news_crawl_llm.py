@@ -1,14 +1,22 @@
-# backend/services/market_new_crawl.py
+# backend/services/market_news_crawl_llm.py
 
-import feedparser
+import asyncio
+import hashlib
 import os
-from openai import OpenAI
+import xml.etree.ElementTree as ET
 from dotenv import load_dotenv
 import json
 import re
+import time
 from html import unescape
-from datetime import datetime
-import pytz
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from services.http_client import get_client
+from services.llm_cache import get_cached_response, get_translations, make_cache_key, put_cached_response, remember_translations
+from services.local_store import data_path, load_json, save_json
+from services.metrics import STAGE_LATENCY, record_cache, record_error, upstream_timer
+from services.single_flight import single_flight
 
 load_dotenv()
 
@@ -16,26 +24,30 @@ load_dotenv()
 # 2. Positive Filter 강화: 지수명 + 마감키워드(Close/Ends) 필수 포함(AND)
 # 3. 시간 단축: when:12h (최근 12시간)으로 설정하여 '어제 아침' 뉴스 배제
 
+# 뉴스 RSS / LLM API 주소 (벤치마크 stub 서버 등으로 바꿀 수 있도록 환경변수 지원)
+NEWS_RSS_BASE_URL = os.getenv("NEWS_RSS_BASE_URL", "https://news.google.com")
+UPSTAGE_BASE_URL = os.getenv("UPSTAGE_BASE_URL", "https://api.upstage.ai/v1/solar")
+
 TRACKS = [
     {
         # [Track A] 장 마감 시황 (Market Wrap)
         # S&P 500 또는 Nasdaq이 제목에 꼭 있어야 하고, 'Close'나 'Wrap' 같은 마감 단어가 필수
         "name": "Track A: Market Wrap (현상)",
-        "url": 'https://news.google.com/rss/search?q=("S%26P+500"+OR+"Nasdaq")+AND+("close"+OR+"ends"+OR+"settles"+OR+"wrap")+when:12h&hl=en-US&gl=US&ceid=US:en',
+        "url": NEWS_RSS_BASE_URL + '/rss/search?q=("S%26P+500"+OR+"Nasdaq")+AND+("close"+OR+"ends"+OR+"settles"+OR+"wrap")+when:12h&hl=en-US&gl=US&ceid=US:en',
         "limit": 2
     },
     {
         # [Track B] 등락 원인 (Why it moved)
         # "Stocks"나 "Wall Street"가 주어이고, 인과관계(due to, as)를 설명하는 기사
         "name": "Track B: Why it moved (원인)",
-        "url": 'https://news.google.com/rss/search?q=("US+stocks"+OR+"Wall+Street")+AND+("rise"+OR+"fall"+OR+"climb"+OR+"drop")+AND+("due+to"+OR+"as"+OR+"on")+when:12h&hl=en-US&gl=US&ceid=US:en',
+        "url": NEWS_RSS_BASE_URL + '/rss/search?q=("US+stocks"+OR+"Wall+Street")+AND+("rise"+OR+"fall"+OR+"climb"+OR+"drop")+AND+("due+to"+OR+"as"+OR+"on")+when:12h&hl=en-US&gl=US&ceid=US:en',
         "limit": 4
     },
     {
         # [Track C] 주도주 (Movers)
         # 'Active stocks' 등으로 검색하되, Track A/B에서 다룬 내용과 겹치지 않게 개별 종목 위주
         "name": "Track C: Active Movers (주도주)",
-        "url": 'https://news.google.com/rss/search?q=("S%26P+500"+OR+"Nasdaq")+AND+("biggest+movers"+OR+"active+stocks")+when:12h&hl=en-US&gl=US&ceid=US:en',
+        "url": NEWS_RSS_BASE_URL + '/rss/search?q=("S%26P+500"+OR+"Nasdaq")+AND+("biggest+movers"+OR+"active+stocks")+when:12h&hl=en-US&gl=US&ceid=US:en',
         "limit": 2
     }
 ]
@@ -50,15 +62,80 @@ def convert_pubdate_to_kst(pub_date_str):
     """RSS 날짜(GMT) -> KST 변환"""
     try:
         dt_obj = datetime.strptime(pub_date_str, "%a, %d %b %Y %H:%M:%S %Z")
-        dt_utc = dt_obj.replace(tzinfo=pytz.utc)
-        kst_tz = pytz.timezone('Asia/Seoul')
+        dt_utc = dt_obj.replace(tzinfo=timezone.utc)
+        kst_tz = ZoneInfo('Asia/Seoul')
         return dt_utc.astimezone(kst_tz).strftime("%Y-%m-%d %H:%M:%S KST")
     except Exception:
         return pub_date_str
 
-def get_market_news():
+# RSS 수집 설정
+RSS_TIMEOUT = 10             # 초 (커넥션 풀은 services.http_client 공유)
+
+def _rss_store_path(url, ext):
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return data_path("rss", f"{key}.{ext}")
+
+async def fetch_feed(url):
+    """
+    RSS 원문 가져오기 (ETag/Last-Modified 조건부 요청)
+    - 304면 디스크에 저장해둔 원문 재사용
+    - 반환: 피드 XML 파일 경로 (실패 시 None)
+    """
+    body_path = _rss_store_path(url, "xml")
+    meta_path = _rss_store_path(url, "json")
+    meta = load_json(meta_path, default={}) or {}
+
+    headers = {}
+    if os.path.exists(body_path):
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        with upstream_timer("rss"):
+            res = await get_client().get(url, headers=headers, timeout=RSS_TIMEOUT)
+        if res.status_code == 304:
+            record_cache("rss", "not_modified")
+            return body_path
+        res.raise_for_status()
+        record_cache("rss", "miss")
+
+        tmp_path = f"{body_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(res.content)
+        os.replace(tmp_path, body_path)
+        save_json(meta_path, {"url": url, "etag": res.headers.get("ETag"), "last_modified": res.headers.get("Last-Modified")})
+        return body_path
+    except Exception as e:
+        record_error("rss")
+        print(f"RSS Fetch Error ({url[:60]}...): {e}")
+        # 네트워크 실패 시 이전에 받아둔 원문이라도 사용
+        return body_path if os.path.exists(body_path) else None
+
+def iter_feed_entries(path):
+    """
+    RSS <item>을 하나씩 파싱해서 yield (필요한 개수만큼만 읽고 멈출 수 있음)
+    - 반환 항목: {"title", "link", "published", "description"}
+    """
+    for _, elem in ET.iterparse(path, events=("end",)):
+        if elem.tag != "item":
+            continue
+        link = (elem.findtext("link") or "").strip()
+        if link:
+            yield {
+                "title": (elem.findtext("title") or "").strip(),
+                "link": link,
+                "published": (elem.findtext("pubDate") or "").strip(),
+                "description": elem.findtext("description") or ""
+            }
+        elem.clear()
+
+@single_flight("market_news")
+async def get_market_news():
     """
     3-Track 전략 수집 (Positive Filter 적용)
+    - 트랙별 RSS는 공유 세션으로 병렬 요청, 파싱은 트랙 순서대로 limit 개수까지만
     """
     all_articles = []
     seen_links = set()
@@ -66,36 +143,47 @@ def get_market_news():
     print("🚀 3-Track 미국 증시 뉴스 크롤링 (Positive Filter)...")
 
     try:
-        for track in TRACKS:
-            feed = feedparser.parse(track["url"])
+        feed_paths = await asyncio.gather(*(fetch_feed(track["url"]) for track in TRACKS))
+
+        for track, feed_path in zip(TRACKS, feed_paths):
             count = 0
-            
-            for entry in feed.entries:
-                if count >= track["limit"]:
-                    break
-                
-                # 중복 URL 체크
-                if entry.link in seen_links:
-                    continue
-                seen_links.add(entry.link)
-                
-                # 날짜 변환
-                pub_date = entry.published if 'published' in entry else ""
-                kst_date = convert_pubdate_to_kst(pub_date)
-
-                # Description 전처리
-                raw_desc = entry.description if 'description' in entry else ""
-                clean_desc = clean_html(raw_desc)
-                summary_text = clean_desc if len(clean_desc) > 20 else entry.title
-
-                all_articles.append({
-                    "track": track["name"],
-                    "title": entry.title,
-                    "link": entry.link,
-                    "pub_date": kst_date,
-                    "summary_raw": summary_text
-                })
-                count += 1
+            if feed_path is None:
+                print(f"⚠️ {track['name']} - 피드 수집 실패")
+                continue
+
+            entries = iter_feed_entries(feed_path)
+            parse_start = time.perf_counter()
+            try:
+                for entry in entries:
+                    if count >= track["limit"]:
+                        break
+                    
+                    # 중복 URL 체크
+                    if entry["link"] in seen_links:
+                        continue
+                    seen_links.add(entry["link"])
+                    
+                    # 날짜 변환
+                    kst_date = convert_pubdate_to_kst(entry["published"])
+
+                    # Description 전처리
+                    clean_desc = clean_html(entry["description"])
+                    summary_text = clean_desc if len(clean_desc) > 20 else entry["title"]
+
+                    all_articles.append({
+                        "track": track["name"],
+                        "title": entry["title"],
+                        "link": entry["link"],
+                        "pub_date": kst_date,
+                        "summary_raw": summary_text
+                    })
+                    count += 1
+            except ET.ParseError as e:
+                record_error("rss")
+                print(f"RSS Parse Error ({track['name']}): {e}")
+            finally:
+                entries.close()
+                STAGE_LATENCY.observe(time.perf_counter() - parse_start, stage="rss_parse")
             
             print(f"✅ {track['name']} - {count}개 수집 완료")
 
@@ -103,38 +191,26 @@ def get_market_news():
             return {"status": "error", "message": "No news found"}
 
         # AI 분석 요청
-        ai_result = analyze_with_upstage_summary(all_articles)
+        ai_result = await analyze_with_upstage_summary(all_articles)
         
         return {
             "status": "success",
             "market_summary": ai_result.get("market_summary", "요약 생성 실패"),
+            "market_summary_en": ai_result.get("market_summary_en"),
             "news_list": ai_result.get("news_list", all_articles)
         }
 
     except Exception as e:
+        record_error("news")
         print(f"News Crawl Error: {e}")
         return {"status": "error", "message": str(e)}
 
-def analyze_with_upstage_summary(articles):
-    """
-    Upstage Solar API: 종합 요약 + 번역
-    """
-    api_key = os.getenv("UPSTAGE_API_KEY")
-    if not api_key:
-        print("⚠️ Upstage API Key missing")
-        return {"market_summary": "API Key 없음", "news_list": articles}
-
-    client = OpenAI(
-        api_key=api_key,
-        base_url="https://api.upstage.ai/v1/solar"
-    )
-
-    context_text = ""
-    for i, a in enumerate(articles):
-        context_text += f"[News {i+1}] ({a['track']}) - {a['pub_date']}\nTitle: {a['title']}\nContent: {a['summary_raw'][:300]}\n\n"
+# Upstage Solar 설정
+UPSTAGE_MODEL = "solar-1-mini-chat"
+UPSTAGE_TIMEOUT = 40  # 초
 
-    # [프롬프트] 'Market Close' 시점을 명시적으로 강조
-    system_prompt = """
+# [프롬프트] 'Market Close' 시점을 명시적으로 강조
+SYSTEM_PROMPT = """
     You are an expert AI Financial Analyst specializing in the US Stock Market. 
     Your goal is to write a 'Daily Market Briefing' for Korean investors.
 
@@ -142,54 +218,121 @@ def analyze_with_upstage_summary(articles):
     - Focus on the 'Market Close' results from the provided news.
     - Identify the primary reason for the market's movement (e.g., S&P 500 rose due to tech earnings).
     - Write a cohesive paragraph (3-4 sentences) **in Korean**.
+    - Also write the same paragraph in English ("market_summary_en") for English-language subscribers.
 
     Task 2: Headline Translation
-    - Translate the titles into professional Korean business language.
+    - Translate ONLY the titles listed under 'Titles to translate' into professional Korean business language.
+    - Keep "original_title" exactly as given. If the list is empty, return an empty "news_list".
 
     Output MUST be in JSON format:
     {
         "market_summary": "한국어 요약...",
+        "market_summary_en": "English summary...",
         "news_list": [
             {"korean_title": "...", "original_title": "..."}
         ]
     }
     """
 
+def _ai_translations(pending, ai_list):
+    """AI 번역 결과 -> {원문: 번역} (original_title로 매칭, 원문이 바뀌어 돌아오면 요청 순서로 매칭)"""
+    ai_list = [item for item in ai_list or [] if isinstance(item, dict)]
+    by_title = {item.get("original_title"): item.get("korean_title") for item in ai_list}
+    translations = {}
+    for i, title in enumerate(pending):
+        translated = by_title.get(title) or (ai_list[i].get("korean_title") if i < len(ai_list) else None)
+        if translated:
+            translations[title] = translated
+    return translations
+
+def _build_news_list(articles, translations=None):
+    """기사 목록 + 번역(번역 메모리 + 이번 AI 번역) -> 최종 뉴스 리스트 (번역이 없으면 원문 제목)"""
+    translations = translations or {}
+    final_news_list = []
+    
+    for article in articles:
+        final_news_list.append({
+            "title": translations.get(article["title"], article["title"]),
+            "original_title": article["title"],
+            "link": article["link"],
+            "track": article["track"],
+            "pub_date": article["pub_date"]
+        })
+    return final_news_list
+
+async def analyze_with_upstage_summary(articles):
+    """
+    Upstage Solar API: 종합 요약 + 번역
+    - (모델 + 프롬프트 + 기사 묶음) 해시로 응답 캐시 -> 같은 기사 묶음이면 API 호출 없이 반환
+    - 번역 메모리에 있는 헤드라인은 번역 요청에서 빼고(출력 토큰 절감) 메모리 값으로 채움
+      (새로 번역된 헤드라인은 메모리에 저장 -> 다음 실행 / AI 실패 시에도 재사용)
+    """
+    titles = list(dict.fromkeys(a["title"] for a in articles))
+    translations = get_translations(titles)
+    pending = [t for t in titles if t not in translations]
+    record_cache("headline_translation", "hit", len(translations))
+    record_cache("headline_translation", "miss", len(pending))
+
+    api_key = os.getenv("UPSTAGE_API_KEY")
+    if not api_key:
+        print("⚠️ Upstage API Key missing")
+        return {"market_summary": "API Key 없음", "news_list": _build_news_list(articles, translations)}
+
+    context_text = ""
+    for i, a in enumerate(articles):
+        context_text += f"[News {i+1}] ({a['track']}) - {a['pub_date']}\nTitle: {a['title']}\nContent: {a['summary_raw'][:300]}\n\n"
+    pending_text = "".join(f"[T{i+1}] {t}\n" for i, t in enumerate(pending)) or "(none)\n"
+    user_prompt = f"Here is the collected news data:\n{context_text}Titles to translate:\n{pending_text}"
+
+    cache_key = make_cache_key(UPSTAGE_MODEL, SYSTEM_PROMPT, user_prompt)
+    ai_data = get_cached_response(cache_key)
+    if ai_data is not None:
+        record_cache("llm_response", "hit")
+        print("⚡ Upstage 응답 캐시 적중 (API 호출 생략)")
+        return {
+            "market_summary": ai_data.get("market_summary", "-"),
+            "market_summary_en": ai_data.get("market_summary_en"),
+            "news_list": _build_news_list(articles, {**translations, **_ai_translations(pending, ai_data.get("news_list"))})
+        }
+
+    record_cache("llm_response", "miss")
+    from openai import AsyncOpenAI
+
+    client = AsyncOpenAI(
+        api_key=api_key,
+        base_url=UPSTAGE_BASE_URL,
+        http_client=get_client(),  # 공유 커넥션 풀 사용
+        timeout=UPSTAGE_TIMEOUT
+    )
+
     try:
-        response = client.chat.completions.create(
-            model="solar-1-mini-chat",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Here is the collected news data:\n{context_text}"}
-            ],
-            temperature=0.1
-        )
+        with upstream_timer("upstage"):
+            response = await client.chat.completions.create(
+                model=UPSTAGE_MODEL,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.1
+            )
         
         content = response.choices[0].message.content
         cleaned_content = content.replace("```json", "").replace("```", "").strip()
         ai_data = json.loads(cleaned_content)
         
-        final_news_list = []
-        ai_list = ai_data.get("news_list", [])
-        
-        for i, article in enumerate(articles):
-            korean_title = article["title"]
-            if i < len(ai_list):
-                korean_title = ai_list[i].get("korean_title", article["title"])
-            
-            final_news_list.append({
-                "title": korean_title,
-                "original_title": article["title"],
-                "link": article["link"],
-                "track": article["track"],
-                "pub_date": article["pub_date"]
-            })
+        new_translations = _ai_translations(pending, ai_data.get("news_list"))
+        final_news_list = _build_news_list(articles, {**translations, **new_translations})
+
+        put_cached_response(cache_key, ai_data)
+        remember_translations({k: v for k, v in new_translations.items() if v != k})
 
         return {
             "market_summary": ai_data.get("market_summary", "-"),
+            "market_summary_en": ai_data.get("market_summary_en"),
             "news_list": final_news_list
         }
 
     except Exception as e:
+        record_error("upstage")
         print(f"Upstage AI Logic Error: {e}")
-        return {"market_summary": "AI 분석 중 오류 발생", "news_list": articles}
\ No newline at end of file
+        return {"market_summary": "AI 분석 중 오류 발생", "news_list": _build_news_list(articles, translations)}
@@ -0,0 +1,233 @@
+# backend/services/metrics.py
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# 외부 의존성 없는 최소 Prometheus 지표 (text exposition format 0.0.4)
+# - 서비스 코드는 스레드(yfinance, asyncio.to_thread)와 이벤트 루프 양쪽에서 기록하므로 lock으로 보호
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# 프로파일링 (opt-in): PROFILING_ENABLED=1 일 때만 요청 단위 cProfile 허용
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+
+_registry = []
+_registry_lock = threading.Lock()
+_profile_lock = threading.Lock()  # cProfile은 동시에 하나만 켤 수 있음
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + list(extra or [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 라벨 {self.labelnames} 필요 (받은 값: {tuple(labels)})")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+class Gauge(_Metric):
+    """현재 값 (마지막 생성 시각 등)"""
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램 (_bucket / _sum / _count)"""
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry["counts"][i] += 1
+            entry["sum"] += value
+            entry["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """with 블록 소요시간 기록 (예외가 나도 기록)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            for key, entry in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, entry["counts"]):
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', _format_value(float(bound)))])} {count}")
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', '+Inf')])} {entry['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(entry['sum'])}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {entry['count']}")
+        return lines
+
+# ---------------------------------------------------------
+# 공용 지표
+# ---------------------------------------------------------
+UPSTREAM_LATENCY = Histogram(
+    "reporter_upstream_request_seconds", "외부 API 호출 소요시간", ["source"]
+)
+STAGE_LATENCY = Histogram(
+    "reporter_stage_seconds", "파싱/계산/렌더링 단계 소요시간", ["stage"]
+)
+SECTION_LATENCY = Histogram(
+    "reporter_briefing_section_seconds", "데일리 브리핑 섹션별 수집 소요시간", ["section"]
+)
+HTTP_LATENCY = Histogram(
+    "reporter_http_request_seconds", "API 엔드포인트 응답 소요시간", ["method", "route", "status"]
+)
+CACHE_REQUESTS = Counter(
+    "reporter_cache_requests_total", "캐시 조회 결과 (hit / miss / not_modified / stale / refresh)", ["cache", "result"]
+)
+ERRORS = Counter(
+    "reporter_errors_total", "소스별 오류 수", ["source"]
+)
+SECTION_DELAYED = Counter(
+    "reporter_briefing_section_delayed_total", "시간 예산 초과/실패로 지연 처리된 브리핑 섹션 수", ["section", "reason"]
+)
+RESPONSE_BYTES = Counter(
+    "reporter_http_response_bytes_total", "압축 응답 본문 크기 (raw: 압축 전 / sent: 전송)", ["encoding", "kind"]
+)
+LIVE_SUBSCRIBERS = Gauge(
+    "reporter_live_quote_subscribers", "실시간 시세 스트림 접속 수"
+)
+BATCH_RENDERED = Counter(
+    "reporter_batch_briefings_total", "구독자별 맞춤 브리핑 렌더링 결과 수", ["result"]
+)
+BRIEFING_LAST_BUILD = Gauge(
+    "reporter_briefing_last_build_timestamp_seconds", "마지막 데일리 브리핑 생성 시각 (unix time)"
+)
+
+def upstream_timer(source):
+    """외부 API 호출 시간 측정 (with 블록)"""
+    return UPSTREAM_LATENCY.time(source=source)
+
+def stage_timer(stage):
+    """파싱/계산/렌더링 단계 시간 측정 (with 블록)"""
+    return STAGE_LATENCY.time(stage=stage)
+
+def record_cache(cache, result, amount=1):
+    """캐시 조회 결과 기록 (result: hit / miss / not_modified / stale / refresh)"""
+    if amount:
+        CACHE_REQUESTS.inc(amount, cache=cache, result=result)
+
+def record_error(source):
+    ERRORS.inc(source=source)
+
+def render_prometheus():
+    """등록된 전체 지표 -> Prometheus text format"""
+    with _registry_lock:
+        metrics = list(_registry)
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+def reset_metrics():
+    """전체 지표 초기화 (벤치마크 반복 측정용)"""
+    with _registry_lock:
+        metrics = list(_registry)
+    for metric in metrics:
+        metric.clear()
+
+# ---------------------------------------------------------
+# 프로파일링 (opt-in)
+# ---------------------------------------------------------
+@contextmanager
+def profiled(name):
+    """
+    PROFILING_ENABLED=1이면 with 블록을 cProfile로 감싸서 data/profiles/에 .prof 저장
+    - yield 값: 저장될 파일 경로 (비활성화 상태면 None)
+    - 이벤트 루프 위에서 돌리면 같은 시간에 실행된 다른 코루틴도 함께 잡힘 (요청 1건씩 볼 때 사용)
+    - 이미 다른 프로파일링이 진행 중이면 건너뜀 (None)
+    """
+    if not PROFILING_ENABLED or not _profile_lock.acquire(blocking=False):
+        yield None
+        return
+
+    import cProfile
+    from services.local_store import data_path
+
+    try:
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name).strip("_") or "profile"
+        path = data_path("profiles", f"{time.strftime('%Y%m%d-%H%M%S')}_{safe_name}.prof")
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield path
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+            print(f"🔬 프로파일 저장: {path}")
+    finally:
+        _profile_lock.release()
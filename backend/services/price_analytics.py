@@ -0,0 +1,124 @@
+# backend/services/price_analytics.py
+
+import os
+
+from services.metrics import record_error, stage_timer
+from services.price_history import load_bars, sync_history
+
+# 기간별 수익률 / 변동성 / 이동평균 / 52주 고저 (전체 티커를 한 번에 벡터 연산)
+VOLATILITY_WINDOW = int(os.getenv("ANALYTICS_VOLATILITY_WINDOW", "20"))  # 거래일
+MA_WINDOWS = (20, 50, 200)
+TRADING_DAYS_PER_YEAR = 252  # 연환산 기준 (BTC처럼 주말에도 거래되는 티커도 같은 기준으로 단순화)
+
+COLUMNS = [
+    "last_close", "last_date", "ret_1w", "ret_1m", "ret_ytd", "volatility",
+    *[f"ma_{n}" for n in MA_WINDOWS], *[f"ma_{n}_gap" for n in MA_WINDOWS],
+    "high_52w", "low_52w", "from_52w_high", "from_52w_low"
+]
+
+def _tail_stat(values, groups, window, stat):
+    """티커별 마지막 window개 값의 통계 (값이 window개 미만이면 NaN)"""
+    tail = values.groupby(groups).tail(window)
+    grouped = tail.groupby(groups.loc[tail.index])
+    result = getattr(grouped, stat)()
+    return result.where(grouped.count() >= window)
+
+def compute_analytics(bars, as_of=None):
+    """
+    long 형태 일봉(load_bars 결과) -> 티커별 지표 DataFrame (index=symbol, columns=COLUMNS)
+    - ret_*: 기간 수익률(%) - 기준일(as_of, 기본 마지막 날짜)에서 1주 / 1개월 전, 전년도 마지막 종가 대비
+      (휴장일이면 그 이전 마지막 종가 사용 -> 거래 캘린더가 다른 티커도 같은 기준)
+    - volatility: 최근 VOLATILITY_WINDOW 거래일 로그수익률 표준편차 연환산(%)
+    - ma_N / ma_N_gap: N일 이동평균 / 현재가의 이동평균 대비 괴리율(%)
+    - high_52w / low_52w / from_52w_*: 52주 고가·저가와 현재가의 거리(%)
+    """
+    import numpy as np
+    import pandas as pd
+
+    if bars is None or bars.empty:
+        return pd.DataFrame(columns=COLUMNS)
+
+    bars = bars.loc[bars["close"].notna()]
+    if as_of is not None:
+        bars = bars.loc[bars["date"] <= pd.Timestamp(as_of)]
+    ref = bars["date"].max()
+    symbols = bars["symbol"]
+
+    # 1) 현재가 (티커별 마지막 종가)
+    grouped = bars.groupby("symbol", sort=False)
+    last_close = grouped["close"].last()
+    last_date = grouped["date"].last()
+
+    # 2) 기간 수익률: (날짜 x 티커) 종가를 앞 값으로 채운 뒤 기준 시점의 행 하나씩만 조회
+    close = bars.pivot(index="date", columns="symbol", values="close").ffill()
+
+    def base_close(when):
+        past = close.loc[:when]
+        return past.iloc[-1] if len(past) else pd.Series(np.nan, index=close.columns)
+
+    bases = {
+        "ret_1w": base_close(ref - pd.Timedelta(days=7)),
+        "ret_1m": base_close(ref - pd.DateOffset(months=1)),
+        "ret_ytd": base_close(pd.Timestamp(year=ref.year, month=1, day=1) - pd.Timedelta(days=1)),
+    }
+    result = pd.DataFrame({"last_close": last_close, "last_date": last_date})
+    for name, base in bases.items():
+        result[name] = (result["last_close"] / base.reindex(result.index) - 1) * 100
+
+    # 3) 변동성: 티커별 연속 종가 기준 로그수익률 (다른 티커의 거래일이 끼어들지 않도록 long 형태에서 계산)
+    log_ret = np.log(bars["close"]).groupby(symbols).diff()
+    valid = log_ret.notna()
+    result["volatility"] = _tail_stat(
+        log_ret[valid], symbols[valid], VOLATILITY_WINDOW, "std"
+    ) * np.sqrt(TRADING_DAYS_PER_YEAR) * 100
+
+    # 4) 이동평균
+    for n in MA_WINDOWS:
+        result[f"ma_{n}"] = _tail_stat(bars["close"], symbols, n, "mean")
+        result[f"ma_{n}_gap"] = (result["last_close"] / result[f"ma_{n}"] - 1) * 100
+
+    # 5) 52주 고가 / 저가 (고가·저가가 없으면 종가)
+    recent = bars.loc[bars["date"] > ref - pd.Timedelta(weeks=52)]
+    recent_grouped = recent.assign(
+        high=recent["high"].fillna(recent["close"]), low=recent["low"].fillna(recent["close"])
+    ).groupby("symbol", sort=False)
+    result["high_52w"] = recent_grouped["high"].max()
+    result["low_52w"] = recent_grouped["low"].min()
+    result["from_52w_high"] = (result["last_close"] / result["high_52w"] - 1) * 100
+    result["from_52w_low"] = (result["last_close"] / result["low_52w"] - 1) * 100
+
+    result.index.name = "symbol"
+    return result[COLUMNS]
+
+def get_price_analytics(symbols, as_of=None):
+    """
+    저장소 동기화(빠진 봉만 다운로드) + 전체 티커 지표 계산 -> {symbol: {지표: 값}} (값은 소수 2자리, 없으면 None)
+    - 동기 함수 (yfinance / SQLite) -> 이벤트 루프에서는 asyncio.to_thread로 호출
+    """
+    import pandas as pd
+
+    symbols = list(dict.fromkeys(symbols))
+    try:
+        sync_history(symbols)
+    except Exception as e:
+        # 동기화에 실패해도 이미 저장된 이력으로 계산
+        record_error("price_history")
+        print(f"⚠️ Price History Sync Error: {e}")
+
+    # 52주 / YTD / 200일 이동평균 계산에 필요한 만큼만 조회
+    start = (pd.Timestamp(as_of or pd.Timestamp.today()) - pd.DateOffset(years=1, months=3)).strftime("%Y-%m-%d")
+    bars = load_bars(symbols, start=start)
+    with stage_timer("price_analytics"):
+        table = compute_analytics(bars, as_of)
+
+    analytics = {}
+    for symbol, row in table.iterrows():
+        item = {}
+        for column in COLUMNS:
+            value = row[column]
+            if column == "last_date":
+                item[column] = value.strftime("%Y-%m-%d") if pd.notna(value) else None
+            else:
+                item[column] = round(float(value), 2) if pd.notna(value) else None
+        analytics[symbol] = item
+    return analytics
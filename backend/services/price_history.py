@@ -0,0 +1,143 @@
+# backend/services/price_history.py
+
+import os
+import sqlite3
+import time
+from contextlib import closing
+from datetime import date
+
+from services.local_store import data_path
+from services.market_data import get_price_frames
+from services.metrics import record_cache, stage_timer
+
+# 티커별 일봉(OHLCV) 누적 저장소 (SQLite 파일 1개)
+# - 매일 전체 기간을 다시 받지 않고, 마지막 저장일 이후 빠진 구간만 다운로드해서 추가
+# - 최근 봉은 다시 받으면 덮어씀 (장중에 저장된 봉이 종가로 확정되도록)
+PRICE_HISTORY_DB_PATH = os.getenv("PRICE_HISTORY_DB_PATH") or data_path("price_history.sqlite3")
+# 처음 보는 티커는 이 기간만큼 받아둠 (52주 고저 / YTD / 200일 이동평균 계산에 충분한 기간)
+PRICE_HISTORY_LOOKBACK = os.getenv("PRICE_HISTORY_LOOKBACK", "2y")
+
+FIELDS = ["open", "high", "low", "close", "adj_close", "volume"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS price_bars (
+    symbol    TEXT NOT NULL,
+    date      TEXT NOT NULL,
+    open      REAL,
+    high      REAL,
+    low       REAL,
+    close     REAL,
+    adj_close REAL,
+    volume    REAL,
+    PRIMARY KEY (symbol, date)
+)
+"""
+
+# 마지막 저장일로부터 지난 일수 -> 다운로드할 yfinance period (빠진 구간을 덮는 가장 짧은 기간)
+_GAP_PERIODS = [(4, "5d"), (28, "1mo"), (85, "3mo"), (180, "6mo"), (360, "1y")]
+
+_initialized = False
+
+def _connect():
+    global _initialized
+    conn = sqlite3.connect(PRICE_HISTORY_DB_PATH, timeout=10)
+    if not _initialized:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        conn.commit()
+        _initialized = True
+    return conn
+
+def last_stored_dates(symbols):
+    """티커별 마지막 저장일 -> {symbol: 'YYYY-MM-DD'} (저장된 봉이 없으면 빠짐)"""
+    if not symbols:
+        return {}
+    placeholders = ",".join("?" * len(symbols))
+    with closing(_connect()) as conn:
+        rows = conn.execute(
+            f"SELECT symbol, MAX(date) FROM price_bars WHERE symbol IN ({placeholders}) GROUP BY symbol",
+            list(symbols)
+        ).fetchall()
+    return dict(rows)
+
+def missing_period(last_date, today=None):
+    """마지막 저장일 -> 빠진 구간을 받을 period (저장된 봉이 없으면 PRICE_HISTORY_LOOKBACK)"""
+    if last_date is None:
+        return PRICE_HISTORY_LOOKBACK
+    gap = ((today or date.today()) - date.fromisoformat(last_date)).days
+    for max_gap, period in _GAP_PERIODS:
+        if gap <= max_gap:
+            return period
+    return PRICE_HISTORY_LOOKBACK
+
+def _frame_rows(symbol, frame):
+    """티커 1개의 yfinance DataFrame -> INSERT 행 목록"""
+    columns = {str(c).lower().replace(" ", "_"): c for c in frame.columns}
+    frame = frame.loc[frame[columns["close"]].notna()] if "close" in columns else frame.iloc[0:0]
+    values = [
+        frame[columns[field]].astype(float).where(frame[columns[field]].notna(), None).tolist()
+        if field in columns else [None] * len(frame)
+        for field in FIELDS
+    ]
+    dates = [d.strftime("%Y-%m-%d") for d in frame.index]
+    return [(symbol, d, *row) for d, row in zip(dates, zip(*values))]
+
+def store_frames(df):
+    """yf.download(group_by='ticker') 형태 DataFrame -> 저장 (같은 티커/날짜는 덮어씀), 저장한 봉 수 반환"""
+    if df is None or df.empty:
+        return 0
+    rows = []
+    for symbol in dict.fromkeys(df.columns.get_level_values(0)):
+        rows.extend(_frame_rows(symbol, df[symbol]))
+    with closing(_connect()) as conn, conn:
+        conn.executemany(
+            "INSERT INTO price_bars (symbol, date, open, high, low, close, adj_close, volume) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(symbol, date) DO UPDATE SET open=excluded.open, high=excluded.high, low=excluded.low, "
+            "close=excluded.close, adj_close=excluded.adj_close, volume=excluded.volume",
+            rows
+        )
+    return len(rows)
+
+def sync_history(symbols, today=None):
+    """
+    티커 목록의 저장소를 최신으로 맞춤 (빠진 구간만 다운로드)
+    - 같은 period가 필요한 티커끼리 묶어서 1번에 조회 (get_price_frames 캐시 공유 -> 지수 테이블과 같은 5d 조회는 재사용)
+    - 반환: {period: 티커 목록} (이번에 조회한 묶음)
+    """
+    symbols = list(dict.fromkeys(symbols))
+    last_dates = last_stored_dates(symbols)
+    groups = {}
+    for symbol in symbols:
+        groups.setdefault(missing_period(last_dates.get(symbol), today), []).append(symbol)
+
+    record_cache("price_history", "hit", len(groups.get("5d", [])))
+    record_cache("price_history", "miss", len(symbols) - len(groups.get("5d", [])))
+    for period, group in groups.items():
+        if period != "5d":
+            print(f"📥 시세 이력 보충 ({period}): {group}")
+        started = time.perf_counter()
+        stored = store_frames(get_price_frames(group, period))
+        if period != "5d":
+            print(f"✅ 시세 이력 {stored}봉 저장 ({time.perf_counter() - started:.2f}s)")
+    return groups
+
+def load_bars(symbols, start=None):
+    """
+    저장된 일봉 조회 -> long 형태 DataFrame (columns: symbol, date, open, high, low, close, adj_close, volume)
+    - (symbol, date) 순으로 정렬되어 있어 groupby 계산에 바로 사용 가능
+    """
+    import pandas as pd
+
+    placeholders = ",".join("?" * len(symbols))
+    query = f"SELECT symbol, date, {', '.join(FIELDS)} FROM price_bars WHERE symbol IN ({placeholders})"
+    params = list(symbols)
+    if start:
+        query += " AND date >= ?"
+        params.append(start)
+    query += " ORDER BY symbol, date"
+
+    with stage_timer("price_history_load"), closing(_connect()) as conn:
+        bars = pd.read_sql_query(query, conn, params=params)
+    bars["date"] = pd.to_datetime(bars["date"])
+    return bars
@@ -0,0 +1,127 @@
+# backend/services/report_batch.py
+
+import asyncio
+import base64
+
+from services.briefing_market_index import asset_url, rows_to_markdown
+from services.briefing_scheduler import get_cached_briefing, is_stale
+from services.email_builder import (
+    BRIEFING_SOURCES, build_image_src, collect_briefing_data, filter_recent_economy,
+    render_email_report, report_time
+)
+from services.image_assets import read_asset
+
+# 한 번의 수집으로 여러 섹션을 JSON으로 돌려주는 배치 조회
+# - n8n이 섹션별 엔드포인트를 따로 부르고 daily-briefing이 같은 데이터를 또 수집하던 것을 1번으로 합침
+# - 미리 만든 브리핑이 fresh면 그 데이터를 그대로 사용 (외부 호출 0회)
+
+DATA_SECTIONS = list(BRIEFING_SOURCES)              # index_table, sp500_map, economy, news
+RENDER_SECTIONS = ["html"]                           # 수집한 데이터로 렌더링하는 섹션 (전체 데이터 필요)
+SECTION_NAMES = DATA_SECTIONS + RENDER_SECTIONS
+
+FORMAT_CHOICES = {
+    "index_format": ("rows", "markdown"),           # 지수 테이블: 구조화된 행 / 마크다운 표
+    "image": ("url", "cid", "inline"),              # S&P 500 맵 참조 방식 (inline이면 Base64 포함)
+    "economy": ("all", "recent"),                   # 경제 지표: 전체 / 직전 거래일 이후 발표분만
+}
+DEFAULT_FORMATS = {"index_format": "rows", "image": "url", "economy": "all"}
+
+def parse_sections(value):
+    """'index_table,news' -> ['index_table', 'news'] (비어 있으면 전체 데이터 섹션 / 알 수 없는 섹션은 ValueError)"""
+    if not value:
+        return list(DATA_SECTIONS)
+    sections = list(dict.fromkeys(s.strip() for s in value.split(",") if s.strip()))
+    unknown = [s for s in sections if s not in SECTION_NAMES]
+    if unknown:
+        raise ValueError(f"알 수 없는 섹션: {unknown} (가능: {SECTION_NAMES})")
+    return sections
+
+def parse_formats(**formats):
+    """형식 옵션 검증 (None이면 기본값)"""
+    result = dict(DEFAULT_FORMATS)
+    for key, value in formats.items():
+        if value is None:
+            continue
+        if value not in FORMAT_CHOICES[key]:
+            raise ValueError(f"{key}={value} 지원 안 함 (가능: {list(FORMAT_CHOICES[key])})")
+        result[key] = value
+    return result
+
+async def load_section_data(sections, refresh=False):
+    """
+    요청 섹션 데이터 1회 수집 -> (데이터 dict, 출처 "prebuilt" / "fetched")
+    - refresh=False이고 미리 만든 브리핑이 fresh면 그 데이터 재사용
+    - 아니면 필요한 섹션만 한 번에 동시 수집 (html 요청 시 전체 섹션)
+    """
+    needed = DATA_SECTIONS if "html" in sections else [s for s in sections if s in DATA_SECTIONS]
+
+    if not refresh:
+        entry = get_cached_briefing()
+        if entry and not is_stale(entry) and all(name in entry["data"] for name in needed):
+            return entry["data"], "prebuilt"
+
+    data, _ = await collect_briefing_data(needed)
+    return data, "fetched"
+
+def _format_sp500_map(asset, image_mode):
+    if not asset:
+        return None
+    result = {
+        "image_url": asset_url(asset["asset_id"]),
+        "image_cid": asset["asset_id"],
+        "media_type": asset["media_type"],
+        "bytes": asset["bytes"],
+        "image_src": build_image_src(asset, image_mode),
+    }
+    if image_mode == "inline":
+        content = read_asset(asset["asset_id"])
+        result["image_data"] = base64.b64encode(content).decode("utf-8") if content else None
+    return result
+
+def format_sections(data, sections, formats):
+    """수집된 데이터 -> 요청 섹션/형식대로 JSON 응답용 dict (동기 함수 -> asyncio.to_thread로 호출)"""
+    result = {}
+    for name in sections:
+        if name == "index_table":
+            rows = data.get("index_table")
+            if formats["index_format"] == "markdown" and isinstance(rows, list):
+                rows = rows_to_markdown(rows)
+            result[name] = rows
+        elif name == "sp500_map":
+            result[name] = _format_sp500_map(data.get("sp500_map"), formats["image"])
+        elif name == "economy":
+            items = data.get("economy")
+            if formats["economy"] == "recent":
+                items = filter_recent_economy(items, report_time(data), (data.get("meta") or {}).get("trade_date"))
+            result[name] = items
+        elif name == "news":
+            result[name] = data.get("news")
+        elif name == "html":
+            result[name] = render_email_report(data)
+    return result
+
+async def get_report_batch(sections=None, refresh=False, **formats):
+    """
+    배치 조회 진입점
+    - sections: 콤마 구분 문자열 또는 리스트 / formats: index_format, image, economy
+    - 반환: {"trade_date", "generated_at", "source", "delayed", "sections": {...}}
+    """
+    if isinstance(sections, (list, tuple)):
+        sections = ",".join(sections)
+    sections = parse_sections(sections)
+    formats = parse_formats(**formats)
+
+    data, source = await load_section_data(sections, refresh)
+    # html 렌더링 / Base64 인코딩은 CPU 작업이라 이벤트 루프를 막지 않도록 스레드에서 실행
+    formatted = await asyncio.to_thread(format_sections, data, sections, formats)
+    meta = data.get("meta") or {}
+    delayed = data.get("delayed") or {}
+    needed = set(DATA_SECTIONS) if "html" in sections else set(sections)
+    return {
+        "trade_date": meta.get("trade_date"),
+        "generated_at": meta.get("generated_at"),
+        "source": source,
+        "formats": formats,
+        "delayed": {name: info for name, info in delayed.items() if name in needed},
+        "sections": formatted,
+    }
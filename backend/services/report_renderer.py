@@ -0,0 +1,68 @@
+# backend/services/report_renderer.py
+
+import os
+import threading
+
+from services.local_store import data_path
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), '../templates')
+
+# 템플릿 수정 여부 확인 (운영에서 0으로 두면 파일 mtime 확인까지 생략)
+TEMPLATE_AUTO_RELOAD = os.getenv("TEMPLATE_AUTO_RELOAD", "1") == "1"
+# 미리 렌더링된 HTML을 스트리밍할 때 조각 크기 (문자 수)
+STREAM_CHUNK_CHARS = int(os.getenv("STREAM_CHUNK_CHARS") or 64 * 1024)
+
+_env = None
+_env_lock = threading.Lock()
+
+def _format_pct(value):
+    """등락률 표시 (+1.23% / 값이 없으면 N/A)"""
+    return "N/A" if value is None else f"{value:+.2f}%"
+
+def _trend_class(value):
+    """등락 방향 CSS 클래스 (상승: 빨강 / 하락: 파랑)"""
+    if not value:
+        return ""
+    return "trend-up" if value > 0 else "trend-down"
+
+def get_environment():
+    """
+    Jinja2 Environment (프로세스당 1번만 생성)
+    - 컴파일된 템플릿은 Environment 내부 캐시 + 디스크 바이트코드 캐시에 보관
+      -> 재시작 후에도 템플릿 파싱/컴파일 생략
+    """
+    global _env
+    if _env is None:
+        from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+        with _env_lock:
+            if _env is None:
+                cache_dir = os.path.dirname(data_path("jinja_cache", "_"))
+                env = Environment(
+                    loader=FileSystemLoader(TEMPLATE_DIR),
+                    bytecode_cache=FileSystemBytecodeCache(cache_dir),
+                    auto_reload=TEMPLATE_AUTO_RELOAD
+                )
+                env.filters.update(pct=_format_pct, trend_class=_trend_class)
+                _env = env
+    return _env
+
+def render_template(name, **context):
+    """템플릿 전체를 문자열로 렌더링"""
+    return get_environment().get_template(name).render(**context)
+
+def stream_template(name, **context):
+    """템플릿을 조각 단위로 생성하는 제너레이터 (StreamingResponse 용, 전체 문자열을 메모리에 만들지 않음)"""
+    return get_environment().get_template(name).generate(**context)
+
+def iter_chunks(html, size=None):
+    """이미 렌더링된 HTML 문자열 -> 조각 제너레이터 (StreamingResponse 용, 미리 만든 브리핑 전송)"""
+    size = size or STREAM_CHUNK_CHARS
+    for start in range(0, len(html), size):
+        yield html[start:start + size]
+
+def render_blocks(name, block_names, **context):
+    """템플릿의 {% block %} 일부만 렌더링 -> {block 이름: HTML} (공통 조각을 한 번만 만들어 여러 리포트에 재사용)"""
+    template = get_environment().get_template(name)
+    block_context = template.new_context(context)
+    return {block: "".join(template.blocks[block](block_context)) for block in block_names}
@@ -0,0 +1,212 @@
+# backend/services/responses.py
+
+import os
+import zlib
+
+import anyio
+import orjson
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+
+from services.metrics import RESPONSE_BYTES
+
+try:
+    import brotli  # requirements.txt에 포함 (설치되지 않은 환경에서는 gzip만 사용)
+except ImportError:
+    brotli = None
+
+# ---------------------------------------------------------
+# JSON 응답 (orjson)
+# ---------------------------------------------------------
+# orjson은 NaN / inf를 직렬화하면서 바로 null로 바꿈 -> 예전 clean_data 같은 재귀 순회가 필요 없음
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def _orjson_default(obj):
+    """orjson이 직접 못 다루는 타입 (pandas Timestamp, numpy 스칼라, Decimal 등)"""
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if hasattr(obj, "item"):
+        return obj.item()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    try:
+        return float(obj)
+    except (TypeError, ValueError):
+        raise TypeError(f"JSON 변환 불가 타입: {type(obj).__name__}")
+
+class FastJSONResponse(JSONResponse):
+    """전체 라우터 기본 응답 클래스 (FastAPI default_response_class)"""
+
+    def render(self, content):
+        return orjson.dumps(content, default=_orjson_default, option=ORJSON_OPTIONS)
+
+# ---------------------------------------------------------
+# 응답 압축 (brotli / gzip 협상)
+# ---------------------------------------------------------
+COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "5"))  # 11은 너무 느림 (요청마다 압축하므로 4~6 권장)
+# 이 크기 이상은 스레드에서 압축 (수 MB HTML / Base64 압축 중 이벤트 루프 멈춤 방지)
+COMPRESSION_THREAD_BYTES = 256 * 1024
+
+# 이미 압축된 형식 / 실시간 스트림은 건드리지 않음
+SKIP_CONTENT_TYPES = ("image/", "video/", "audio/", "application/zip", "application/gzip", "text/event-stream")
+
+class _GzipCompressor:
+    encoding = "gzip"
+
+    def __init__(self):
+        self._obj = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31 = gzip 헤더
+
+    def compress(self, data):
+        # SYNC_FLUSH: 스트리밍 응답도 조각 단위로 바로 전송
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._obj.flush()
+
+class _BrotliCompressor:
+    encoding = "br"
+
+    def __init__(self):
+        self._obj = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data):
+        return self._obj.process(data) + self._obj.flush()
+
+    def finish(self):
+        return self._obj.finish()
+
+COMPRESSORS = {"gzip": _GzipCompressor}
+if brotli is not None:
+    COMPRESSORS["br"] = _BrotliCompressor
+
+def negotiate_encoding(accept_encoding):
+    """Accept-Encoding 헤더 -> 사용할 인코딩 ('br' / 'gzip' / None), q값이 같으면 br 우선"""
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+
+    candidates = []
+    for priority, encoding in enumerate(("br", "gzip")):
+        if encoding not in COMPRESSORS:
+            continue
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > 0:
+            candidates.append((q, -priority, encoding))
+    return max(candidates)[2] if candidates else None
+
+class CompressionMiddleware:
+    """
+    큰 응답 본문 압축 (순수 ASGI 미들웨어)
+    - 클라이언트 Accept-Encoding에 따라 brotli 또는 gzip (brotli 모듈을 import할 수 없으면 gzip만)
+    - COMPRESSION_MIN_BYTES 미만 / 이미 인코딩된 응답 / 이미지 / SSE는 그대로 전달
+    - StreamingResponse도 조각 단위로 압축해서 바로 전송
+    """
+
+    def __init__(self, app, minimum_size=None):
+        self.app = app
+        self.minimum_size = COMPRESSION_MIN_BYTES if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(send, COMPRESSORS[encoding], self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+class _CompressionResponder:
+    def __init__(self, send, compressor_class, minimum_size):
+        self._send = send
+        self._compressor_class = compressor_class
+        self._minimum_size = minimum_size
+        self._start = None
+        self._compressor = None    # None이면 아직 결정 전 또는 통과(passthrough)
+        self._passthrough = False
+        self._raw_bytes = 0
+        self._sent_bytes = 0
+
+    async def _compress(self, data):
+        if len(data) >= COMPRESSION_THREAD_BYTES:
+            return await anyio.to_thread.run_sync(self._compressor.compress, data)
+        return self._compressor.compress(data)
+
+    def _should_skip(self, headers):
+        if "content-encoding" in headers:
+            return True
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(SKIP_CONTENT_TYPES)
+
+    async def send(self, message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self._start = message  # 첫 본문을 보고 압축 여부 결정
+            return
+
+        if self._passthrough or message_type != "http.response.body":
+            if self._start is not None:
+                await self._send(self._start)
+                self._start = None
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._compressor is None:
+            headers = MutableHeaders(raw=self._start["headers"])
+            if self._should_skip(headers) or (not more_body and len(body) < self._minimum_size):
+                self._passthrough = True
+                await self._send(self._start)
+                self._start = None
+                await self._send(message)
+                return
+
+            self._compressor = self._compressor_class()
+            headers["Content-Encoding"] = self._compressor.encoding
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body:
+                # 단일 본문: 한 번에 압축하고 Content-Length 갱신
+                compressed = await self._compress(body) + self._compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                self._record(len(body), len(compressed))
+                await self._send(self._start)
+                self._start = None
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+
+            # 스트리밍: 전체 길이를 모르므로 Content-Length 제거 (chunked)
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await self._send(self._start)
+            self._start = None
+
+        chunk = await self._compress(body) if body else b""
+        if not more_body:
+            chunk += self._compressor.finish()
+        self._raw_bytes += len(body)
+        self._sent_bytes += len(chunk)
+        if not more_body:
+            self._record(self._raw_bytes, self._sent_bytes)
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _record(self, raw, sent):
+        encoding = self._compressor.encoding
+        RESPONSE_BYTES.inc(raw, encoding=encoding, kind="raw")
+        RESPONSE_BYTES.inc(sent, encoding=encoding, kind="sent")
@@ -0,0 +1,71 @@
+# backend/services/single_flight.py
+
+import asyncio
+import functools
+
+from services.metrics import record_cache
+
+# 동시에 들어온 같은 작업 요청 합치기 (single-flight)
+# - n8n 재시도 / 여러 워크플로가 같은 순간에 호출해도 외부 API(ApiFlash, Upstage 등)는 1번만 호출
+# - 결과 캐시가 아니라 '진행 중인 작업' 공유: 작업이 끝나면 바로 비워지고, 재사용 여부는 각 서비스의 캐시가 결정
+
+_inflight = {}  # (이벤트 루프 id, key) -> asyncio.Task
+
+def _key(loop, key):
+    # 이벤트 루프가 다르면(TestClient, 스크립트 등) 태스크를 공유할 수 없으므로 루프별로 분리
+    return (id(loop), key)
+
+async def run(key, func, *args, **kwargs):
+    """
+    같은 key의 작업이 이미 진행 중이면 새로 실행하지 않고 그 결과를 같이 기다림
+    - 첫 호출자만 func 실행, 나머지 호출자는 같은 결과(또는 같은 예외)를 받음
+    - 기다리던 호출자 하나가 취소돼도(클라이언트 연결 끊김 등) 공유 작업은 계속 진행
+    """
+    loop = asyncio.get_running_loop()
+    inflight_key = _key(loop, key)
+    metric_name = f"inflight_{key[0] if isinstance(key, tuple) else key}"
+
+    task = _inflight.get(inflight_key)
+    if task is None:
+        record_cache(metric_name, "miss")
+        task = loop.create_task(func(*args, **kwargs))
+        _inflight[inflight_key] = task
+
+        def done(t):
+            if _inflight.get(inflight_key) is t:
+                del _inflight[inflight_key]
+            if not t.cancelled():
+                t.exception()  # 기다리는 호출자가 모두 취소된 경우에도 경고가 남지 않도록 예외 회수
+
+        task.add_done_callback(done)
+    else:
+        record_cache(metric_name, "hit")
+
+    return await asyncio.shield(task)
+
+def is_running(key):
+    """현재 이벤트 루프에서 key 작업이 진행 중인지"""
+    task = _inflight.get(_key(asyncio.get_running_loop(), key))
+    return task is not None and not task.done()
+
+def single_flight(name, key=None):
+    """
+    코루틴 함수용 데코레이터
+    - 기본 key: (name, 위치 인자, 키워드 인자) -> 인자는 hashable이어야 함
+    - key 함수를 주면 key(*args, **kwargs) 결과를 인자 대신 사용
+    - 원본 함수는 wrapper.__wrapped__, 진행 여부는 wrapper.is_running(*args, **kwargs)
+    """
+    def make_key(args, kwargs):
+        if key is not None:
+            return (name, key(*args, **kwargs))
+        return (name, args, tuple(sorted(kwargs.items())))
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await run(make_key(args, kwargs), func, *args, **kwargs)
+
+        wrapper.is_running = lambda *args, **kwargs: is_running(make_key(args, kwargs))
+        return wrapper
+
+    return decorator
@@ -0,0 +1,120 @@
+# backend/services/snapshot_store.py
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from services.local_store import data_path
+
+# 거래일별 리포트 섹션 스냅샷 저장소 (SQLite 파일 1개)
+# - snapshots: 섹션 데이터 / snapshot_meta: 거래일별 생성 정보 (trade_date, generated_at 등, 섹션 목록에 섞이지 않음)
+SNAPSHOT_DB_PATH = os.getenv("SNAPSHOT_DB_PATH") or data_path("snapshots.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    trade_date TEXT NOT NULL,
+    section    TEXT NOT NULL,
+    payload    TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (trade_date, section)
+);
+CREATE TABLE IF NOT EXISTS snapshot_meta (
+    trade_date TEXT PRIMARY KEY,
+    payload    TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+# 이전 버전은 meta를 섹션("meta")으로 저장 -> 별도 테이블로 옮김
+_MIGRATE_META = """
+INSERT OR IGNORE INTO snapshot_meta (trade_date, payload, updated_at)
+    SELECT trade_date, payload, updated_at FROM snapshots WHERE section = 'meta';
+DELETE FROM snapshots WHERE section = 'meta';
+"""
+
+_initialized = False
+
+def _connect():
+    global _initialized
+    conn = sqlite3.connect(SNAPSHOT_DB_PATH, timeout=10)
+    if not _initialized:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA + _MIGRATE_META)
+        conn.commit()
+        _initialized = True
+    return conn
+
+def save_snapshot(trade_date, section, payload):
+    """섹션 1개 저장 (같은 거래일/섹션이면 덮어씀)"""
+    with closing(_connect()) as conn, conn:
+        conn.execute(
+            "INSERT INTO snapshots (trade_date, section, payload, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(trade_date, section) DO UPDATE SET payload=excluded.payload, updated_at=excluded.updated_at",
+            (trade_date, section, json.dumps(payload, ensure_ascii=False), time.time())
+        )
+
+def save_snapshots(trade_date, sections, meta=None):
+    """여러 섹션 한 번에 저장 (값이 None인 섹션은 기존 스냅샷 유지) + meta가 있으면 거래일 생성 정보도 갱신"""
+    now_ts = time.time()
+    rows = [
+        (trade_date, section, json.dumps(payload, ensure_ascii=False), now_ts)
+        for section, payload in sections.items() if payload is not None
+    ]
+    with closing(_connect()) as conn, conn:
+        conn.executemany(
+            "INSERT INTO snapshots (trade_date, section, payload, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(trade_date, section) DO UPDATE SET payload=excluded.payload, updated_at=excluded.updated_at",
+            rows
+        )
+        if meta is not None:
+            conn.execute(
+                "INSERT INTO snapshot_meta (trade_date, payload, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(trade_date) DO UPDATE SET payload=excluded.payload, updated_at=excluded.updated_at",
+                (trade_date, json.dumps(meta, ensure_ascii=False), now_ts)
+            )
+
+def load_snapshot(trade_date, section):
+    """섹션 1개 조회 (없으면 None)"""
+    with closing(_connect()) as conn:
+        row = conn.execute(
+            "SELECT payload FROM snapshots WHERE trade_date = ? AND section = ?", (trade_date, section)
+        ).fetchone()
+    return json.loads(row[0]) if row else None
+
+def load_snapshots(trade_date):
+    """거래일의 전체 섹션 조회 -> {section: payload}"""
+    with closing(_connect()) as conn:
+        rows = conn.execute(
+            "SELECT section, payload FROM snapshots WHERE trade_date = ?", (trade_date,)
+        ).fetchall()
+    return {section: json.loads(payload) for section, payload in rows}
+
+def load_snapshot_meta(trade_date):
+    """거래일 생성 정보 조회 (없으면 None)"""
+    with closing(_connect()) as conn:
+        row = conn.execute("SELECT payload FROM snapshot_meta WHERE trade_date = ?", (trade_date,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+def load_latest_snapshot(section, before=None):
+    """가장 최근 거래일의 섹션 조회 -> (trade_date, payload) / 없으면 (None, None)"""
+    query = "SELECT trade_date, payload FROM snapshots WHERE section = ?"
+    params = [section]
+    if before:
+        query += " AND trade_date < ?"
+        params.append(before)
+    query += " ORDER BY trade_date DESC LIMIT 1"
+
+    with closing(_connect()) as conn:
+        row = conn.execute(query, params).fetchone()
+    return (row[0], json.loads(row[1])) if row else (None, None)
+
+def list_snapshot_dates(limit=30):
+    """저장된 거래일 목록 (최신순) -> [{"trade_date", "sections"}]"""
+    with closing(_connect()) as conn:
+        rows = conn.execute(
+            "SELECT trade_date, GROUP_CONCAT(section) FROM snapshots "
+            "GROUP BY trade_date ORDER BY trade_date DESC LIMIT ?", (limit,)
+        ).fetchall()
+    return [{"trade_date": d, "sections": sorted(s.split(","))} for d, s in rows]
@@ -0,0 +1,74 @@
+# backend/services/watchlist.py
+
+import os
+import threading
+
+from services.local_store import load_json
+from services.market_data import get_price_frames, session_price_changes
+
+# 관심 종목 / 지수 목록 설정 파일 (환경변수로 변경 가능)
+WATCHLIST_PATH = os.getenv("WATCHLIST_PATH", os.path.join(os.path.dirname(__file__), "../config/watchlist.json"))
+
+# 설정 파일 캐시 (파일 수정 시각이 바뀌면 다시 읽음)
+_config_cache = {"mtime": None, "data": {}}
+_config_lock = threading.Lock()
+
+def _load_config():
+    try:
+        mtime = os.path.getmtime(WATCHLIST_PATH)
+    except OSError:
+        print(f"⚠️ Watchlist 설정 파일 없음: {WATCHLIST_PATH}")
+        return {}
+
+    with _config_lock:
+        if _config_cache["mtime"] != mtime:
+            _config_cache["data"] = load_json(WATCHLIST_PATH, default={}) or {}
+            _config_cache["mtime"] = mtime
+        return _config_cache["data"]
+
+def load_watchlist(name, default=None):
+    """
+    이름으로 watchlist 조회 -> {표시명: 티커} dict
+    - 설정값이 dict면 그대로, list면 티커 자체를 표시명으로 사용
+    - 목록이 없으면 default 반환
+    """
+    entry = _load_config().get(name)
+    if isinstance(entry, dict):
+        return dict(entry)
+    if isinstance(entry, list):
+        return {symbol: symbol for symbol in entry}
+    return dict(default or {})
+
+def list_watchlists():
+    """설정된 watchlist 이름 목록"""
+    return list(_load_config().keys())
+
+def get_watchlist_quotes(name, period="5d"):
+    """
+    watchlist 전체 종목 시세/등락 조회 (관심 종목 모니터링용)
+    - 분할 다운로드 + 캐시를 거치므로 일부 티커가 실패해도 나머지는 정상 반환
+    """
+    import pandas as pd
+
+    tickers = load_watchlist(name)
+    symbols = list(tickers.values())
+    if not symbols:
+        return []
+
+    df = get_price_frames(symbols, period=period)
+    changes = session_price_changes(df, symbols)  # 휴장일 / 장중 부분 봉 제외, 직전 거래일 종가 대비
+
+    quotes = []
+    for label, symbol in tickers.items():
+        row = changes.loc[symbol]
+        if pd.isna(row["last_close"]):
+            quotes.append({"name": label, "symbol": symbol, "error": "No Data"})
+            continue
+        quotes.append({
+            "name": label,
+            "symbol": symbol,
+            "price": round(float(row["last_close"]), 4),
+            "change": round(float(row["change"]), 4),
+            "change_pct": round(float(row["change_pct"]), 2)
+        })
+    return quotes